@@ -0,0 +1,88 @@
+"""
+Benchmark: single-row inference latency.
+
+Compares the DataFrame path (predict + predict_proba, two model runs) with
+the fast path (preallocated float32 vector, one in-place booster call) and
+reports p50 / p99 latency per call.
+
+Usage:
+    python benchmarks/bench_inference.py                       # synthetic model
+    python benchmarks/bench_inference.py --model BTCUSD_swing  # saved model
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ml.predictor import MarketPredictor
+
+def _synthetic_predictor(n_rows: int, n_features: int) -> MarketPredictor:
+    rng = np.random.default_rng(42)
+    cols = [f"F_{i}" for i in range(n_features)]
+    df = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=cols,
+                      index=pd.date_range("2020-01-01", periods=n_rows, freq="15min"))
+    df['Target'] = rng.integers(0, 3, size=n_rows)
+    predictor = MarketPredictor(model_name="bench_inference")
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.train(df, save=False)
+    return predictor
+
+def _percentiles(samples: list) -> str:
+    us = np.array(samples) * 1e6
+    return f"p50 {np.percentile(us, 50):8.1f}us | p99 {np.percentile(us, 99):8.1f}us"
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row inference latency benchmark")
+    parser.add_argument("--model", type=str, default=None, help="Saved model name (e.g. BTCUSD_swing). Synthetic if omitted.")
+    parser.add_argument("--features", type=int, default=150, help="Synthetic feature count")
+    parser.add_argument("--calls", type=int, default=2000, help="Timed calls per path")
+    args = parser.parse_args()
+
+    if args.model:
+        predictor = MarketPredictor(model_name=args.model)
+        predictor.load_model()
+    else:
+        predictor = _synthetic_predictor(n_rows=5000, n_features=args.features)
+
+    rng = np.random.default_rng(0)
+    row = pd.DataFrame(rng.normal(size=(1, len(predictor.features))), columns=predictor.features)
+
+    # Warm up both paths
+    x = predictor.fill_vector(row)
+    for _ in range(20):
+        predictor.predict(row)
+        predictor.predict_proba(row)
+        predictor.predict_fast(x)
+
+    legacy, fast = [], []
+    for _ in range(args.calls):
+        t0 = time.perf_counter()
+        predictor.predict(row)
+        predictor.predict_proba(row)
+        legacy.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        predictor.predict_fast(x)
+        fast.append(time.perf_counter() - t0)
+
+    # Sanity: both paths agree
+    cls, probs = predictor.predict_fast(x)
+    assert cls == int(predictor.predict(row)), "Fast path class mismatch"
+    assert abs(float(probs.max()) - float(predictor.predict_proba(row))) < 1e-5, "Fast path probability mismatch"
+
+    print("\n" + "═"*45)
+    print(f"Features : {len(predictor.features)} | Calls: {args.calls}")
+    print(f"DataFrame path : {_percentiles(legacy)}")
+    print(f"Fast path      : {_percentiles(fast)}")
+    print(f"Speedup (p50)  : {np.median(legacy) / np.median(fast):.1f}x")
+    print("═"*45)
+
+if __name__ == "__main__":
+    main()
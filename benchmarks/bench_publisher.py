@@ -0,0 +1,102 @@
+"""
+Benchmark: async Notion publisher against a local stand-in Notion server.
+
+The stand-in accepts POST /v1/pages, enforces a requests-per-second limit
+(429 + Retry-After beyond it) and fails a share of requests with 503, so
+rate limiting, retries and the outbox are exercised without touching Notion.
+Reports wall time, delivery counts and checks that no page was lost or
+created twice, including when the same batch is published again (the
+signal journal must skip every signal of the second run).
+The behaviour itself is covered by tests/test_publisher.py; this script
+measures throughput against a rate-limited server.
+
+Usage:
+    python benchmarks/bench_publisher.py --signals 100 --server_rate 3 --fail 0.1
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.journal import SignalJournal
+from src.infrastructure.publisher import AsyncNotionPublisher, Outbox
+
+def _standin_app(rate: float, fail: float, seed: int) -> web.Application:
+    rng = random.Random(seed)
+    state = {"pages": [], "window": [], "throttled": 0, "failed": 0}
+
+    async def create_page(request: web.Request) -> web.Response:
+        now = time.monotonic()
+        state["window"] = [t for t in state["window"] if now - t < 1.0]
+        if len(state["window"]) >= rate:
+            state["throttled"] += 1
+            return web.json_response({"object": "error", "code": "rate_limited"}, status=429, headers={"Retry-After": "1"})
+        state["window"].append(now)
+        if rng.random() < fail:
+            state["failed"] += 1
+            return web.json_response({"object": "error", "code": "service_unavailable"}, status=503)
+        payload = await request.json()
+        state["pages"].append(payload["properties"]["Ticker (ex: Alphabet, Apple)"]["title"][0]["text"]["content"])
+        return web.json_response({"object": "page", "id": str(len(state["pages"]))})
+
+    app = web.Application()
+    app.router.add_post("/v1/pages", create_page)
+    app["state"] = state
+    return app
+
+async def _run(args) -> None:
+    app = _standin_app(args.server_rate, args.fail, args.seed)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", args.port)
+    await site.start()
+    port = runner.addresses[0][1] # Ephemeral port by default
+
+    signals = [({"ticker": f"T{i:04d}", "mode": "swing", "bar": "2024-01-02T00:00:00", "direction": "LONG 🚀", "entry": 100.0, "sl": 95.0, "tp": 110.0, "rr_ratio": 2.0}, 0.7) for i in range(args.signals)]
+    workdir = tempfile.mkdtemp()
+    outbox = Outbox(os.path.join(workdir, "outbox.jsonl"), base_delay=0.0)
+    journal = SignalJournal(os.path.join(workdir, "signals.db"))
+
+    start = time.perf_counter()
+    async with AsyncNotionPublisher(token="standin", database_id="standin-db", base_url=f"http://127.0.0.1:{port}/v1", rate=args.client_rate, max_retries=args.retries, outbox=outbox, journal=journal) as publisher:
+        stats = await publisher.publish(signals)
+        pending = len(outbox)
+        delivered = await publisher.flush_outbox()
+        rerun = await publisher.publish(signals) # Same candle again
+    wall = time.perf_counter() - start
+    await runner.cleanup()
+
+    state = app["state"]
+    pages = state["pages"]
+    print(f"Signals            : {args.signals}")
+    print(f"Wall time          : {wall:.2f}s ({args.signals / wall:.1f} pages/s)")
+    print(f"Client stats       : {stats}")
+    print(f"Server 429 / 503   : {state['throttled']} / {state['failed']}")
+    print(f"Outbox             : {pending} queued, {delivered} delivered on flush, {len(outbox)} left")
+    print(f"Pages created      : {len(pages)} ({len(set(pages))} unique)")
+    assert len(pages) == len(set(pages)), "duplicate page created"
+    print(f"Re-run duplicates  : {rerun['duplicates']} skipped")
+    print(journal.summary().to_string(index=False))
+    assert len(pages) + len(outbox) == args.signals, "page lost"
+    assert rerun['duplicates'] == args.signals, "journal did not deduplicate the re-run"
+
+def main():
+    parser = argparse.ArgumentParser(description="Async Notion publisher benchmark (local stand-in server)")
+    parser.add_argument("--signals", type=int, default=100, help="Pages to publish")
+    parser.add_argument("--server_rate", type=float, default=3.0, help="Requests / s accepted by the stand-in")
+    parser.add_argument("--client_rate", type=float, default=3.0, help="Token bucket rate of the publisher")
+    parser.add_argument("--fail", type=float, default=0.1, help="Share of requests failing with 503")
+    parser.add_argument("--retries", type=int, default=4, help="Retries per page before the outbox")
+    parser.add_argument("--port", type=int, default=0, help="Port of the stand-in server (0: any free port)")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(_run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: CLI startup time (python -X importtime).
+
+Runs `main.py --help` and the import of every subcommand module in a fresh
+interpreter, parses the -X importtime report and prints the total import
+time, the slowest modules and which heavy libraries got loaded. `--help`
+must stay under the budget and load none of the heavy libraries; a
+subcommand must not load the libraries of another one (e.g. predict must
+not load aiohttp unless it publishes).
+
+Usage:
+    python benchmarks/bench_startup.py                  # all cases, 150 ms budget for --help
+    python benchmarks/bench_startup.py --budget_ms 100 --top 15
+    python benchmarks/bench_startup.py --cases help predict
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("pandas", "numpy", "xgboost", "sklearn", "pandas_ta", "ccxt", "yfinance", "aiohttp", "requests", "pytz", "pyarrow")
+
+# (case, interpreter arguments, heavy libraries it must not load)
+CASES = [
+    ("help", ["main.py", "--help"], HEAVY),
+    ("journal", ["-c", "import src.infrastructure.journal"], ("xgboost", "sklearn", "ccxt", "yfinance", "aiohttp")),
+    ("predict", ["-c", "import src.pipelines.inference"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("train", ["-c", "import src.pipelines.training"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("backtest", ["-c", "import src.pipelines.backtest"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("scan", ["-c", "import src.pipelines.scan"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("serve", ["-c", "import src.pipelines.serve"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("pool", ["-c", "import src.pipelines.pooled"], ("ccxt", "yfinance", "aiohttp", "requests")),
+    ("publish", ["-c", "import src.infrastructure.publisher"], ("xgboost", "sklearn", "ccxt", "yfinance", "pandas_ta")),
+]
+
+def _importtime(args: List[str]) -> Tuple[float, int, List[Tuple[str, int, int]]]:
+    """(wall seconds, exit code, [(module, self us, cumulative us)]) of one fresh interpreter."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return wall, proc.returncode, modules
+
+def _report(case: str, args: List[str], forbidden: Tuple[str, ...], top: int) -> Dict[str, float]:
+    wall, code, modules = _importtime(args)
+    total_ms = sum(s for _, s, _ in modules) / 1000
+    loaded = {name.split(".")[0] for name, _, _ in modules}
+    heavy = [lib for lib in HEAVY if lib in loaded]
+    leaked = [lib for lib in forbidden if lib in loaded]
+
+    print(f"\n{case} ({' '.join(args)})")
+    print(f"  Wall {wall * 1000:.0f} ms | imports {total_ms:.0f} ms | {len(modules)} modules | exit {code}")
+    print(f"  Heavy libraries: {', '.join(heavy) or 'none'}")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[2])[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms  {name}")
+    if code != 0:
+        print("  [!] Interpreter failed (missing dependency?)")
+    if leaked:
+        print(f"  [!] Should not load: {', '.join(leaked)}")
+    return {"imports_ms": total_ms, "wall_ms": wall * 1000, "failed": code != 0, "leaked": bool(leaked)}
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup time benchmark (python -X importtime)")
+    parser.add_argument("--budget_ms", type=float, default=150.0, help="Import time budget of 'main.py --help'")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules shown per case (cumulative time)")
+    parser.add_argument("--cases", nargs="+", default=None, help=f"Subset of: {' '.join(c for c, _, _ in CASES)}")
+    args = parser.parse_args()
+
+    results = {case: _report(case, cmd, forbidden, args.top) for case, cmd, forbidden in CASES if not args.cases or case in args.cases}
+
+    print("\n" + "═"*45)
+    for case, r in results.items():
+        flag = " (failed)" if r["failed"] else " (leak)" if r["leaked"] else ""
+        print(f"{case:<9}: {r['imports_ms']:7.0f} ms imports | {r['wall_ms']:6.0f} ms wall{flag}")
+    print("═"*45)
+
+    ok = not any(r["leaked"] for r in results.values())
+    if "help" in results:
+        help_ms = results["help"]["imports_ms"]
+        within = help_ms <= args.budget_ms and not results["help"]["failed"]
+        print(f"[{'+' if within else '!'}] --help: {help_ms:.0f} ms of imports (budget {args.budget_ms:.0f} ms)")
+        ok = ok and within
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
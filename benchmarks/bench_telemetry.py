@@ -0,0 +1,83 @@
+"""
+Benchmark: cost of the telemetry spans and counters.
+
+Times empty loop bodies wrapped in span() / timed() / count(), telemetry
+disabled then enabled, and reports the overhead per call. The disabled
+overhead must stay under the budget since instrumented code runs in every
+command, telemetry or not. Also writes the timing tree and Prometheus file
+of the enabled run to a temporary directory.
+
+Usage:
+    python benchmarks/bench_telemetry.py --calls 1000000 --budget_ns 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.telemetry import Telemetry
+
+def _per_call_ns(func, calls: int) -> float:
+    start = time.perf_counter()
+    func(calls)
+    return (time.perf_counter() - start) / calls * 1e9
+
+def _cases(t: Telemetry):
+    @t.timed("decorated")
+    def decorated():
+        pass
+
+    def baseline(n):
+        for _ in range(n):
+            pass
+
+    def with_span(n):
+        for _ in range(n):
+            with t.span("span"):
+                pass
+
+    def with_timed(n):
+        for _ in range(n):
+            decorated()
+
+    def with_count(n):
+        for _ in range(n):
+            t.count("events")
+
+    return baseline, {"span": with_span, "timed": with_timed, "count": with_count}
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry overhead benchmark")
+    parser.add_argument("--calls", type=int, default=1_000_000, help="Calls per case")
+    parser.add_argument("--budget_ns", type=float, default=1000.0, help="Max overhead per call with telemetry disabled (spans wrap millisecond-scale stages)")
+    args = parser.parse_args()
+
+    t = Telemetry()
+    baseline, cases = _cases(t)
+    base = _per_call_ns(baseline, args.calls)
+
+    disabled = {name: _per_call_ns(func, args.calls) - base for name, func in cases.items()}
+    workdir = tempfile.mkdtemp()
+    t.enable(run="bench", directory=workdir, prometheus=os.path.join(workdir, "sentinel.prom"))
+    with t.span("bench"):
+        enabled = {name: _per_call_ns(func, args.calls) - base for name, func in cases.items()}
+    path = t.write()
+
+    print("\n" + "═"*45)
+    print(f"⏱️ TELEMETRY OVERHEAD ({args.calls} calls, loop {base:.0f} ns)")
+    for name in cases:
+        print(f"{name:<6}: disabled {disabled[name]:7.1f} ns | enabled {enabled[name]:7.1f} ns")
+    print("═"*45)
+    print(f"[+] Timing tree: {path}")
+    print(f"[+] Prometheus : {t.prometheus}")
+
+    worst = max(disabled.values())
+    within = worst <= args.budget_ns
+    print(f"[{'+' if within else '!'}] Disabled overhead: {worst:.0f} ns / call (budget {args.budget_ns:.0f} ns)")
+    sys.exit(0 if within else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: warm start (continued boosting) vs full refit on rolling retrains.
+
+Replays a sequence of retrains on a cached price history: at each step the
+dataset grows by `--step_rows` bars, both strategies retrain, and both are
+scored on the next, unseen block.
+
+Usage:
+    python benchmarks/bench_warm_start.py --parquet src/data/BTC-USD.parquet --steps 10 --step_rows 30
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import settings
+from src.data.storage.filesystem import LocalStorage
+from src.features.engineering import FeatureEngineer
+from src.ml.predictor import MarketPredictor, RefitPolicy
+
+def _score(predictor: MarketPredictor, block: pd.DataFrame):
+    X = block[predictor.features]
+    probs = predictor.model.predict_proba(X)
+    preds = predictor.model.predict(X)
+    return accuracy_score(block['Target'], preds), log_loss(block['Target'], probs, labels=[0, 1, 2])
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm start vs full refit benchmark")
+    parser.add_argument("--parquet", type=str, default=os.path.join(settings.DATA_DIR, "BTC-USD.parquet"), help="Raw OHLCV parquet file")
+    parser.add_argument("--horizon", type=int, default=5, help="Target horizon (bars)")
+    parser.add_argument("--steps", type=int, default=10, help="Number of retrains")
+    parser.add_argument("--step_rows", type=int, default=30, help="Bars appended between retrains")
+    parser.add_argument("--rounds", type=int, default=50, help="Boosting rounds per incremental update")
+    args = parser.parse_args()
+
+    storage = LocalStorage(data_dir=os.path.dirname(os.path.abspath(args.parquet)))
+    raw = storage.load(os.path.basename(args.parquet))
+    if raw.empty:
+        sys.exit(1)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        fe = FeatureEngineer(raw)
+        fe.generate_all()
+        df = fe.add_target(horizon=args.horizon)
+
+    base = len(df) - (args.steps + 1) * args.step_rows
+    if base < 200:
+        print(f"[!] Not enough rows ({len(df)}) for {args.steps} steps of {args.step_rows}.")
+        sys.exit(1)
+
+    policy = RefitPolicy(max_new_fraction=1.0, max_updates=args.steps + 1, min_new_rows=1, incremental_rounds=args.rounds)
+    warm = MarketPredictor(model_name="bench_warm")
+    rows = []
+
+    for step in range(args.steps):
+        end = base + step * args.step_rows
+        train_df = df.iloc[:end]
+        oos = df.iloc[end:end + args.step_rows]
+
+        full = MarketPredictor(model_name="bench_full")
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            full.train(train_df, save=False)
+            full_time = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            outcome = "refit" if step == 0 else None
+            if step == 0:
+                warm.train(train_df, save=False)
+            else:
+                outcome = warm.update(train_df, policy=policy, save=False)
+            warm_time = time.perf_counter() - t0
+
+        full_acc, full_ll = _score(full, oos)
+        warm_acc, warm_ll = _score(warm, oos)
+        rows.append({
+            "step": step,
+            "rows": len(train_df),
+            "warm_outcome": outcome,
+            "full_s": full_time,
+            "warm_s": warm_time,
+            "full_acc": full_acc,
+            "warm_acc": warm_acc,
+            "full_logloss": full_ll,
+            "warm_logloss": warm_ll
+        })
+
+    res = pd.DataFrame(rows)
+    print(res.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    # Step 0 is a full fit for both strategies
+    upd = res.iloc[1:]
+    print("\n" + "═"*45)
+    print(f"Full refit  : {upd['full_s'].sum():.2f}s | Acc {upd['full_acc'].mean():.2%} | LogLoss {upd['full_logloss'].mean():.3f}")
+    print(f"Warm start  : {upd['warm_s'].sum():.2f}s | Acc {upd['warm_acc'].mean():.2%} | LogLoss {upd['warm_logloss'].mean():.3f}")
+    speedup = upd['full_s'].sum() / max(upd['warm_s'].sum(), 1e-9)
+    print(f"Speedup     : {speedup:.1f}x")
+    print("═"*45)
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 import argparse
+import atexit
 import sys
 import os
 
 # Add root folder to python path to allow imports from src
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.pipelines.training import TrainingPipeline
-from src.pipelines.inference import InferencePipeline
-from src.pipelines.backtest import BacktestPipeline
+# Pipelines are imported inside their subcommand: each command only loads the
+# libraries it needs (xgboost, sklearn, ccxt, yfinance, aiohttp...) and
+# '--help' loads none of them. See benchmarks/bench_startup.py.
 
 def main():
     parser = argparse.ArgumentParser(description="Market Sentinel CLI")
+    parser.add_argument("--telemetry", action="store_true", help="Record per-stage timings and write a JSON timing tree (before the command: main.py --telemetry backtest ...)")
+    parser.add_argument("--telemetry_dir", type=str, default=None, help="Directory of the timing trees (default: data/telemetry)")
+    parser.add_argument("--prometheus", type=str, default=None, help="Also write the timings in Prometheus text format to this file (enables --telemetry)")
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -20,6 +24,13 @@ def main():
     train_parser.add_argument("--ticker", type=str, default="BTCUSD", help="Ticker symbol (default: TSLA)")
     train_parser.add_argument("--period", type=str, default="5y", help="Data period (default: 5y)")
     train_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode: swing or intraday")
+    train_parser.add_argument("--incremental", action="store_true", help="Continue boosting the saved model on new rows (warm start)")
+    train_parser.add_argument("--select_features", action="store_true", help="Prune correlated / low-importance features and store the subset with the model")
+    train_parser.add_argument("--stream", action="store_true", help="Out-of-core training: feature shards on disk streamed into XGBoost (long histories)")
+    train_parser.add_argument("--chunk_rows", type=int, default=50000, help="Bars per feature shard with --stream (bounds peak memory)")
+    train_parser.add_argument("--model", type=str, default="xgboost", choices=["xgboost", "sequence"], help="Model type: XGBoost or CPU sequence model on rolling windows")
+    train_parser.add_argument("--seq_window", type=int, default=64, help="Bars per window for --model sequence (default: 64)")
+    train_parser.add_argument("--external_memory", action="store_true", help="With --stream, keep the quantized training matrix on disk too")
     
     # Predict Command
     predict_parser = subparsers.add_parser("predict", help="Run inference and publish to Notion")
@@ -35,27 +46,229 @@ def main():
     backtest_parser.add_argument("--risk", type=float, default=0.02, help="Risk per trade as decimal (default: 0.02 for 2%)")
     backtest_parser.add_argument("--filter_adx", type=int, default=0, help="Minimum ADX to trade (0 to disable, suggested 20-25)")
     backtest_parser.add_argument("--trend_filter", action="store_true", help="Enable EMA 200 Trend Filter")
+    backtest_parser.add_argument("--workers", type=int, default=None, help="Worker processes for the CV folds (default: all cores)")
+    backtest_parser.add_argument("--warm_start", action="store_true", help="Continue boosting from the previous fold instead of refitting (sequential)")
     
+    backtest_parser.add_argument("--mc_sims", type=int, default=0, help="Monte Carlo simulations on the trade ledger (0 = off, e.g. 20000)")
+    backtest_parser.add_argument("--mc_method", type=str, default="bootstrap", choices=["bootstrap", "shuffle", "block"], help="Trade resampling method")
+    backtest_parser.add_argument("--mc_block", type=int, default=5, help="Block size for --mc_method block")
+    backtest_parser.add_argument("--verbosity", type=int, choices=[0, 1, 2, 3], default=2, help="0 = quiet, 1 = fold summaries + skip counters, 2 = + trades, 3 = + every skipped signal")
+    backtest_parser.add_argument("--ledger", type=str, default=None, help="Directory for the parquet trade / skip ledger")
+    backtest_parser.add_argument("--intrabar", type=str, default=None, help="Lower-timeframe interval to resolve ambiguous stop / trailing bars (e.g. 15m, cached locally)")
+    backtest_parser.add_argument("--mc_risk", type=float, default=None, help="Risk per trade for the Monte Carlo (default: --risk)")
+    backtest_parser.add_argument("--ruin", type=float, default=0.5, help="Drawdown from initial capital counted as ruin (default: 0.5)")
+
+    # Sweep Command
+    sweep_parser = subparsers.add_parser("sweep", help="Grid search backtest parameters on cached fold predictions")
+    sweep_parser.add_argument("--ticker", type=str, default="BTCUSD", help="Ticker symbol")
+    sweep_parser.add_argument("--period", type=str, default="2y", help="Data period")
+    sweep_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    sweep_parser.add_argument("--threshold", type=float, nargs="+", default=[0.35, 0.5, 0.65], help="Confidence thresholds to try")
+    sweep_parser.add_argument("--risk", type=float, nargs="+", default=[0.01, 0.02], help="Risk per trade values to try")
+    sweep_parser.add_argument("--filter_adx", type=int, nargs="+", default=[0, 20, 25], help="Minimum ADX values to try (0 disables)")
+    sweep_parser.add_argument("--trend_filter", type=int, nargs="+", default=[0, 1], choices=[0, 1], help="Trend filter states to try (0/1)")
+    sweep_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    sweep_parser.add_argument("--top", type=int, default=20, help="Rows of the ranked table to print")
+    sweep_parser.add_argument("--output", type=str, default=None, help="Optional CSV path for the full results table")
+
+    # Tune Command
+    tune_parser = subparsers.add_parser("tune", help="Search model hyperparameters over walk-forward folds")
+    tune_parser.add_argument("--ticker", type=str, default="BTCUSD", help="Ticker symbol")
+    tune_parser.add_argument("--period", type=str, default="2y", help="Data period")
+    tune_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    tune_parser.add_argument("--trials", type=int, default=50, help="Number of trials (trial 0 = current defaults)")
+    tune_parser.add_argument("--metric", type=str, default="precision", choices=["precision", "logloss"], help="Fold score (precision on Long/Short, or log loss)")
+    tune_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    tune_parser.add_argument("--seed", type=int, default=42, help="Random seed of the search")
+
+    # Labels Command (compare target definitions on the same features)
+    labels_parser = subparsers.add_parser("labels", help="Compare triple-barrier labels against the default target")
+    labels_parser.add_argument("--ticker", type=str, default="BTCUSD", help="Ticker symbol")
+    labels_parser.add_argument("--period", type=str, default="2y", help="Data period")
+    labels_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    labels_parser.add_argument("--horizons", type=int, nargs='+', default=[8, 20, 50], help="Time barriers in bars")
+    labels_parser.add_argument("--stop", type=float, nargs='+', default=[2.0], help="Stop barriers in ATR")
+    labels_parser.add_argument("--tp", type=float, nargs='+', default=[2.0, 4.0], help="Take-profit barriers in ATR")
+    labels_parser.add_argument("--threshold", type=float, default=0.65, help="Confidence threshold for the simulation")
+    labels_parser.add_argument("--risk", type=float, default=0.02, help="Risk per trade as decimal")
+    labels_parser.add_argument("--workers", type=int, default=None, help="Parallel fold workers (default: all cores)")
+    labels_parser.add_argument("--output", type=str, default=None, help="Optional CSV file for the comparison table")
+
+    # Portfolio Command (many tickers, one account)
+    portfolio_parser = subparsers.add_parser("portfolio", help="Event-driven multi-asset backtest on one account")
+    portfolio_parser.add_argument("--tickers", type=str, nargs='+', required=True, help="Ticker symbols")
+    portfolio_parser.add_argument("--period", type=str, default="2y", help="Data period")
+    portfolio_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    portfolio_parser.add_argument("--capital", type=float, default=100000.0, help="Initial capital (default: 100000)")
+    portfolio_parser.add_argument("--risk", type=float, default=0.01, help="Risk per trade as decimal of equity (default: 0.01)")
+    portfolio_parser.add_argument("--max_positions", type=int, default=10, help="Max concurrent positions")
+    portfolio_parser.add_argument("--max_exposure", type=float, default=1.0, help="Max gross notional as a multiple of equity")
+    portfolio_parser.add_argument("--leverage", type=float, default=1.0, help="Account leverage (margin = notional / leverage)")
+    portfolio_parser.add_argument("--threshold", type=float, default=0.65, help="Confidence threshold")
+    portfolio_parser.add_argument("--filter_adx", type=int, default=0, help="Min ADX to trade")
+    portfolio_parser.add_argument("--trend_filter", action="store_true", help="Only trade in the EMA 200 direction")
+    portfolio_parser.add_argument("--workers", type=int, default=None, help="Parallel fold workers (default: all cores)")
+    portfolio_parser.add_argument("--output", type=str, default=None, help="Optional CSV file for the trade list")
+
+    # Pool Command (one model for a universe of tickers)
+    pool_parser = subparsers.add_parser("pool", help="Train / score one pooled model for many tickers")
+    pool_parser.add_argument("action", choices=["train", "predict"], help="train the pooled model or score the universe")
+    pool_parser.add_argument("--tickers", type=str, nargs='+', required=True, help="Universe of ticker symbols")
+    pool_parser.add_argument("--period", type=str, default="5y", help="Data period for training (default: 5y)")
+    pool_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    pool_parser.add_argument("--sectors", type=str, default=None, help="JSON file {ticker: sector} (default: Crypto / Equity)")
+    pool_parser.add_argument("--name", type=str, default=None, help="Model name (default: pooled_<mode>)")
+
+    # Scan Command (universe, one model per ticker)
+    scan_parser = subparsers.add_parser("scan", help="Score many tickers in parallel and rank the signals")
+    scan_parser.add_argument("--tickers", type=str, nargs='+', default=None, help="Ticker symbols")
+    scan_parser.add_argument("--file", type=str, default=None, help="File of tickers (one per line or comma separated)")
+    scan_parser.add_argument("--mode", type=str, default="swing", choices=["swing", "intraday"], help="Trading mode")
+    scan_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    scan_parser.add_argument("--budget", type=float, default=None, help="Wall-clock limit in seconds")
+    scan_parser.add_argument("--top", type=int, default=30, help="Rows of the ranked table to print")
+    scan_parser.add_argument("--verbose", action="store_true", help="Show the per-ticker pipeline output")
+    scan_parser.add_argument("--publish", action="store_true", help="Publish the ranked signals to Notion (one concurrent batch)")
+    scan_parser.add_argument("--output", type=str, default=None, help="Optional CSV path for all results and timings")
+
+    # Journal Command (local history of the published signals)
+    journal_parser = subparsers.add_parser("journal", help="Show published signals from the local journal")
+    journal_parser.add_argument("--ticker", type=str, default=None, help="Filter by ticker")
+    journal_parser.add_argument("--mode", type=str, default=None, choices=["swing", "intraday"], help="Filter by mode")
+    journal_parser.add_argument("--since", type=str, default=None, help="Only bars from this date (ISO, e.g. 2024-01-01)")
+    journal_parser.add_argument("--status", type=str, default=None, choices=["pending", "published", "failed", "rejected"], help="Filter by delivery status")
+    journal_parser.add_argument("--limit", type=int, default=50, help="Rows to show")
+
+    # Serve Command (long-running daemon, scores each new candle)
+    serve_parser = subparsers.add_parser("serve", help="Keep models and bars in memory and score every new candle close")
+    serve_parser.add_argument("--targets", type=str, nargs='+', required=True, help="TICKER[:mode] entries, e.g. BTCUSD:intraday AAPL:swing (default mode: swing)")
+    serve_parser.add_argument("--grace", type=float, default=5.0, help="Seconds to wait after each candle close before fetching")
+    serve_parser.add_argument("--history", type=int, default=None, help="Closed bars kept in memory per target (default: the whole warm-up download, same window as predict)")
+    serve_parser.add_argument("--no_publish", action="store_true", help="Score only, do not publish to Notion")
+
     # Global args (could be parent parser, but for now adding to each or just one)
     # Ideally add to all or as a mixin. Simple way: Add to each.
     train_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
     predict_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
     backtest_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    sweep_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    tune_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    labels_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    portfolio_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    pool_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    scan_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+    serve_parser.add_argument("--source", type=str, default="auto", choices=["auto", "yahoo", "binance"], help="Data Provider")
+
+    # Walk-forward CV options (backtest, sweep & tune)
+    for p in (backtest_parser, sweep_parser, tune_parser, labels_parser, portfolio_parser):
+        p.add_argument("--folds", type=int, default=3, help="Number of walk-forward folds (default: 3)")
+        p.add_argument("--window", type=str, default="expanding", choices=["expanding", "sliding"], help="Training window type")
+        p.add_argument("--embargo", type=int, default=0, help="Bars dropped between train and test (suggested: target horizon)")
+
+    # Staging pipeline: threaded prefetch overlapping downloads with compute (scan & pool)
+    pool_parser.add_argument("--workers", type=int, default=None, help="Compute processes of the staging pipeline (default: all cores)")
+    for p in (scan_parser, pool_parser):
+        p.add_argument("--prefetch", type=int, default=0, help="Fetched tickers buffered ahead of compute (0 = no prefetch; backpressure bound)")
+        p.add_argument("--fetchers", type=int, default=4, help="Download threads of the staging pipeline")
+
+    # Warm start refit policy (train --incremental & backtest --warm_start)
+    for p in (train_parser, backtest_parser):
+        p.add_argument("--max_updates", type=int, default=10, help="Full refit after this many incremental updates")
+        p.add_argument("--max_new_fraction", type=float, default=None, help="Full refit when new rows exceed this share of the data (default: 0.25 for train, one fold of new rows for backtest)")
+
+    # Resumable runs (backtest & sweep)
+    for p in (backtest_parser, sweep_parser):
+        p.add_argument("--checkpoint", action="store_true", help="Persist folds / cells under data/runs/<config hash> and skip completed ones on rerun")
 
     
     args = parser.parse_args()
+
+    if args.telemetry or args.prometheus:
+        from src.infrastructure.telemetry import telemetry
+        telemetry.enable(run=args.command or "cli", directory=args.telemetry_dir, prometheus=args.prometheus)
+        atexit.register(telemetry.close) # Also written when the command fails
     
     if args.command == "train":
-        pipeline = TrainingPipeline(args.ticker, mode=args.mode, source=args.source)
+        from src.ml.predictor import RefitPolicy
+        from src.pipelines.training import TrainingPipeline
+        policy = RefitPolicy(max_new_fraction=0.25 if args.max_new_fraction is None else args.max_new_fraction, max_updates=args.max_updates)
+        pipeline = TrainingPipeline(args.ticker, mode=args.mode, source=args.source, incremental=args.incremental, refit_policy=policy, select_features=args.select_features, stream=args.stream, chunk_rows=args.chunk_rows, external_memory=args.external_memory, model_type=args.model, seq_window=args.seq_window)
         pipeline.run(period=args.period)
         
     elif args.command == "predict":
+        from src.pipelines.inference import InferencePipeline
         pipeline = InferencePipeline(args.ticker, mode=args.mode, source=args.source)
         pipeline.run()
 
     elif args.command == "backtest":
-        pipeline = BacktestPipeline(args.ticker, mode=args.mode, source=args.source, threshold=args.threshold, risk_pct=args.risk, adx_threshold=args.filter_adx, trend_filter=args.trend_filter)
+        from src.ml.predictor import RefitPolicy
+        from src.pipelines.backtest import BacktestPipeline
+        from src.strategy.montecarlo import MonteCarloSimulator
+        pipeline = BacktestPipeline(args.ticker, mode=args.mode, source=args.source, threshold=args.threshold, risk_pct=args.risk, adx_threshold=args.filter_adx, trend_filter=args.trend_filter, n_splits=args.folds, window=args.window, embargo=args.embargo, workers=args.workers, warm_start=args.warm_start, refit_policy=RefitPolicy(max_new_fraction=args.max_new_fraction, max_updates=args.max_updates), monte_carlo=MonteCarloSimulator(n_sims=args.mc_sims, method=args.mc_method, block_size=args.mc_block, ruin_drawdown=args.ruin) if args.mc_sims > 0 else None, mc_risk_pct=args.mc_risk, intrabar=args.intrabar, verbosity=args.verbosity, ledger_dir=args.ledger, checkpoint=args.checkpoint)
         pipeline.run(period=args.period)
+
+    elif args.command == "sweep":
+        from src.pipelines.sweep import SweepPipeline
+        pipeline = SweepPipeline(args.ticker, mode=args.mode, source=args.source, workers=args.workers, n_splits=args.folds, window=args.window, embargo=args.embargo, checkpoint=args.checkpoint)
+        pipeline.run(
+            period=args.period,
+            thresholds=args.threshold,
+            risks=args.risk,
+            adx_thresholds=args.filter_adx,
+            trend_filters=[bool(v) for v in args.trend_filter],
+            top=args.top,
+            output=args.output
+        )
+
+    elif args.command == "tune":
+        from src.pipelines.tuning import TuningPipeline
+        pipeline = TuningPipeline(args.ticker, mode=args.mode, source=args.source, n_splits=args.folds, window=args.window, embargo=args.embargo, workers=args.workers, metric=args.metric, seed=args.seed)
+        pipeline.run(period=args.period, n_trials=args.trials)
+
+    elif args.command == "labels":
+        from src.pipelines.labels import LabelComparisonPipeline
+        pipeline = LabelComparisonPipeline(args.ticker, mode=args.mode, source=args.source, horizons=args.horizons, stop_mults=args.stop, tp_mults=args.tp, threshold=args.threshold, risk_pct=args.risk, n_splits=args.folds, window=args.window, embargo=args.embargo, workers=args.workers)
+        pipeline.run(period=args.period, output=args.output)
+
+    elif args.command == "portfolio":
+        from src.pipelines.portfolio import PortfolioPipeline
+        pipeline = PortfolioPipeline(args.tickers, mode=args.mode, source=args.source, initial_capital=args.capital, risk_pct=args.risk, max_positions=args.max_positions, max_exposure=args.max_exposure, leverage=args.leverage, threshold=args.threshold, adx_threshold=args.filter_adx, trend_filter=args.trend_filter, n_splits=args.folds, window=args.window, embargo=args.embargo, workers=args.workers)
+        pipeline.run(period=args.period, output=args.output)
+
+    elif args.command == "pool":
+        from src.pipelines.pooled import PooledTrainingPipeline, PooledInferencePipeline
+        if args.action == "train":
+            pipeline = PooledTrainingPipeline(args.tickers, mode=args.mode, source=args.source, sectors_file=args.sectors, model_name=args.name, prefetch=args.prefetch, fetchers=args.fetchers, workers=args.workers)
+            pipeline.run(period=args.period)
+        else:
+            pipeline = PooledInferencePipeline(args.tickers, mode=args.mode, source=args.source, sectors_file=args.sectors, model_name=args.name, prefetch=args.prefetch, fetchers=args.fetchers, workers=args.workers)
+            pipeline.run()
+
+    elif args.command == "scan":
+        from src.pipelines.scan import ScanPipeline, load_tickers
+        tickers = load_tickers(args.tickers, args.file)
+        if not tickers:
+            parser.error("scan needs --tickers or --file")
+        pipeline = ScanPipeline(tickers, mode=args.mode, source=args.source, workers=args.workers, budget=args.budget, quiet=not args.verbose, prefetch=args.prefetch, fetchers=args.fetchers)
+        pipeline.run(output=args.output, top=args.top, publish=args.publish)
+
+    elif args.command == "journal":
+        from src.infrastructure.journal import SignalJournal
+        journal = SignalJournal()
+        history = journal.history(ticker=args.ticker, mode=args.mode, since=args.since, status=args.status, limit=args.limit)
+        print("\n" + "═"*45)
+        print(f"🗂️ SIGNAL JOURNAL ({len(history)} rows)")
+        print(history.drop(columns=['id', 'notion_id']).to_string(index=False) if not history.empty else "No signal journaled yet.")
+        print("═"*45)
+        summary = journal.summary(since=args.since)
+        if not summary.empty:
+            print(summary.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+        print()
+
+    elif args.command == "serve":
+        from src.pipelines.serve import ServePipeline, parse_targets
+        pipeline = ServePipeline(parse_targets(args.targets), source=args.source, grace=args.grace, history=args.history, publish=not args.no_publish)
+        pipeline.run()
         
     else:
         parser.print_help()
@@ -1,38 +1,41 @@
-from src.data.providers.yahoo import YahooDataProvider
-from src.data.providers.binance import BinanceDataProvider
-
 class DataProviderFactory:
     """
     Factory to create the right DataProvider.
+    Provider modules are imported on first use, so a Binance ticker never
+    loads yfinance and a Yahoo ticker never loads ccxt.
     """
+
+    CRYPTO_PAIRS = ['BTC-USD', 'ETH-USD', 'SOL-USD', 'XRP-USD']
+    # Additional heuristic for non-hyphenated tickers (common user input)
+    CRYPTO_SYMBOLS = ['BTCUSD', 'ETHUSD', 'SOLUSD', 'XRPUSD']
+
+    @staticmethod
+    def resolve_source(ticker: str, source: str = "auto") -> str:
+        """'yahoo' or 'binance' for a ticker, without importing any provider."""
+        if source in ("binance", "yahoo"):
+            return source
+
+        # Auto
+        # Heuristic: If it looks like a Pair (BTC-USD) and is in top crypto list? 
+        # Or just default all '-USD' to Yahoo unless specified?
+        # User wants Binance for Crypto.
+        if ticker in DataProviderFactory.CRYPTO_PAIRS or ticker in DataProviderFactory.CRYPTO_SYMBOLS:
+            return "binance"
+
+        # Or if it has USDT
+        if 'USDT' in ticker:
+            return "binance"
+
+        return "yahoo"
     
     @staticmethod
     def get_provider(ticker: str, source: str = "auto"):
         """
         source: 'yahoo', 'binance', or 'auto'.
         """
-        
-        if source == "binance":
+        if DataProviderFactory.resolve_source(ticker, source) == "binance":
+            from src.data.providers.binance import BinanceDataProvider
             return BinanceDataProvider(ticker)
-        
-        elif source == "yahoo":
-            return YahooDataProvider(ticker)
-            
-        else: # Auto
-            # Heuristic: If it looks like a Pair (BTC-USD) and is in top crypto list? 
-            # Or just default all '-USD' to Yahoo unless specified?
-            # User wants Binance for Crypto.
-            
-            # Simple heuristic:
-            if ticker in ['BTC-USD', 'ETH-USD', 'SOL-USD', 'XRP-USD']:
-                 return BinanceDataProvider(ticker)
-            
-            # Additional heuristic for non-hyphenated tickers (common user input)
-            if ticker in ['BTCUSD', 'ETHUSD', 'SOLUSD', 'XRPUSD']:
-                 return BinanceDataProvider(ticker)
-            
-            # Or if it has USDT
-            if 'USDT' in ticker:
-                 return BinanceDataProvider(ticker)
 
-            return YahooDataProvider(ticker)
+        from src.data.providers.yahoo import YahooDataProvider
+        return YahooDataProvider(ticker)
@@ -3,6 +3,8 @@ import pandas as pd
 from typing import Dict, List, Optional
 import time
 
+from src.infrastructure.telemetry import count, span, timed
+
 class BinanceDataProvider:
     """
     Data Provider for Binance using CCXT.
@@ -39,6 +41,7 @@ class BinanceDataProvider:
              
         return ticker.replace('-', '/')
 
+    @timed("fetch_binance")
     def fetch_data(self, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """
         Fetch OHLCV data.
@@ -94,7 +97,9 @@ class BinanceDataProvider:
                 
                 # Retrieve Raw Data
                 # [Open time, Open, High, Low, Close, Volume, Close time, Quote asset volume, Number of trades, Taker buy base asset volume, ...]
-                klines = self.exchange.public_get_klines(params)
+                with span("klines_request"):
+                    klines = self.exchange.public_get_klines(params)
+                count("binance_requests")
                 
                 if not klines:
                     break
@@ -142,6 +147,7 @@ class BinanceDataProvider:
         # Deduplicate
         df = df[~df.index.duplicated(keep='first')]
         
+        count("rows_fetched", len(df))
         print(f"[+] {len(df)} rows fetched (with Taker Volume).")
         return df
 
@@ -2,12 +2,15 @@ import yfinance as yf
 import pandas as pd
 from typing import Dict, List
 
+from src.infrastructure.telemetry import count, timed
+
 class YahooDataProvider:
     """Provider data from Yahoo Finance."""
     
     def __init__(self, ticker: str):
         self.ticker = ticker
 
+    @timed("fetch_yahoo")
     def fetch_data(self, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """Fetch OHLCV data."""
         print(f"[*] Fetching data for {self.ticker}...")
@@ -25,6 +28,7 @@ class YahooDataProvider:
         # Ensure Datetime Index
         df.index = pd.to_datetime(df.index)
 
+        count("rows_fetched", len(df))
         print(f"[+] {len(df)} rows fetched.")
         return df
 
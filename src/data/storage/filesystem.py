@@ -2,6 +2,7 @@ import os
 import pandas as pd
 from typing import Optional
 from src.config.settings import settings
+from src.infrastructure.telemetry import timed
 
 class LocalStorage:
     """Handles local file persistence (Parquet)."""
@@ -9,6 +10,7 @@ class LocalStorage:
     def __init__(self, data_dir: str = None):
         self.data_dir = data_dir or settings.DATA_DIR
 
+    @timed("storage_save")
     def save(self, df: pd.DataFrame, filename: str) -> str:
         """Save DataFrame to parquet."""
         if df.empty:
@@ -26,6 +28,7 @@ class LocalStorage:
             print(f"[!] Failed to save data: {e}")
             return ""
 
+    @timed("storage_load")
     def load(self, filename: str) -> pd.DataFrame:
         """Load DataFrame from parquet."""
         file_path = os.path.join(self.data_dir, filename)
@@ -1,12 +1,40 @@
 import pandas as pd
 import numpy as np
 import pandas_ta as ta
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 # Import the modular feature groups
 from src.features.indicators import momentum, trend, volatility, volume, stats
+from src.features.labels import triple_barrier_labels
 from src.features.smc.structure import detect_swing_points
-from src.features.smc.fvg import detect_fair_value_gaps
+from src.features.smc import fvg
+from src.infrastructure.telemetry import count, span, timed
+
+# Columns produced by each indicator module (before any timeframe suffix),
+# declared in the module next to the code writing them
+MODULE_OUTPUTS = {
+    'stats': stats.OUTPUTS,
+    'momentum': momentum.OUTPUTS,
+    'trend': trend.OUTPUTS,
+    'volatility': volatility.OUTPUTS,
+    'volume': volume.OUTPUTS,
+}
+
+# Columns added outside the indicator modules (base timeframe only)
+ORDERFLOW_FEATURES = ['Taker_Sell_Vol', 'OrderFlow_Net', 'OrderFlow_Pct']
+STRUCTURE_FEATURES = ['Rolling_High', 'Rolling_Low', 'BOS_High', 'Swing_High_Confirmed', 'Swing_Low_Confirmed', *fvg.OUTPUTS, 'Body_Strength']
+
+# Running totals from the first bar: their level depends on where the history
+# starts (see ml/streaming.py, which chains them across shards).
+CUMULATIVE_FEATURES = ['OBV', 'OBV_SMA20']
+TIMEFRAME_SUFFIXES = ['', '_1h', '_4h', '_daily', '_weekly']
+
+def is_cumulative(column: str) -> bool:
+    return any(column == f"{base}{suffix}" for base in CUMULATIVE_FEATURES for suffix in TIMEFRAME_SUFFIXES)
+
+# Always generated when a feature subset is requested:
+# used by the target, the risk manager and the trading filters.
+CORE_FEATURES = ['ATR_14', 'ATR_Pct', 'ADX_14', 'ADX_14_daily', 'BB_Width', 'RSI_14', 'EMA_200', 'EMA_50_1h', 'EMA_50_4h']
 
 class FeatureEngineer:
     """
@@ -14,7 +42,13 @@ class FeatureEngineer:
     Orchestrates the calculation of features across multiple timeframes.
     """
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame, required: Optional[Iterable[str]] = None):
+        """
+        required: Optional feature subset (e.g. the model's selected features).
+                  Timeframes and indicator modules producing none of them
+                  (nor a CORE_FEATURES column) are skipped.
+        """
+        self.required = set(required) | set(CORE_FEATURES) if required else None
         self.df = df.copy()
         if not isinstance(self.df.index, pd.DatetimeIndex):
             # Ensure DateTimeIndex for resampling
@@ -22,7 +56,18 @@ class FeatureEngineer:
                 self.df.index = pd.to_datetime(self.df.index)
             except Exception as e:
                 print(f"Warning: Could not convert index to DatetimeIndex. Resampling may fail. {e}")
+        if self.required is not None:
+            self._check_required()
 
+    def _check_required(self):
+        """Raises if a required column is neither an input column nor produced by any module (it would be skipped silently)."""
+        known = {f"{c}{suffix}" for outputs in MODULE_OUTPUTS.values() for c in outputs for suffix in TIMEFRAME_SUFFIXES}
+        known |= set(ORDERFLOW_FEATURES) | set(STRUCTURE_FEATURES) | set(self.df.columns)
+        unknown = sorted(self.required - known)
+        if unknown:
+            raise ValueError(f"No feature module produces {unknown}: declare them in the OUTPUTS of the indicator module writing them.")
+
+    @timed("features")
     def generate_all(self) -> pd.DataFrame:
         """
         Main pipeline to add all features from the user list.
@@ -56,7 +101,8 @@ class FeatureEngineer:
         # GENERATE BASE FEATURES
         # If data is Daily, these will be "Daily" features.
         # If data is 1h, these will be "1h" features.
-        self._generate_features_for_df(self.df, suffix="") 
+        with span("timeframe_base"):
+            self._generate_features_for_df(self.df, suffix="")
         
         # 2. Multi-Timeframe Logic
         # We define the desired higher timeframes to aggregates
@@ -70,49 +116,21 @@ class FeatureEngineer:
             # --- 15 Minute Data ('15T' or '15min') ---
             if freq == '15T' or freq == '15min':
                 print(f"[*] Detected 15m data. Generating 1h, 4h, Daily features...")
-                
-                # Resample -> 1h
-                df_1h = self._resample_ohlcv(self.df, '1h')
-                df_1h = self._generate_features_for_df(df_1h, suffix="_1h")
-                self.df = self._merge_mtf(self.df, df_1h, suffix="_1h")
-                
-                # Resample -> 4h
-                df_4h = self._resample_ohlcv(self.df, '4h')
-                df_4h = self._generate_features_for_df(df_4h, suffix="_4h")
-                self.df = self._merge_mtf(self.df, df_4h, suffix="_4h")
-
-                # Resample -> Daily
-                df_d = self._resample_ohlcv(self.df, '1d')
-                df_d = self._generate_features_for_df(df_d, suffix="_daily")
-                self.df = self._merge_mtf(self.df, df_d, suffix="_daily")
+                self._add_timeframe('1h', "_1h")
+                self._add_timeframe('4h', "_4h")
+                self._add_timeframe('1d', "_daily")
 
             # --- 1 Hour Data ('H' or '1H') ---
             elif freq == 'H' or freq == '1H':
                 print("Detected 1H data. Generating 4H, Daily, Weekly features...")
-
-                # Resample -> 4H
-                df_4h = self._resample_ohlcv(self.df, '4h')
-                df_4h = self._generate_features_for_df(df_4h, suffix="_4h")
-                self.df = self._merge_mtf(self.df, df_4h, suffix="_4h")
-
-                # Resample -> Daily
-                df_d = self._resample_ohlcv(self.df, '1d')
-                df_d = self._generate_features_for_df(df_d, suffix="_daily")
-                self.df = self._merge_mtf(self.df, df_d, suffix="_daily")
-
-                # Resample -> Weekly
-                df_w = self._resample_ohlcv(self.df, '1W')
-                df_w = self._generate_features_for_df(df_w, suffix="_weekly")
-                self.df = self._merge_mtf(self.df, df_w, suffix="_weekly")
+                self._add_timeframe('4h', "_4h")
+                self._add_timeframe('1d', "_daily")
+                self._add_timeframe('1W', "_weekly")
                 
             # --- Daily Data ('D' or '1D') ---
             elif freq == 'D' or freq == '1D':
                 print("Detected Daily data. Generating Weekly features...")
-                
-                # Resample -> Weekly
-                df_w = self._resample_ohlcv(self.df, '1W')
-                df_w = self._generate_features_for_df(df_w, suffix="_weekly")
-                self.df = self._merge_mtf(self.df, df_w, suffix="_weekly")
+                self._add_timeframe('1W', "_weekly")
             
             else:
                  # Fallback or strict strict check? 
@@ -124,27 +142,41 @@ class FeatureEngineer:
                      print(f"[!] Unhandled frequency: {freq}")
                 
         # 3. Add SMC / Structure
-        self._add_structure()
+        with span("structure"):
+            self._add_structure()
         
         self.df.dropna(inplace=True)
+        count("feature_rows", len(self.df))
         return self.df
 
+    def _add_timeframe(self, rule: str, suffix: str):
+        """Resamples to a higher timeframe, generates its features and merges them back."""
+        if self.required is not None and not any(f.endswith(suffix) for f in self.required):
+            print(f"[*] Skipping {suffix[1:]} features (not used by the model).")
+            return
+        with span(f"timeframe{suffix}"):
+            df_tf = self._resample_ohlcv(self.df, rule)
+            df_tf = self._generate_features_for_df(df_tf, suffix=suffix)
+            self.df = self._merge_mtf(self.df, df_tf, suffix=suffix)
+
+    def _modules_for(self, suffix: str) -> list:
+        """Indicator modules to run for a timeframe (all of them unless a subset is required)."""
+        modules = [
+            ('stats', stats.add_stats_features),
+            ('momentum', momentum.add_momentum_features),
+            ('trend', trend.add_trend_features),
+            ('volatility', volatility.add_volatility_features),
+            ('volume', volume.add_volume_features),
+        ]
+        if self.required is None:
+            return [fn for _, fn in modules]
+        return [fn for name, fn in modules if any(f"{c}{suffix}" in self.required for c in MODULE_OUTPUTS[name])]
+
     def _generate_features_for_df(self, df_in: pd.DataFrame, suffix: str) -> pd.DataFrame:
         """Helper to run all indicator modules on a dataframe."""
-        # 1. Stats (Returns, etc)
-        df_in = stats.add_stats_features(df_in, prefix="")
-        
-        # 2. Momentum
-        df_in = momentum.add_momentum_features(df_in, prefix="")
-        
-        # 3. Trend
-        df_in = trend.add_trend_features(df_in, prefix="")
-        
-        # 4. Volatility
-        df_in = volatility.add_volatility_features(df_in, prefix="")
-        
-        # 5. Volume
-        df_in = volume.add_volume_features(df_in, prefix="")
+        # 1. Stats (Returns, etc) / 2. Momentum / 3. Trend / 4. Volatility / 5. Volume
+        for add_features in self._modules_for(suffix):
+            df_in = add_features(df_in, prefix="")
 
         # Apply Suffix to these new columns (except OHLCV)
         # Note: The modules add columns directly.
@@ -172,11 +204,8 @@ class FeatureEngineer:
         
         cols_before = set(df_in.columns)
         
-        stats.add_stats_features(df_in, prefix="")
-        momentum.add_momentum_features(df_in, prefix="")
-        trend.add_trend_features(df_in, prefix="")
-        volatility.add_volatility_features(df_in, prefix="")
-        volume.add_volume_features(df_in, prefix="")
+        for add_features in self._modules_for(p):
+            add_features(df_in, prefix="")
         
         cols_after = set(df_in.columns)
         new_cols = cols_after - cols_before
@@ -241,7 +270,7 @@ class FeatureEngineer:
         self.df['Swing_Low_Confirmed'] = sl
         
         # 3. FVG
-        df_fvg = detect_fair_value_gaps(self.df)
+        df_fvg = fvg.detect_fair_value_gaps(self.df)
         self.df = pd.concat([self.df, df_fvg], axis=1)
 
         # 4. Body Strength
@@ -249,6 +278,17 @@ class FeatureEngineer:
         total_range = self.df['High'] - self.df['Low']
         self.df['Body_Strength'] = body / total_range
 
+    def add_labels(self, horizons=(8, 20, 50), stop_mults=(2.0,), tp_mults=(2.0, 4.0)) -> pd.DataFrame:
+        """
+        Adds a triple-barrier target matrix (TB_h<h>_sl<x>_tp<y> columns, see
+        features/labels.py) next to 'Target'. Rows near the end keep NaN labels
+        for the horizons they cannot reach. Call after add_target.
+        """
+        labels = triple_barrier_labels(self.df, horizons=horizons, stop_mults=stop_mults, tp_mults=tp_mults)
+        self.df = pd.concat([self.df.drop(columns=labels.columns, errors='ignore'), labels], axis=1)
+        return self.df
+
+    @timed("target")
     def add_target(self, horizon: int = 5, threshold: float = 0.02) -> pd.DataFrame:
         """
         Create multi-class target with Dynamic ATR thresholds.
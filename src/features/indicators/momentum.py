@@ -1,6 +1,9 @@
 import pandas as pd
 import pandas_ta as ta
 
+# Columns written by add_momentum_features (before any timeframe suffix)
+OUTPUTS = ['RSI_14', 'RSI_20', 'Stoch_K14', 'Stoch_D14', 'MACD_Line', 'MACD_Signal', 'MACD_Hist', 'CCI_20', 'WillR_14', 'ROC_5', 'ROC_10', 'MOM_Rank5d']
+
 def add_momentum_features(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
     """
     Adds momentum indicators to the DataFrame.
@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+# Columns written by add_stats_features (before any timeframe suffix)
+OUTPUTS = ['Log_Ret', 'Log_Ret_Lag1', 'Log_Ret_Lag2', 'Log_Ret_Lag3', 'Log_Ret_Lag4', 'Log_Ret_Lag5', 'HL_Pct', 'Range_Pct20']
+
 def add_stats_features(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
     """Adds statistical features (Returns, Range, etc)."""
     
@@ -2,6 +2,9 @@ import pandas as pd
 import pandas_ta as ta
 import numpy as np
 
+# Columns written by add_trend_features (before any timeframe suffix)
+OUTPUTS = ['EMA_10', 'EMA_20', 'EMA_50', 'EMA_200', 'SMA_5', 'SMA_20', 'SMA_50', 'SMA_Ratio_50_20', 'Crossover_EMA10_20', 'Slope_SMA20', 'Slope_EMA20', 'ADX_14', 'Regime_Trend']
+
 def add_trend_features(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
     """
     Adds trend indicators to the DataFrame.
@@ -1,6 +1,9 @@
 import pandas as pd
 import pandas_ta as ta
 
+# Columns written by add_volatility_features (before any timeframe suffix)
+OUTPUTS = ['ATR_14', 'ATR_Pct', 'ATR_20', 'BB_Width', 'BB_Pb', 'BB_UB_Dist', 'Vol_Rank20d', 'VIX_Proxy']
+
 def add_volatility_features(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
     """
     Adds volatility indicators.
@@ -1,6 +1,9 @@
 import pandas as pd
 import pandas_ta as ta
 
+# Columns written by add_volume_features (before any timeframe suffix)
+OUTPUTS = ['Volume_SMA20', 'OBV', 'OBV_SMA20']
+
 def add_volume_features(df: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
     """Adds volume indicators."""
     
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterable
+
+def _first_hit(hits: np.ndarray) -> np.ndarray:
+    """Index of the first True per row, or the window length if none."""
+    return np.where(hits.any(axis=1), hits.argmax(axis=1), hits.shape[1])
+
+def label_name(horizon: int, stop_mult: float, tp_mult: float) -> str:
+    return f"TB_h{horizon}_sl{stop_mult:g}_tp{tp_mult:g}"
+
+def triple_barrier_labels(df: pd.DataFrame, horizons: Iterable[int] = (8, 20, 50), stop_mults: Iterable[float] = (2.0,), tp_mults: Iterable[float] = (2.0, 4.0), atr_col: str = 'ATR_14') -> pd.DataFrame:
+    """
+    Triple-barrier labels for every (horizon, stop, take-profit) combination, in one pass.
+    Entry at the close of bar i; barriers at close +/- mult * ATR; bars i+1..i+h are scanned.
+    1 (Long): the long take-profit is hit strictly before the long stop within h bars.
+    2 (Short): same for a short trade (earliest winner if both sides win).
+    0 (Neutral): time barrier reached first. NaN: fewer than h future bars.
+    The forward high/low windows are strided views; first-hit times are
+    computed once per barrier at the longest horizon and reused for the shorter ones.
+    """
+    horizons, stop_mults, tp_mults = sorted(set(horizons)), sorted(set(stop_mults)), sorted(set(tp_mults))
+    max_h = horizons[-1]
+    close = df['Close'].to_numpy(dtype=np.float64)
+    atr = df[atr_col].to_numpy(dtype=np.float64)
+    n = len(close)
+
+    # Forward windows: row i -> bars i+1 .. i+max_h (NaN padded past the end)
+    pad = np.full(max_h, np.nan)
+    fwd_high = sliding_window_view(np.concatenate([df['High'].to_numpy(dtype=np.float64)[1:], pad]), max_h)
+    fwd_low = sliding_window_view(np.concatenate([df['Low'].to_numpy(dtype=np.float64)[1:], pad]), max_h)
+    remaining = (n - 1) - np.arange(n) # Future bars available
+
+    up_hit, down_hit = {}, {}
+    for mult in set(stop_mults) | set(tp_mults):
+        up_hit[mult] = _first_hit(fwd_high >= (close + mult * atr)[:, None])
+        down_hit[mult] = _first_hit(fwd_low <= (close - mult * atr)[:, None])
+
+    labels = {}
+    for sl in stop_mults:
+        for tp in tp_mults:
+            # Same-bar touch of both barriers counts as a stop (conservative)
+            long_t = np.where(up_hit[tp] < down_hit[sl], up_hit[tp], max_h + 1)
+            short_t = np.where(down_hit[tp] < up_hit[sl], down_hit[tp], max_h + 1)
+            for h in horizons:
+                long_win, short_win = long_t < h, short_t < h
+                label = np.where(long_win & (~short_win | (long_t <= short_t)), 1, np.where(short_win, 2, 0)).astype(np.float64)
+                label[remaining < h] = np.nan
+                label[np.isnan(atr)] = np.nan
+                labels[label_name(h, sl, tp)] = label
+
+    return pd.DataFrame(labels, index=df.index)
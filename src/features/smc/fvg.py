@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+# Columns returned by detect_fair_value_gaps
+OUTPUTS = ['Is_FVG_Bull', 'Is_FVG_Bear', 'Recent_FVG_Bull', 'Recent_FVG_Bear']
+
 def detect_fair_value_gaps(df: pd.DataFrame, threshold: float = 0.0) -> pd.DataFrame:
     """
     Detects Bullish and Bearish Fair Value Gaps (FVG).
@@ -40,4 +43,4 @@ def detect_fair_value_gaps(df: pd.DataFrame, threshold: float = 0.0) -> pd.DataF
     df['Recent_FVG_Bull'] = df['Is_FVG_Bull'].rolling(3).max().fillna(0)
     df['Recent_FVG_Bear'] = df['Is_FVG_Bear'].rolling(3).max().fillna(0)
     
-    return df[['Is_FVG_Bull', 'Is_FVG_Bear', 'Recent_FVG_Bull', 'Recent_FVG_Bear']]
+    return df[OUTPUTS]
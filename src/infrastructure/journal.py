@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from src.config.settings import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker      TEXT NOT NULL,
+    mode        TEXT NOT NULL,
+    bar_ts      TEXT NOT NULL,
+    direction   TEXT NOT NULL,
+    confidence  REAL,
+    entry       REAL,
+    sl          REAL,
+    tp          REAL,
+    rr_ratio    REAL,
+    created_at  TEXT NOT NULL,
+    claimed_at  TEXT,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    notion_id   TEXT,
+    UNIQUE (ticker, mode, bar_ts, direction)
+);
+CREATE INDEX IF NOT EXISTS idx_signals_ticker_bar ON signals (ticker, mode, bar_ts);
+CREATE INDEX IF NOT EXISTS idx_signals_created ON signals (created_at);
+CREATE INDEX IF NOT EXISTS idx_signals_status ON signals (status);
+"""
+
+class SignalJournal:
+    """
+    Local SQLite journal of every published signal.
+    The unique key (ticker, mode, bar timestamp, direction) makes publishing
+    idempotent: a signal is claimed once, so re-running on the same candle
+    never triggers a second API call. Also the local source for history and
+    reporting (no Notion query needed).
+    Status: pending -> published | failed (in the outbox) | rejected.
+    A 'pending' row older than the lease belongs to a run that died before
+    recording an outcome (kill, Ctrl-C, unexpected error): it is claimed again
+    instead of being skipped as a duplicate.
+    """
+
+    def __init__(self, path: Optional[str] = None, lease: float = 300.0):
+        """lease: Seconds a 'pending' claim blocks other runs before it is considered abandoned."""
+        self.path = path or os.path.join(settings.DATA_DIR, "signals.db")
+        self.lease = lease
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL") # Readers (reports) never block the publisher
+        self.conn.executescript(SCHEMA)
+        if "claimed_at" not in {row[1] for row in self.conn.execute("PRAGMA table_info(signals)")}:
+            self.conn.execute("ALTER TABLE signals ADD COLUMN claimed_at TEXT") # Journals created before the lease
+
+    @staticmethod
+    def key(plan: Dict[str, Any]) -> tuple:
+        """(ticker, mode, bar timestamp, direction) of a plan; without a bar the scan time is used (no dedup)."""
+        bar = plan.get('bar') or datetime.now(timezone.utc).isoformat()
+        return plan['ticker'], plan.get('mode', ''), str(bar), plan['direction']
+
+    def claim(self, plan: Dict[str, Any], confidence: float) -> Optional[int]:
+        """
+        Records a new signal. Returns its id, or None if it is already handled
+        (published, rejected, queued in the outbox, or claimed by a run within
+        the lease): skip the API call. An abandoned 'pending' row is re-claimed.
+        """
+        now = datetime.now(timezone.utc)
+        key = self.key(plan)
+        values = (float(confidence), plan.get('entry'), plan.get('sl'), plan.get('tp'), plan.get('rr_ratio'))
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO signals (ticker, mode, bar_ts, direction, confidence, entry, sl, tp, rr_ratio, created_at, claimed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, *values, now.isoformat(), now.isoformat())
+            )
+            if cur.rowcount:
+                return cur.lastrowid
+            # Already journaled: take over a pending claim whose lease expired
+            stale = (now - timedelta(seconds=self.lease)).isoformat()
+            row = self.conn.execute(
+                "UPDATE signals SET claimed_at = ?, confidence = ?, entry = ?, sl = ?, tp = ?, rr_ratio = ? "
+                "WHERE ticker = ? AND mode = ? AND bar_ts = ? AND direction = ? AND status = 'pending' AND COALESCE(claimed_at, created_at) < ? RETURNING id",
+                (now.isoformat(), *values, *key, stale)
+            ).fetchone()
+            return row[0] if row else None
+
+    def mark(self, signal_id: int, status: str, notion_id: Optional[str] = None):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE signals SET status = ?, notion_id = COALESCE(?, notion_id) WHERE id = ?", (status, notion_id, signal_id))
+
+    def history(self, ticker: Optional[str] = None, mode: Optional[str] = None, since: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> pd.DataFrame:
+        """Latest signals, newest bar first (served by the indexes)."""
+        clauses, params = [], []
+        for col, value in (("ticker", ticker), ("mode", mode), ("status", status)):
+            if value:
+                clauses.append(f"{col} = ?")
+                params.append(value)
+        if since:
+            clauses.append("bar_ts >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return pd.read_sql_query(f"SELECT * FROM signals {where} ORDER BY bar_ts DESC LIMIT ?", self.conn, params=[*params, limit])
+
+    def summary(self, since: Optional[str] = None) -> pd.DataFrame:
+        """Signal counts and average confidence per ticker / mode / direction."""
+        where, params = ("WHERE bar_ts >= ?", [since]) if since else ("", [])
+        query = f"""
+            SELECT ticker, mode, direction, COUNT(*) AS signals,
+                   SUM(status = 'published') AS published, AVG(confidence) AS avg_confidence,
+                   MAX(bar_ts) AS last_bar
+            FROM signals {where}
+            GROUP BY ticker, mode, direction
+            ORDER BY signals DESC
+        """
+        with self._lock:
+            return pd.read_sql_query(query, self.conn, params=params)
+
+    def close(self):
+        self.conn.close()
@@ -1,66 +1,77 @@
 import requests
 from datetime import datetime
 import pytz
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+NOTION_API = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+PARIS_TZ = pytz.timezone("Europe/Paris")
+
+def notion_headers(token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Notion-Version": NOTION_VERSION
+    }
+
+def build_page(database_id: str, plan: Dict[str, Any], confidence: float, scanned_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """Notion page payload of a trading plan (scan date in Paris time)."""
+    scanned_at = scanned_at or datetime.now(PARIS_TZ)
+    return {
+        "parent": {"database_id": database_id},
+        "properties": {
+            "Ticker (ex: Alphabet, Apple)": {
+                "title": [{"text": {"content": plan['ticker']}}]
+            },
+            "Signal": {
+                "select": {"name": plan['direction']}
+            },
+            "Confiance": {
+                "number": round(confidence, 2)
+            },
+            "Prix d'entrée": {
+                "number": plan['entry']
+            },
+            "Stop-Loss": {
+                "number": plan['sl']
+            },
+            "Take-Profit": {
+                "number": plan['tp']
+            },
+            "Date du Scan": {
+                "date": {"start": scanned_at.isoformat()}
+            },
+            "Sentinel Score": {
+                "number": plan['rr_ratio']
+            }
+        }
+    }
 
 class NotionClient:
-    """Interacts with Notion API."""
-    
-    def __init__(self, token: str, database_id: str):
+    """Interacts with Notion API (blocking; see infrastructure/publisher.py for batches)."""
+
+    def __init__(self, token: str, database_id: str, timeout: float = 30.0):
         self.token = token
         self.database_id = database_id
-        self.headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
+        self.headers = notion_headers(token)
+        self.timeout = timeout
+        self.session = requests.Session() # Keep-alive between calls
+        self.session.headers.update(self.headers)
 
-    def publish_trading_plan(self, plan: Dict[str, Any], confidence: float):
-        """Creates a page in the trading journal database."""
-        url = "https://api.notion.com/v1/pages"
-        
-        # Paris Time
-        paris_tz = pytz.timezone("Europe/Paris")
-        now_paris = datetime.now(paris_tz)
-        
-        payload = {
-            "parent": {"database_id": self.database_id},
-            "properties": {
-                "Ticker (ex: Alphabet, Apple)": {
-                    "title": [{"text": {"content": plan['ticker']}}]
-                },
-                "Signal": {
-                    "select": {"name": plan['direction']}
-                },
-                "Confiance": {
-                    "number": round(confidence, 2)
-                },
-                "Prix d'entrée": {
-                    "number": plan['entry']
-                },
-                "Stop-Loss": {
-                    "number": plan['sl']
-                },
-                "Take-Profit": {
-                    "number": plan['tp']
-                },
-                "Date du Scan": {
-                    "date": {"start": now_paris.isoformat()}
-                },
-                "Sentinel Score": {
-                    "number": plan['rr_ratio']
-                }
-            }
-        }
+    def publish_trading_plan(self, plan: Dict[str, Any], confidence: float) -> bool:
+        """Creates a page in the trading journal database. Returns True on success."""
+        payload = build_page(self.database_id, plan, confidence)
 
         try:
-            response = requests.post(url, json=payload, headers=self.headers)
+            response = self.session.post(f"{NOTION_API}/pages", json=payload, timeout=self.timeout)
             print(f"[*] Notion API Status: {response.status_code}")
-            
+
             if response.status_code != 200:
                 print(f"[!] Notion Error: {response.text}")
-            else:
-                print(f"[+] Success! Plan published to Notion.")
-                
+                return False
+            print(f"[+] Success! Plan published to Notion.")
+            return True
+
         except Exception as e:
             print(f"[!] Network error publishing to Notion: {e}")
+            return False
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from src.config.settings import settings
+from src.infrastructure.journal import SignalJournal
+from src.infrastructure.notion import NOTION_API, build_page, notion_headers
+
+# (plan from RiskManager.generate_scenario + 'mode' / 'bar' keys, confidence)
+Signal = Tuple[Dict[str, Any], float]
+
+def retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header (delay in seconds or HTTP date)."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+class TokenBucket:
+    """Async token bucket: sustained `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float = 3.0, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class Outbox:
+    """
+    Local JSON-lines queue of pages not delivered yet.
+    Each entry keeps its payload, attempt count and next retry time (exponential backoff).
+    """
+
+    def __init__(self, path: Optional[str] = None, base_delay: float = 60.0, max_delay: float = 3600.0):
+        self.path = path or os.path.join(settings.DATA_DIR, "notion_outbox.jsonl")
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue # Line cut short by a crash
+        return entries
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, self.path)
+
+    def add(self, payloads: List[Dict[str, Any]], signal_ids: Optional[List[Optional[int]]] = None, attempts: int = 1):
+        """Queues undelivered payloads (first retry after base_delay), with their journal ids."""
+        if not payloads:
+            return
+        signal_ids = signal_ids or [None] * len(payloads)
+        with self._lock:
+            entries = self.load()
+            entries.extend({"id": uuid.uuid4().hex, "payload": p, "signal_id": sid, "attempts": attempts, "next_try": time.time() + self.base_delay} for p, sid in zip(payloads, signal_ids))
+            self._write(entries)
+
+    def due(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [e for e in self.load() if e['next_try'] <= now]
+
+    def settle(self, delivered: List[str], failed: List[str]):
+        """Drops delivered entries and pushes back the retry time of failed ones."""
+        with self._lock:
+            entries = []
+            for entry in self.load():
+                if entry['id'] in delivered:
+                    continue
+                if entry['id'] in failed:
+                    entry['attempts'] += 1
+                    entry['next_try'] = time.time() + min(self.max_delay, self.base_delay * 2 ** (entry['attempts'] - 1))
+                entries.append(entry)
+            self._write(entries)
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+class AsyncNotionPublisher:
+    """
+    Publishes trading plans to Notion over one keep-alive aiohttp session.
+    Page creations of a batch run concurrently, throttled by a token bucket
+    (Notion allows ~3 requests / s). 429 responses honour Retry-After, 5xx and
+    network errors are retried with exponential backoff; what still fails goes
+    to the local outbox and is retried by the next publish / flush.
+    With a SignalJournal, every signal is claimed before its API call, so a
+    signal already journaled (same ticker / mode / bar / direction) is skipped.
+    """
+
+    def __init__(self, token: Optional[str] = None, database_id: Optional[str] = None, base_url: str = NOTION_API, rate: float = 3.0, concurrency: int = 8, max_retries: int = 4, timeout: float = 30.0, outbox: Optional[Outbox] = None, journal: Optional[SignalJournal] = None):
+        """base_url: API root (a local stand-in server for tests / benchmarks)."""
+        self.token = token or settings.NOTION_TOKEN
+        self.database_id = database_id or settings.ID_DB_SENTINEL
+        self.base_url = base_url.rstrip("/")
+        self.rate = rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.outbox = outbox if outbox is not None else Outbox() # An empty Outbox is falsy (__len__)
+        self.journal = journal
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.bucket: Optional[TokenBucket] = None
+        self.stats = {"sent": 0, "retries": 0, "rate_limited": 0, "failed": 0, "rejected": 0, "duplicates": 0}
+
+    async def __aenter__(self) -> "AsyncNotionPublisher":
+        # Created inside the running loop
+        self.bucket = TokenBucket(self.rate)
+        self.session = aiohttp.ClientSession(
+            headers=notion_headers(self.token),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.concurrency)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def _post(self, payload: Dict[str, Any]) -> Tuple[Optional[bool], Optional[str]]:
+        """
+        (outcome, page id). outcome: True = created, False = retryable failure,
+        None = rejected by Notion (not retried).
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+            await self.bucket.acquire()
+            try:
+                async with self.session.post(f"{self.base_url}/pages", json=payload) as response:
+                    if response.status == 200:
+                        self.stats["sent"] += 1
+                        page = await response.json()
+                        return True, page.get("id")
+                    body = await response.text()
+                    if response.status == 429:
+                        self.stats["rate_limited"] += 1
+                        await asyncio.sleep(retry_after(response.headers.get("Retry-After")))
+                        continue
+                    if response.status < 500:
+                        print(f"[!] Notion rejected the page ({response.status}): {body[:200]}")
+                        self.stats["rejected"] += 1
+                        return None, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[!] Network error publishing to Notion: {e}")
+            # 5xx / network: exponential backoff with jitter
+            await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random()))
+        self.stats["failed"] += 1
+        return False, None
+
+    def _settled(self, results: list) -> List[Tuple[Optional[bool], Optional[str]]]:
+        """gather() results with any unexpected exception turned into a retryable failure (outbox)."""
+        settled = []
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"[!] Unexpected error publishing to Notion: {result!r}")
+                self.stats["failed"] += 1
+                result = (False, None)
+            settled.append(result)
+        return settled
+
+    def _record(self, signal_id: Optional[int], outcome: Optional[bool], page_id: Optional[str]):
+        if self.journal is not None and signal_id is not None:
+            self.journal.mark(signal_id, {True: "published", False: "failed", None: "rejected"}[outcome], page_id)
+
+    async def publish(self, signals: List[Signal]) -> Dict[str, int]:
+        """Creates one page per new signal concurrently; undelivered pages go to the outbox."""
+        claimed = []
+        for plan, confidence in signals:
+            signal_id = self.journal.claim(plan, confidence) if self.journal is not None else None
+            if self.journal is not None and signal_id is None:
+                self.stats["duplicates"] += 1 # Already published (or queued) for this bar
+                continue
+            claimed.append((build_page(self.database_id, plan, confidence), signal_id))
+
+        results = self._settled(await asyncio.gather(*(self._post(p) for p, _ in claimed), return_exceptions=True))
+        for (_, signal_id), (outcome, page_id) in zip(claimed, results):
+            self._record(signal_id, outcome, page_id)
+        failed = [(p, sid) for (p, sid), (outcome, _) in zip(claimed, results) if outcome is False]
+        self.outbox.add([p for p, _ in failed], [sid for _, sid in failed])
+        return dict(self.stats)
+
+    async def flush_outbox(self) -> int:
+        """Retries the outbox entries that are due. Returns the number delivered."""
+        entries = self.outbox.due()
+        if not entries:
+            return 0
+        results = self._settled(await asyncio.gather(*(self._post(e['payload']) for e in entries), return_exceptions=True))
+        for entry, (outcome, page_id) in zip(entries, results):
+            if outcome is not False:
+                self._record(entry.get('signal_id'), outcome, page_id)
+        # Rejected pages (None) leave the outbox too: retrying cannot fix them
+        delivered = [e['id'] for e, (outcome, _) in zip(entries, results) if outcome is not False]
+        self.outbox.settle(delivered, [e['id'] for e, (outcome, _) in zip(entries, results) if outcome is False])
+        return sum(1 for outcome, _ in results if outcome)
+
+async def _publish_all(signals: List[Signal], **kwargs) -> Dict[str, int]:
+    kwargs.setdefault("journal", SignalJournal())
+    async with AsyncNotionPublisher(**kwargs) as publisher:
+        retried = await publisher.flush_outbox()
+        stats = await publisher.publish(signals) if signals else dict(publisher.stats)
+        stats["outbox_delivered"] = retried
+        stats["outbox_pending"] = len(publisher.outbox)
+        return stats
+
+def publish_signals(signals: List[Signal], **kwargs) -> Dict[str, int]:
+    """Blocking entry point: flushes the due outbox entries, then publishes the batch."""
+    if not kwargs.get("token"):
+        settings.validate()
+    stats = asyncio.run(_publish_all(signals, **kwargs))
+    print(f"[+] Notion: {stats['sent']} pages created, {stats['duplicates']} duplicates skipped ({stats['retries']} retries, {stats['rate_limited']} rate limited) | Outbox: {stats['outbox_delivered']} delivered, {stats['outbox_pending']} pending")
+    return stats
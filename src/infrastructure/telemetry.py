@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import threading
+import functools
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class _NoopSpan:
+    """Shared span returned while telemetry is disabled: entering / leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _NoopSpan()
+
+def _node() -> Dict[str, Any]:
+    return {"calls": 0, "total_s": 0.0, "min_s": float("inf"), "max_s": 0.0, "children": {}}
+
+class _Span:
+    __slots__ = ("telemetry", "name", "node", "start")
+
+    def __init__(self, telemetry: "Telemetry", name: str):
+        self.telemetry = telemetry
+        self.name = name
+
+    def __enter__(self):
+        stack = self.telemetry._stack()
+        parent = stack[-1] if stack else self.telemetry.root
+        with self.telemetry._lock:
+            self.node = parent["children"].get(self.name)
+            if self.node is None:
+                self.node = parent["children"][self.name] = _node()
+        stack.append(self.node)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.telemetry._stack().pop()
+        node = self.node
+        with self.telemetry._lock:
+            node["calls"] += 1
+            node["total_s"] += elapsed
+            node["min_s"] = min(node["min_s"], elapsed)
+            node["max_s"] = max(node["max_s"], elapsed)
+        return False
+
+class Telemetry:
+    """
+    Per-run timing tree and counters.
+    `span(name)` is a context manager: nested spans build a tree, and repeated
+    spans with the same name under the same parent are aggregated (calls,
+    total / min / max seconds). `count(name, value)` adds to a counter.
+    `timed(name)` decorates a function with a span.
+    Disabled by default: span() then returns a shared no-op object and count()
+    returns at once, so instrumented hot paths cost one attribute check.
+    Each thread has its own span stack (its spans hang off the root); spans
+    recorded inside worker processes are not collected.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.run = None
+        self.directory = None
+        self.prometheus = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reset()
+
+    def _reset(self):
+        self.root = _node()
+        self.counters: Dict[str, float] = {}
+        self.started = datetime.now()
+        self._t0 = time.perf_counter()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enable(self, run: str = "run", directory: Optional[str] = None, prometheus: Optional[str] = None):
+        """
+        Starts recording a run.
+        directory: Where the JSON timing tree goes (default: data/telemetry).
+        prometheus: Optional path of a Prometheus text-format file (node_exporter textfile collector).
+        """
+        if directory is None:
+            from src.config.settings import settings
+            directory = os.path.join(settings.DATA_DIR, "telemetry")
+        self.run = run
+        self.directory = directory
+        self.prometheus = prometheus
+        self._reset()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name)
+
+    def timed(self, name: str):
+        """Decorator: runs the function inside span(name)."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _tree(self, name: str, node: Dict[str, Any]) -> Dict[str, Any]:
+        calls = node["calls"]
+        return {
+            "name": name, "calls": calls,
+            "total_s": round(node["total_s"], 9),
+            "mean_s": round(node["total_s"] / calls, 9) if calls else 0.0,
+            "min_s": round(node["min_s"], 9) if calls else 0.0,
+            "max_s": round(node["max_s"], 9),
+            "children": [self._tree(child, n) for child, n in node["children"].items()]
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "run": self.run,
+                "started": self.started.isoformat(timespec="seconds"),
+                "wall_s": round(time.perf_counter() - self._t0, 6),
+                "spans": [self._tree(name, node) for name, node in self.root["children"].items()],
+                "counters": dict(self.counters)
+            }
+
+    def _flatten(self, spans: list, prefix: str = ""):
+        for span in spans:
+            path = f"{prefix}/{span['name']}" if prefix else span['name']
+            yield path, span
+            yield from self._flatten(span["children"], path)
+
+    def _write_prometheus(self, snapshot: Dict[str, Any]):
+        def label(value: str) -> str:
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        run = label(snapshot["run"])
+        lines = [
+            "# HELP sentinel_span_seconds_total Time spent in an instrumented span.",
+            "# TYPE sentinel_span_seconds_total counter"
+        ]
+        spans = list(self._flatten(snapshot["spans"]))
+        lines += [f'sentinel_span_seconds_total{{run="{run}",span="{label(p)}"}} {s["total_s"]}' for p, s in spans]
+        lines += ["# HELP sentinel_span_calls_total Completed calls of an instrumented span.", "# TYPE sentinel_span_calls_total counter"]
+        lines += [f'sentinel_span_calls_total{{run="{run}",span="{label(p)}"}} {s["calls"]}' for p, s in spans]
+        lines += ["# HELP sentinel_events_total Counters recorded during the run.", "# TYPE sentinel_events_total counter"]
+        lines += [f'sentinel_events_total{{run="{run}",name="{label(n)}"}} {v}' for n, v in snapshot["counters"].items()]
+        lines += ["# HELP sentinel_run_wall_seconds Wall time of the run.", "# TYPE sentinel_run_wall_seconds gauge"]
+        lines.append(f'sentinel_run_wall_seconds{{run="{run}"}} {snapshot["wall_s"]}')
+
+        os.makedirs(os.path.dirname(self.prometheus) or ".", exist_ok=True)
+        tmp = self.prometheus + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.prometheus) # Scrapers never read a half-written file
+
+    def write(self) -> Optional[str]:
+        """Writes the JSON timing tree (and the Prometheus file). Returns the JSON path."""
+        if not self.enabled:
+            return None
+        snapshot = self.snapshot()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.run}_{self.started:%Y%m%d_%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        if self.prometheus:
+            self._write_prometheus(snapshot)
+        return path
+
+    def print_summary(self, depth: int = 3):
+        snapshot = self.snapshot()
+        print("\n" + "═"*45)
+        print(f"⏱️ TIMINGS [{snapshot['run']}] wall {snapshot['wall_s']:.2f}s")
+        for path, span in self._flatten(snapshot["spans"]):
+            level = path.count("/")
+            if level < depth:
+                print(f"{'  ' * level}{span['name']:<{30 - 2 * level}} {span['total_s']:9.3f}s  x{span['calls']}")
+        for name, value in snapshot["counters"].items():
+            print(f"[i] {name}: {value:g}")
+        print("═"*45)
+
+    def close(self):
+        """Prints the summary and writes the files of an enabled run."""
+        if not self.enabled:
+            return
+        self.print_summary()
+        path = self.write()
+        print(f"[+] Timing tree saved to {path}" + (f" | Prometheus: {self.prometheus}" if self.prometheus else ""))
+        self.disable()
+
+# Process-wide instance used by the instrumented modules
+telemetry = Telemetry()
+span = telemetry.span
+timed = telemetry.timed
+count = telemetry.count
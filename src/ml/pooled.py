@@ -0,0 +1,128 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+
+from src.ml.predictor import MarketPredictor
+
+TIMEFRAME_SUFFIXES = ("_1h", "_4h", "_daily", "_weekly")
+
+# Price levels -> distance to Close (x / Close - 1)
+PRICE_LEVELS = ('EMA_10', 'EMA_20', 'EMA_50', 'EMA_200', 'SMA_5', 'SMA_20', 'SMA_50', 'Rolling_High', 'Rolling_Low')
+# Price differences -> fraction of Close (x / Close)
+PRICE_UNITS = ('ATR_14', 'ATR_20', 'MACD_Line', 'MACD_Signal', 'MACD_Hist', 'BB_UB_Dist', 'Slope_SMA20', 'Slope_EMA20')
+# Volume amounts -> multiple of the 20-bar average volume of the same timeframe
+VOLUME_UNITS = ('OBV', 'OBV_SMA20', 'Taker_Buy_Vol', 'Taker_Sell_Vol', 'OrderFlow_Net')
+
+def _base_name(col: str) -> str:
+    for suffix in TIMEFRAME_SUFFIXES:
+        if col.endswith(suffix):
+            return col[:-len(suffix)]
+    return col
+
+def _suffix(col: str) -> str:
+    return col[len(_base_name(col)):]
+
+def normalize_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Makes scale-dependent features comparable across symbols (price and volume
+    levels differ by orders of magnitude). Column names are unchanged;
+    oscillators and ratios are already scale-free and kept as is.
+    """
+    df = df.copy()
+    close = df['Close']
+    volume_ref = df['Volume_SMA20'].replace(0, np.nan) if 'Volume_SMA20' in df.columns else None
+    # Average volume of each timeframe (higher timeframes sum the base volume)
+    volume_refs = {_suffix(c): df[c].replace(0, np.nan) for c in df.columns if _base_name(c) == 'Volume_SMA20'}
+
+    for col in MarketPredictor.feature_columns(df):
+        base = _base_name(col)
+        ref = volume_refs.get(_suffix(col), volume_ref)
+        if base in PRICE_LEVELS:
+            df[col] = df[col] / close - 1
+        elif base in PRICE_UNITS:
+            df[col] = df[col] / close
+        elif base == 'OBV' and col.replace('OBV', 'OBV_SMA20', 1) in df.columns and ref is not None:
+            # Cumulative: distance to its own average
+            df[col] = (df[col] - df[col.replace('OBV', 'OBV_SMA20', 1)]) / ref
+        elif base in VOLUME_UNITS and ref is not None and base != 'OBV_SMA20':
+            df[col] = df[col] / ref
+        elif base == 'Volume_SMA20' and col != base and volume_ref is not None:
+            # Higher timeframe average as a multiple of the base one
+            df[col] = df[col] / volume_ref
+
+    if volume_ref is not None:
+        df = df.drop(columns=[c for c in df.columns if _base_name(c) == 'OBV_SMA20'])
+        df['Volume_SMA20'] = df['Volume'] / volume_ref # Relative volume
+    return df
+
+class PooledPredictor(MarketPredictor):
+    """
+    One XGBoost model for a whole universe of symbols.
+    Rows of every symbol are stacked (normalized features) with 'Symbol' and
+    'Sector' categorical columns, so a single booster serves all tickers and
+    the universe is scored in one batched call.
+    """
+
+    def __init__(self, model_name: str = "pooled_swing", n_jobs: int = None, params: dict = None):
+        super().__init__(model_name=model_name, n_jobs=n_jobs, params=params)
+        self.symbols: List[str] = []
+        self.sectors: List[str] = []
+
+    def make_estimator(self, **overrides):
+        """Native categorical splits (hist) on Symbol / Sector."""
+        return super().make_estimator(**dict({'tree_method': 'hist', 'enable_categorical': True}, **overrides))
+
+    def stack(self, frames: Dict[str, pd.DataFrame], sectors: Dict[str, str]) -> pd.DataFrame:
+        """
+        Builds the pooled training frame from per-symbol feature frames.
+        Keeps the columns common to every symbol and sorts rows by time, so the
+        chronological hold-out of train() is the most recent period of all symbols.
+        """
+        self.symbols = sorted(frames)
+        self.sectors = sorted(set(sectors[s] for s in self.symbols))
+        parts = []
+        for symbol in self.symbols:
+            part = normalize_features(frames[symbol])
+            part['Symbol'] = symbol
+            part['Sector'] = sectors[symbol]
+            parts.append(part)
+
+        common = set.intersection(*(set(p.columns) for p in parts))
+        pooled = pd.concat([p[[c for c in parts[0].columns if c in common]] for p in parts])
+        pooled = pooled.sort_index(kind='stable')
+        return self.encode(pooled)
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Categorical dtypes with the categories seen at training (unknown -> missing)."""
+        df['Symbol'] = pd.Categorical(df['Symbol'], categories=self.symbols)
+        df['Sector'] = pd.Categorical(df['Sector'], categories=self.sectors)
+        return df
+
+    def predict_universe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scores one row per symbol in a single booster call.
+        df: latest normalized feature row of each symbol (Symbol / Sector columns included).
+        """
+        symbols = df['Symbol'].astype(str).to_numpy()
+        probs = self.model.predict_proba(self.encode(df)[self.features])
+        return pd.DataFrame({
+            'Symbol': symbols,
+            'Prediction': probs.argmax(axis=1),
+            'Confidence': probs.max(axis=1),
+            'P_Neutral': probs[:, 0],
+            'P_Long': probs[:, 1],
+            'P_Short': probs[:, 2],
+        }, index=df.index)
+
+    def load_model(self):
+        super().load_model()
+        # The registry loads a plain classifier: re-enable categorical input
+        self.model.set_params(enable_categorical=True)
+
+    def _extra_meta(self) -> dict:
+        return {'symbols': self.symbols, 'sectors': self.sectors}
+
+    def _apply_meta(self, meta: dict):
+        super()._apply_meta(meta)
+        self.symbols = list(meta.get('symbols', []))
+        self.sectors = list(meta.get('sectors', []))
@@ -1,48 +1,266 @@
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.metrics import accuracy_score, classification_report, log_loss
 from sklearn.utils.class_weight import compute_sample_weight
 import pandas as pd
-import joblib
+import numpy as np
+import json
 import os
+from typing import Optional
 from src.config.settings import settings
+from src.ml.registry import registry
+from src.ml.selection import select_features
+from src.ml.streaming import FeatureShards, ShardIter, balanced_weights
+
+class RefitPolicy:
+    """
+    Decides when an incremental update is not enough and a full refit is required.
+    Continued boosting only adds trees on top of the previous ensemble, so it
+    cannot forget old rows: use it for expanding windows / daily appends.
+    """
+
+    def __init__(self, max_new_fraction: Optional[float] = 0.25, max_updates: int = 10, min_new_rows: int = 20, incremental_rounds: int = 50):
+        """
+        max_new_fraction: Refit if the new rows exceed this share of the data
+                          (None: no limit; backtest derives it from its folds).
+        max_updates: Refit after this many consecutive incremental updates.
+        min_new_rows: Skip the update if fewer new rows are available.
+        incremental_rounds: Boosting rounds added per incremental update.
+        """
+        self.max_new_fraction = max_new_fraction
+        self.max_updates = max_updates
+        self.min_new_rows = min_new_rows
+        self.incremental_rounds = incremental_rounds
+
+    def refit_reason(self, predictor: "MarketPredictor", df: pd.DataFrame, new_df: pd.DataFrame) -> str:
+        """Returns why a full refit is needed, or an empty string if warm start is fine."""
+        if predictor.trained_until is None:
+            return "no previous model"
+        expected = predictor.selected_features or predictor.feature_columns(df)
+        if set(expected) != set(predictor.features):
+            return "feature set changed"
+        if predictor.updates_since_refit >= self.max_updates:
+            return f"{predictor.updates_since_refit} incremental updates since last refit"
+        if self.max_new_fraction is not None and len(new_df) > self.max_new_fraction * len(df):
+            return f"{len(new_df)} new rows exceed {self.max_new_fraction:.0%} of the data"
+        return ""
 
 class MarketPredictor:
     """XGBoost based market predictor."""
     
-    def __init__(self, model_name: str = "xgboost_generic.pkl"):
+    DEFAULT_PARAMS = {
+        "n_estimators": 300,
+        "max_depth": 4,
+        "learning_rate": 0.02,
+        "subsample": 0.8,
+    }
+
+    def __init__(self, model_name: str = "xgboost_generic", n_jobs: int = None, params: dict = None):
         """
-        model_name: Name of the file. 
-                    If training for a specific ticker, pass 'TSLA.pkl'.
+        model_name: Base name of the model files (a legacy '.pkl' suffix is ignored).
+                    If training for a specific ticker, pass 'TSLA_swing'.
+                    Stored as '<name>.ubj' (native XGBoost) + '<name>.json' (sidecar).
+        n_jobs: XGBoost threads (None = all cores). Lower it when several
+                predictors train side by side in worker processes.
+        params: Booster hyperparameters overriding DEFAULT_PARAMS (e.g. from 'tune').
         """
-        self.model_path = os.path.join(settings.MODELS_DIR, model_name)
+        base_name = model_name[:-4] if model_name.endswith(".pkl") else model_name
+        self.model_path = os.path.join(settings.MODELS_DIR, f"{base_name}.ubj")
+        self.meta_path = os.path.join(settings.MODELS_DIR, f"{base_name}.json")
+        self.legacy_path = os.path.join(settings.MODELS_DIR, f"{base_name}.pkl")
         self.features = []
+        self.feature_dtypes = {}
+        self.n_jobs = n_jobs
+
+        # Warm start state (persisted with the model)
+        self.trained_until = None
+        self.rows_trained = 0
+        self.updates_since_refit = 0
+
+        # Booster hyperparameters (persisted with the model)
+        self.params = dict(self.DEFAULT_PARAMS, **(params or {}))
+        self.tuning = None
+
+        # Pruned feature subset (persisted with the model, see prune_features)
+        self.selected_features = None
+        self.selection = None
+
+        # Fast path state (see predict_fast)
+        self._booster = None
+        self._iteration_range = (0, 0)
+        self._row_buffer = None
+        self._indexer_cols = None
+        self._indexer = None
         
-        self.model = xgb.XGBClassifier(
-            n_estimators=300,
-            max_depth=4,
-            learning_rate=0.02,
-            subsample=0.8,
+        self.model = self.make_estimator()
+
+    def make_estimator(self, **overrides) -> xgb.XGBClassifier:
+        """Fresh estimator. Fitting never happens in place on a loaded (shared) model."""
+        params = dict(self.params, **overrides)
+        return xgb.XGBClassifier(
+            **params,
             random_state=42,
             objective='multi:softmax', # Multi-class classification
             num_class=3,               # 0 (Neutral), 1 (Long), 2 (Short)
             eval_metric='mlogloss',    # LogLoss for multi-class
-            early_stopping_rounds=20   # Stop if no improvement for 20 rounds
+            early_stopping_rounds=20,  # Stop if no improvement for 20 rounds
+            n_jobs=self.n_jobs
         )
 
-    def train(self, df: pd.DataFrame):
-        """Train the model."""
+    @staticmethod
+    def feature_columns(df: pd.DataFrame) -> list:
+        """Model inputs: every column except OHLCV and target helpers (incl. TB_* label matrix)."""
         exclude = ['Open', 'High', 'Low', 'Close', 'Volume', 'Target', 'Future_Close', 'Future_Return']
-        self.features = [col for col in df.columns if col not in exclude]
+        return [col for col in df.columns if col not in exclude and not col.startswith('TB_')]
+
+    def train(self, df: pd.DataFrame, save: bool = True, features: list = None, target_col: str = 'Target'):
+        """
+        Train the model. Set save=False for throwaway models (e.g. CV folds).
+        features: explicit input columns (default: the selected subset, else all).
+        target_col: label column (e.g. a TB_* triple-barrier label). Unlabelled rows are dropped.
+        """
+        self.features = list(features or self.selected_features or self.feature_columns(df))
+        self.feature_dtypes = {c: str(df[c].dtype) for c in self.features}
+        if target_col != 'Target':
+            df = df.dropna(subset=[target_col])
         
         X = df[self.features]
-        y = df['Target']
+        y = df[target_col].astype(int)
 
         # Time-based split
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
 
         print(f"[*] Training XGBoost on {len(X_train)} rows...")
+        self._fit(X_train, y_train, X_test, y_test)
+
+        self.trained_until = df.index[-1]
+        self.rows_trained = len(df)
+        self.updates_since_refit = 0
         
+        if save:
+            self.save_model()
+
+    def train_streaming(self, shards: FeatureShards, save: bool = True, external_memory: bool = False, max_bin: int = 256):
+        """
+        Out-of-core training on feature shards written to disk (see FeatureShards.write).
+        Same chronological 80/20 split, balanced weights, hyperparameters and
+        early stopping as train(), with tree_method='hist'. Shards are streamed
+        one at a time into a QuantileDMatrix (~1 byte per value) or, with
+        external_memory=True, into XGBoost's on-disk page cache, so peak memory
+        is bounded by the shard size instead of the full feature frame.
+        """
+        self.features = list(shards.features)
+        self.feature_dtypes = {c: 'float32' for c in self.features}
+        n_rows = shards.n_rows
+        cut = int(n_rows * 0.8)
+
+        counts = shards.class_counts(0, cut)
+        weights = balanced_weights(counts)
+        print(f"[*] Streaming XGBoost training on {cut} rows ({len(shards.files)} shards, {len(self.features)} features)...")
+        print(f"[i] Class Weights Applied (Balanced):")
+        for c in np.flatnonzero(counts):
+            print(f"    - Class {c}: {weights[c]:.2f}x multiplier")
+
+        cache_prefix = os.path.join(shards.directory, "cache") if external_memory else None
+        train_iter = ShardIter(shards, 0, cut, self.features, weights, cache_prefix=cache_prefix)
+        eval_iter = ShardIter(shards, cut, n_rows, self.features, cache_prefix=cache_prefix)
+        if external_memory and hasattr(xgb, "ExtMemQuantileDMatrix"):
+            dtrain = xgb.ExtMemQuantileDMatrix(train_iter, max_bin=max_bin)
+            deval = xgb.ExtMemQuantileDMatrix(eval_iter, max_bin=max_bin, ref=dtrain)
+        elif external_memory:
+            dtrain = xgb.DMatrix(train_iter)
+            deval = xgb.DMatrix(eval_iter)
+        else:
+            dtrain = xgb.QuantileDMatrix(train_iter, max_bin=max_bin)
+            deval = xgb.QuantileDMatrix(eval_iter, max_bin=max_bin, ref=dtrain)
+
+        # Same configuration as make_estimator, through the native API
+        estimator = self.make_estimator(tree_method='hist', max_bin=max_bin)
+        booster_params = {k: v for k, v in estimator.get_xgb_params().items() if v is not None}
+        booster_params['eval_metric'] = 'mlogloss'
+        booster_params.pop('n_estimators', None)
+        booster_params.pop('early_stopping_rounds', None)
+        booster = xgb.train(
+            booster_params, dtrain,
+            num_boost_round=self.params['n_estimators'],
+            evals=[(deval, 'validation')],
+            early_stopping_rounds=20,
+            verbose_eval=False
+        )
+
+        # Wrap the booster in the sklearn estimator used everywhere else
+        estimator.load_model(bytearray(booster.save_raw(raw_format="ubj")))
+        self.model = estimator
+        self._booster = None
+        self._row_buffer = None
+        self._streaming_report(shards, cut, n_rows)
+
+        self.trained_until = shards.last_timestamp
+        self.rows_trained = n_rows
+        self.updates_since_refit = 0
+
+        if save:
+            self.save_model()
+
+    def _streaming_report(self, shards: FeatureShards, start: int, stop: int):
+        """Hold-out report computed shard by shard."""
+        y_true, y_pred = [], []
+        for part in shards.iter_range(start, stop, columns=self.features + ['Target']):
+            y_true.append(part['Target'].to_numpy())
+            y_pred.append(self.model.predict(part[self.features].to_numpy(dtype=np.float32)))
+        y_test, y_pred = np.concatenate(y_true), np.concatenate(y_pred)
+
+        print(f"[+] Global Accuracy: {accuracy_score(y_test, y_pred):.2%}")
+        print("\n--- Classification Report ---")
+        class_map = {0: 'Neutral', 1: 'Long', 2: 'Short'}
+        unique_classes = sorted(list(set(y_test) | set(y_pred)))
+        target_names = [class_map.get(c, str(c)) for c in unique_classes]
+        print(classification_report(y_test, y_pred, labels=unique_classes, target_names=target_names))
+
+    def update(self, df: pd.DataFrame, policy: RefitPolicy = None, save: bool = True) -> str:
+        """
+        Warm start: continues boosting from the current booster on the rows
+        appended since the last fit. Falls back to a full refit when the
+        policy requires it. Returns 'refit', 'incremental' or 'skipped'.
+        """
+        policy = policy or RefitPolicy()
+        new_df = df[df.index > self.trained_until] if self.trained_until is not None else df
+
+        reason = policy.refit_reason(self, df, new_df)
+        if reason:
+            print(f"[*] Full refit required: {reason}.")
+            self.train(df, save=save)
+            return "refit"
+
+        if len(new_df) < policy.min_new_rows:
+            print(f"[-] Only {len(new_df)} new rows (< {policy.min_new_rows}). Keeping current model.")
+            return "skipped"
+
+        X = new_df[self.features]
+        y = new_df['Target']
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
+
+        # XGBoost needs every class in the labels it is fitted on
+        if set(y_train.unique()) != {0, 1, 2}:
+            print("[*] Full refit required: new rows do not contain every target class.")
+            self.train(df, save=save)
+            return "refit"
+
+        print(f"[*] Warm start: boosting {policy.incremental_rounds} more rounds on {len(X_train)} new rows...")
+        booster = self.model.get_booster()
+        self._fit(X_train, y_train, X_test, y_test, xgb_model=booster, n_estimators=policy.incremental_rounds)
+
+        # The early-stopping hold-out was not boosted on: the next update starts after the training rows
+        self.trained_until = X_train.index[-1]
+        self.rows_trained = int((df.index <= self.trained_until).sum())
+        self.updates_since_refit += 1
+
+        if save:
+            self.save_model()
+        return "incremental"
+
+    def _fit(self, X_train: pd.DataFrame, y_train: pd.Series, X_test: pd.DataFrame, y_test: pd.Series, xgb_model=None, **overrides):
+        """Fits a fresh estimator with balanced sample weights and prints the hold-out report."""
         # --- NEW: Compute Sample Weights ---
         # "balanced" mode automatically adjusts weights based on class frequency
         # Low frequency classes (Trades) get High weight.
@@ -62,11 +280,15 @@ class MarketPredictor:
             mean_weight = weights[y_train == c].mean()
             print(f"    - Class {c}: {mean_weight:.2f}x multiplier")
 
+        self.model = self.make_estimator(**overrides)
+        self._booster = None
+        self._row_buffer = None
         self.model.fit(
             X_train, y_train,
             sample_weight=weights,
             eval_set=[(X_test, y_test)],
-            verbose=False
+            verbose=False,
+            xgb_model=xgb_model
         )
 
         y_pred = self.model.predict(X_test)
@@ -81,8 +303,66 @@ class MarketPredictor:
         target_names = [class_map.get(c, str(c)) for c in unique_classes]
         
         print(classification_report(y_test, y_pred, labels=unique_classes, target_names=target_names))
-        
-        self.save_model()
+
+    def _logloss(self, df: pd.DataFrame) -> float:
+        """Log loss of the current model on a labelled frame."""
+        probs = self.model.predict_proba(df[self.features])
+        return log_loss(df['Target'], probs, labels=[0, 1, 2])
+
+    def prune_features(self, df: pd.DataFrame, corr_threshold: float = 0.95, cum_importance: float = 0.99, max_features: int = None, tolerance: float = 0.01, validation: float = 0.2, save: bool = True) -> bool:
+        """
+        Feature selection for a model trained on df with all features.
+        The last `validation` share of df is set aside: the full and the pruned
+        models are fitted on the rows before it (their early-stopping hold-out
+        included), and the subset is kept only if the log loss on the
+        untouched validation slice does not degrade by more than `tolerance`
+        (relative). Keeps one feature per correlation cluster (by importance of
+        the full model) and trims the importance tail. An adopted subset is
+        retrained on all of df and stored with the model so training, inference
+        and feature generation all use it. Returns True if it was adopted.
+        """
+        full_features = list(self.features)
+        full_state = (self.model, self.feature_dtypes, self.trained_until, self.rows_trained, self.updates_since_refit)
+        fit_df, val_df = train_test_split(df, test_size=validation, shuffle=False)
+
+        self.train(fit_df, features=full_features, save=False)
+        full_loss = self._logloss(val_df)
+        importances = pd.Series(self.model.feature_importances_, index=full_features)
+        subset, clusters = select_features(fit_df[full_features], importances, corr_threshold=corr_threshold, cum_importance=cum_importance, max_features=max_features)
+
+        print(f"[*] Feature selection: {len(full_features)} -> {len(subset)} features ({len(clusters)} correlation clusters)")
+        self.train(fit_df, features=subset, save=False)
+        pruned_loss = self._logloss(val_df)
+        print(f"[i] Validation LogLoss ({len(val_df)} rows): full {full_loss:.4f} | pruned {pruned_loss:.4f}")
+
+        adopted = pruned_loss <= full_loss * (1 + tolerance)
+        if adopted:
+            self.train(df, features=subset, save=False)
+            self.selected_features = list(subset)
+            self.selection = {
+                "n_before": len(full_features),
+                "n_after": len(subset),
+                "corr_threshold": corr_threshold,
+                "cum_importance": cum_importance,
+                "validation_rows": len(val_df),
+                "validation_logloss_full": float(full_loss),
+                "validation_logloss_pruned": float(pruned_loss),
+                "clusters": {rep: members for rep, members in clusters.items() if rep in subset and len(members) > 1}
+            }
+            print(f"[+] Pruned feature set adopted.")
+        else:
+            # Out-of-sample quality dropped: restore the full model trained on all of df
+            self.model, self.feature_dtypes, self.trained_until, self.rows_trained, self.updates_since_refit = full_state
+            self.features = full_features
+            self.selected_features = None
+            self.selection = None
+            self._booster = None
+            self._row_buffer = None
+            print(f"[-] Pruned feature set rejected (LogLoss +{(pruned_loss / full_loss - 1):.1%}). Keeping all features.")
+
+        if save:
+            self.save_model()
+        return adopted
 
     def predict(self, features_df: pd.DataFrame) -> int:
         """Predict single instance."""
@@ -93,23 +373,145 @@ class MarketPredictor:
         probs = self.model.predict_proba(features_df[self.features])[0]
         return max(probs) # Return confidence of winning class
 
+    def predict_batch(self, features_df: pd.DataFrame):
+        """Predicts every row at once. Returns (classes, confidence of winning class)."""
+        X = features_df[self.features]
+        return self.model.predict(X), self.model.predict_proba(X).max(axis=1)
+
+    def _prepare_fast_path(self):
+        """Caches the booster and the tree range used by the sklearn wrapper."""
+        self._booster = self.model.get_booster()
+        try:
+            # Early stopping: the wrapper predicts with trees up to best_iteration
+            self._iteration_range = (0, self.model.best_iteration + 1)
+        except AttributeError:
+            self._iteration_range = (0, 0)
+        self._row_buffer = np.empty((1, len(self.features)), dtype=np.float32)
+        self._indexer_cols = None
+
+    def feature_vector(self) -> np.ndarray:
+        """Preallocated (1, n_features) float32 buffer in the stored feature order."""
+        if self._row_buffer is None or self._row_buffer.shape[1] != len(self.features):
+            self._prepare_fast_path()
+        return self._row_buffer
+
+    def fill_vector(self, df: pd.DataFrame, i: int = -1) -> np.ndarray:
+        """Copies row i of a feature frame into the preallocated vector (no column selection)."""
+        x = self.feature_vector()
+        if self._indexer_cols is not df.columns:
+            self._indexer = df.columns.get_indexer(self.features)
+            if (self._indexer < 0).any():
+                missing = [f for f, j in zip(self.features, self._indexer) if j < 0]
+                raise KeyError(f"Missing features: {missing}")
+            self._indexer_cols = df.columns
+        x[0, :] = df.iloc[i].to_numpy()[self._indexer]
+        return x
+
+    def predict_fast(self, x: np.ndarray):
+        """
+        Low-latency single row prediction.
+        x: float32 array of shape (1, n_features) in the stored feature order
+           (see feature_vector / fill_vector).
+        Runs the booster once (in-place prediction on raw margins) and returns
+        (class, probabilities), matching predict / predict_proba.
+        """
+        if self._booster is None:
+            self._prepare_fast_path()
+        margins = self._booster.inplace_predict(x, iteration_range=self._iteration_range, predict_type="margin")
+        m = margins[0] - margins[0].max()
+        probs = np.exp(m)
+        probs /= probs.sum()
+        return int(probs.argmax()), probs
+
     def save_model(self):
-        """Save model to disk."""
+        """
+        Save model to disk as native XGBoost UBJSON plus a JSON sidecar
+        (feature list and dtypes, warm start state). Files are written
+        atomically so readers never see a half-written model.
+        """
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-        joblib.dump({'model': self.model, 'features': self.features}, self.model_path)
+        meta = {
+            'format': 1,
+            'xgboost_version': xgb.__version__,
+            'features': self.features,
+            'feature_dtypes': self.feature_dtypes,
+            'params': self.params,
+            'tuning': self.tuning,
+            'selected_features': self.selected_features,
+            'selection': self.selection,
+            'trained_until': self.trained_until.isoformat() if self.trained_until is not None else None,
+            'rows_trained': self.rows_trained,
+            'updates_since_refit': self.updates_since_refit
+        }
+        meta.update(self._extra_meta())
+
+        tmp_model = self.model_path + ".tmp.ubj"
+        self.model.save_model(tmp_model)
+        tmp_meta = self.meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_model, self.model_path)
+        os.replace(tmp_meta, self.meta_path)
         print(f"[+] Model saved to {self.model_path}")
 
     def load_model(self):
-        """Load model from disk."""
-        if os.path.exists(self.model_path):
-            data = joblib.load(self.model_path)
-            self.model = data['model']
-            self.features = data['features']
+        """Load model from disk (through the process-wide model registry)."""
+        if os.path.exists(self.model_path) and os.path.exists(self.meta_path):
+            self.model, meta = registry.get(self.model_path, self.meta_path)
+            self._apply_meta(meta)
             print(f"[+] Model loaded from {self.model_path}")
+        elif os.path.exists(self.legacy_path):
+            self._load_legacy()
         else:
             print(f"[!] Model file not found: {self.model_path}")
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
 
+    def load_params(self) -> bool:
+        """
+        Reuses the hyperparameters stored in the model sidecar (e.g. written by
+        'tune') without loading the booster. Returns False if there is none.
+        """
+        if not os.path.exists(self.meta_path):
+            return False
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.params = dict(self.DEFAULT_PARAMS, **meta.get('params', {}))
+        self.tuning = meta.get('tuning')
+        self.selected_features = meta.get('selected_features')
+        self.selection = meta.get('selection')
+        return True
+
+    def _extra_meta(self) -> dict:
+        """Additional sidecar fields for subclasses."""
+        return {}
+
+    def _apply_meta(self, meta: dict):
+        self._booster = None
+        self._row_buffer = None
+        self.features = list(meta['features'])
+        self.feature_dtypes = dict(meta.get('feature_dtypes', {}))
+        self.params = dict(self.DEFAULT_PARAMS, **meta.get('params', {}))
+        self.tuning = meta.get('tuning')
+        self.selected_features = meta.get('selected_features')
+        self.selection = meta.get('selection')
+        trained_until = meta.get('trained_until')
+        self.trained_until = pd.Timestamp(trained_until) if trained_until else None
+        self.rows_trained = meta.get('rows_trained', 0)
+        self.updates_since_refit = meta.get('updates_since_refit', 0)
+
+    def _load_legacy(self):
+        """Loads a pickled model from older versions. Re-save to migrate."""
+        import joblib
+        data = joblib.load(self.legacy_path)
+        self.model = data['model']
+        self._apply_meta({
+            'features': data['features'],
+            'trained_until': str(data['trained_until']) if data.get('trained_until') is not None else None,
+            'rows_trained': data.get('rows_trained', 0),
+            'updates_since_refit': data.get('updates_since_refit', 0)
+        })
+        print(f"[+] Legacy model loaded from {self.legacy_path} (retrain to migrate to .ubj)")
+
     def get_feature_importance(self):
         """Print feature importance."""
         importances = pd.DataFrame({
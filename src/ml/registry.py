@@ -0,0 +1,57 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import xgboost as xgb
+
+class ModelRegistry:
+    """
+    Process-wide LRU cache of deserialized models.
+    Entries are keyed by model path (which encodes ticker and mode) and the
+    mtime of the model and its sidecar, so a retrained model is picked up
+    automatically while repeated loads never deserialize the same booster twice.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Tuple[str, int, int], Tuple[xgb.XGBClassifier, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_path: str, meta_path: str) -> Tuple[xgb.XGBClassifier, Dict[str, Any]]:
+        """
+        Returns (model, metadata). The model is shared: callers must not fit it
+        in place (MarketPredictor always fits a fresh estimator).
+        """
+        key = (model_path, os.stat(model_path).st_mtime_ns, os.stat(meta_path).st_mtime_ns)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+
+        # Deserialize outside the lock (slow part)
+        model = xgb.XGBClassifier()
+        model.load_model(model_path)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        with self._lock:
+            self.misses += 1
+            # Drop stale versions of the same model
+            for stale in [k for k in self._cache if k[0] == model_path]:
+                del self._cache[stale]
+            self._cache[key] = (model, meta)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return model, meta
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+registry = ModelRegistry()
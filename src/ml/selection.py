@@ -0,0 +1,51 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Tuple
+
+def correlation_clusters(df: pd.DataFrame, importances: pd.Series, corr_threshold: float = 0.95) -> Dict[str, List[str]]:
+    """
+    Greedy correlation clustering.
+    Features are visited by decreasing importance; a feature opens a new cluster
+    unless its absolute correlation with an existing representative is above
+    the threshold, in which case it joins that (most correlated) cluster.
+    Returns {representative: [members]} (the representative is a member).
+    """
+    order = importances.sort_values(ascending=False).index.tolist()
+    X = np.nan_to_num(df[order].to_numpy(dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.abs(np.corrcoef(X, rowvar=False))
+    corr = np.nan_to_num(corr, nan=0.0) # Constant columns
+
+    reps: List[int] = []
+    clusters: Dict[str, List[str]] = {}
+    for j, name in enumerate(order):
+        if reps:
+            rep_corr = corr[j, reps]
+            k = int(rep_corr.argmax())
+            if rep_corr[k] >= corr_threshold:
+                clusters[order[reps[k]]].append(name)
+                continue
+        reps.append(j)
+        clusters[name] = [name]
+    return clusters
+
+def select_features(df: pd.DataFrame, importances: pd.Series, corr_threshold: float = 0.95, cum_importance: float = 0.99, max_features: int = None) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Compact feature subset: one representative per correlation cluster, then
+    the smallest set of representatives reaching `cum_importance` of their
+    total importance (optionally capped at `max_features`).
+    Returns (selected features, clusters).
+    """
+    clusters = correlation_clusters(df, importances, corr_threshold)
+    reps = importances[list(clusters)].sort_values(ascending=False)
+
+    total = reps.sum()
+    if total <= 0:
+        return reps.index.tolist(), clusters
+
+    cum = reps.cumsum() / total
+    n_keep = min(int(np.searchsorted(cum.to_numpy(), cum_importance) + 1), len(reps))
+    if max_features:
+        n_keep = min(n_keep, max_features)
+    return reps.index[:n_keep].tolist(), clusters
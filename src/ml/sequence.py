@@ -0,0 +1,133 @@
+import os
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import accuracy_score, classification_report
+from src.config.settings import settings
+from src.ml.predictor import MarketPredictor
+from src.ml.streaming import balanced_weights
+from src.ml.windows import WindowDataset
+
+class RandomConvFeatures:
+    """
+    CPU 1D-convolution feature extractor (ROCKET style): random dilated
+    kernels over random channel subsets, summarised per window by the max
+    and the proportion of positive values. No training, pure numpy.
+    """
+
+    def __init__(self, n_features: int, window: int, n_kernels: int = 200, seed: int = 42):
+        if window < 11:
+            raise ValueError(f"Window too short for the convolution kernels: {window} < 11")
+        rng = np.random.default_rng(seed)
+        self.kernels = []
+        for _ in range(n_kernels):
+            length = int(rng.choice([7, 9, 11]))
+            weights = rng.normal(size=length).astype(np.float32)
+            weights -= weights.mean()
+            max_exp = np.log2(max((window - 1) / (length - 1), 1))
+            dilation = int(2 ** rng.uniform(0, max_exp))
+            channels = rng.choice(n_features, size=int(rng.integers(1, min(n_features, 4) + 1)), replace=False)
+            bias = np.float32(rng.uniform(-1, 1))
+            self.kernels.append((weights, dilation, channels, bias))
+
+    @property
+    def n_outputs(self) -> int:
+        return 2 * len(self.kernels)
+
+    def transform(self, batch: np.ndarray) -> np.ndarray:
+        """batch: (samples, window, features) -> (samples, 2 * n_kernels)."""
+        out = np.empty((batch.shape[0], self.n_outputs), dtype=np.float32)
+        for k, (weights, dilation, channels, bias) in enumerate(self.kernels):
+            signal = batch[:, :, channels].sum(axis=2)
+            span = (len(weights) - 1) * dilation + 1
+            # (samples, positions, kernel taps) strided view, dilated taps
+            taps = sliding_window_view(signal, span, axis=1)[:, :, ::dilation]
+            conv = taps @ weights + bias
+            out[:, 2 * k] = conv.max(axis=1)
+            out[:, 2 * k + 1] = (conv > 0).mean(axis=1)
+        return out
+
+class SequencePredictor:
+    """
+    CPU sequence model on rolling windows of the feature matrix:
+    random convolution features + linear classifier trained batch by batch
+    (partial_fit), so memory stays bounded by the batch size.
+    """
+
+    def __init__(self, model_name: str = "sequence_generic", window: int = 64, n_kernels: int = 200, batch_size: int = 512, epochs: int = 3, seed: int = 42):
+        self.model_path = os.path.join(settings.MODELS_DIR, f"{model_name}.joblib")
+        self.window = window
+        self.n_kernels = n_kernels
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.seed = seed
+        self.features = []
+        self.extractor = None
+        self.scaler = None
+        self.model = None
+        self.trained_until = None
+
+    def train(self, df: pd.DataFrame, save: bool = True, features: list = None):
+        """Same chronological 80/20 split and balanced class weights as MarketPredictor.train."""
+        self.features = list(features or MarketPredictor.feature_columns(df))
+        data = WindowDataset.from_frame(df, self.features, window=self.window)
+        train_idx, test_idx = data.split(test_size=0.2)
+
+        self.extractor = RandomConvFeatures(data.n_features, self.window, n_kernels=self.n_kernels, seed=self.seed)
+        self.scaler = StandardScaler()
+        self.model = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=self.seed)
+        class_weights = balanced_weights(np.bincount(data.labels(train_idx), minlength=3)[:3])
+
+        print(f"[*] Training sequence model on {len(train_idx)} windows ({self.window} bars x {data.n_features} features, {self.n_kernels} kernels)...")
+        for epoch in range(self.epochs):
+            for X_batch, y_batch in data.batches(self.batch_size, idx=train_idx, shuffle=True, seed=self.seed + epoch):
+                Z = self.extractor.transform(X_batch)
+                if epoch == 0:
+                    self.scaler.partial_fit(Z)
+                self.model.partial_fit(self.scaler.transform(Z), y_batch, classes=[0, 1, 2], sample_weight=class_weights[y_batch])
+
+        y_test = data.labels(test_idx)
+        y_pred = self.predict_proba(data, test_idx).argmax(axis=1)
+        print(f"[+] Global Accuracy: {accuracy_score(y_test, y_pred):.2%}")
+        print("\n--- Classification Report ---")
+        class_map = {0: 'Neutral', 1: 'Long', 2: 'Short'}
+        unique_classes = sorted(list(set(y_test) | set(y_pred)))
+        print(classification_report(y_test, y_pred, labels=unique_classes, target_names=[class_map.get(c, str(c)) for c in unique_classes]))
+
+        self.trained_until = df.index[-1]
+        if save:
+            self.save_model()
+
+    def predict_proba(self, data: WindowDataset, idx: np.ndarray = None) -> np.ndarray:
+        """Class probabilities of windows idx (default: all), computed batch by batch."""
+        parts = [
+            self.model.predict_proba(self.scaler.transform(self.extractor.transform(X_batch)))
+            for X_batch, _ in data.batches(self.batch_size, idx=idx)
+        ]
+        return np.concatenate(parts)
+
+    def predict_batch(self, df: pd.DataFrame):
+        """Predicts every window of df. Returns (classes, confidence) aligned on the windows' last rows."""
+        data = WindowDataset.from_frame(df, self.features, window=self.window, target_col=None)
+        probs = self.predict_proba(data)
+        return probs.argmax(axis=1), probs.max(axis=1)
+
+    def save_model(self):
+        import joblib
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        state = {k: getattr(self, k) for k in ('window', 'n_kernels', 'features', 'extractor', 'scaler', 'model', 'trained_until')}
+        tmp = self.model_path + ".tmp"
+        joblib.dump(state, tmp)
+        os.replace(tmp, self.model_path)
+        print(f"[+] Model saved to {self.model_path}")
+
+    def load_model(self):
+        import joblib
+        if not os.path.exists(self.model_path):
+            print(f"[!] Model file not found: {self.model_path}")
+            raise FileNotFoundError(f"Model file not found: {self.model_path}")
+        for k, v in joblib.load(self.model_path).items():
+            setattr(self, k, v)
+        print(f"[+] Model loaded from {self.model_path}")
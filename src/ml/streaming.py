@@ -0,0 +1,153 @@
+import os
+import json
+import glob
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from typing import Iterable, List, Optional
+
+from src.features.engineering import FeatureEngineer, is_cumulative
+
+class FeatureShards:
+    """
+    On-disk feature matrix split in parquet shards (float32 features + Target),
+    with a small manifest (feature list, rows per shard, last timestamp).
+    Only one shard is ever held in memory by the readers below.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, self.MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.features: List[str] = manifest['features']
+        self.files: List[str] = [os.path.join(directory, name) for name in manifest['files']]
+        self.rows: List[int] = manifest['rows']
+        self.last_timestamp = pd.Timestamp(manifest['last_timestamp'])
+
+    @property
+    def n_rows(self) -> int:
+        return int(sum(self.rows))
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, directory: str, horizon: int, chunk_rows: int = 50_000, warmup: int = 1000, required: Optional[Iterable[str]] = None) -> "FeatureShards":
+        """
+        Generates features chunk by chunk from raw OHLCV bars and writes one shard per chunk.
+        Each chunk is computed with `warmup` previous bars (indicator lookback,
+        >= the longest window) and `horizon` following bars (target), which are
+        then dropped, so peak memory is driven by chunk_rows, not by the history.
+        Cumulative features (OBV) restart at each window: they are shifted onto
+        the level of the previous chunk at its last bar (inside the warm-up), so
+        the shards match the features computed on the whole history.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for stale in glob.glob(os.path.join(directory, "part-*.parquet")):
+            os.remove(stale)
+
+        features, files, rows = None, [], []
+        last_timestamp = None
+        anchor = None # (last bar of the previous chunk, its cumulative feature values)
+        n_chunks = (len(df) + chunk_rows - 1) // chunk_rows
+        for k, start in enumerate(range(0, len(df), chunk_rows)):
+            end = min(start + chunk_rows, len(df))
+            print(f"[*] Feature shard {k + 1}/{n_chunks}: bars {start}-{end}")
+            window = df.iloc[max(0, start - warmup):end + horizon]
+
+            fe = FeatureEngineer(window, required=required)
+            fe.generate_all()
+            chunk = fe.add_target(horizon=horizon)
+            if anchor is not None:
+                anchor_ts, levels = anchor
+                if anchor_ts not in chunk.index:
+                    print(f"[!] Warning: warm-up of {warmup} bars too short to chain cumulative features at {anchor_ts}.")
+                else:
+                    for col, level in levels.items():
+                        if col in chunk.columns and pd.notna(level):
+                            chunk[col] += level - chunk.at[anchor_ts, col]
+            # Keep only the core rows of this chunk
+            chunk = chunk[(chunk.index >= df.index[start]) & (chunk.index <= df.index[end - 1])]
+            if chunk.empty:
+                continue
+
+            if features is None:
+                from src.ml.predictor import MarketPredictor
+                features = list(required) if required else MarketPredictor.feature_columns(chunk)
+            shard = chunk.reindex(columns=features).astype(np.float32)
+            shard['Target'] = chunk['Target'].astype(np.int8)
+
+            name = f"part-{k:05d}.parquet"
+            shard.to_parquet(os.path.join(directory, name), engine='pyarrow')
+            files.append(name)
+            rows.append(len(shard))
+            last_timestamp = chunk.index[-1]
+            anchor = (last_timestamp, {c: chunk.at[last_timestamp, c] for c in chunk.columns if is_cumulative(c)})
+
+        if not files:
+            raise ValueError("No feature rows generated (history shorter than the warm-up?)")
+
+        manifest = {
+            'features': features,
+            'files': files,
+            'rows': rows,
+            'last_timestamp': last_timestamp.isoformat()
+        }
+        with open(os.path.join(directory, cls.MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"[+] {sum(rows)} feature rows written to {len(files)} shards in {directory}")
+        return cls(directory)
+
+    def read(self, i: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return pd.read_parquet(self.files[i], columns=columns, engine='pyarrow')
+
+    def iter_range(self, start: int, stop: int, columns: Optional[List[str]] = None):
+        """Yields the shard slices covering global rows [start, stop)."""
+        offset = 0
+        for i, n in enumerate(self.rows):
+            lo, hi = max(start - offset, 0), min(stop - offset, n)
+            if lo < hi:
+                yield self.read(i, columns).iloc[lo:hi]
+            offset += n
+
+    def class_counts(self, start: int, stop: int) -> np.ndarray:
+        counts = np.zeros(3, dtype=np.int64)
+        for part in self.iter_range(start, stop, columns=['Target']):
+            counts += np.bincount(part['Target'].to_numpy(), minlength=3)[:3]
+        return counts
+
+class ShardIter(xgb.DataIter):
+    """
+    Feeds a row range of FeatureShards to XGBoost one shard at a time, with
+    balanced class weights (same formula as compute_sample_weight, from
+    counts over the whole range).
+    """
+
+    def __init__(self, shards: FeatureShards, start: int, stop: int, features: List[str], class_weights: Optional[np.ndarray] = None, cache_prefix: Optional[str] = None):
+        self.shards = shards
+        self.start = start
+        self.stop = stop
+        self.features = features
+        self.class_weights = class_weights
+        self._parts = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._parts is None:
+            self._parts = self.shards.iter_range(self.start, self.stop, columns=self.features + ['Target'])
+        part = next(self._parts, None)
+        if part is None:
+            return False
+        y = part['Target'].to_numpy()
+        weight = self.class_weights[y] if self.class_weights is not None else None
+        input_data(data=part[self.features].to_numpy(dtype=np.float32), label=y, weight=weight, feature_names=self.features)
+        return True
+
+    def reset(self):
+        self._parts = None
+
+def balanced_weights(counts: np.ndarray) -> np.ndarray:
+    """Per-class weights n_samples / (n_classes * count), as sklearn's 'balanced'."""
+    present = counts > 0
+    weights = np.zeros(len(counts), dtype=np.float32)
+    weights[present] = counts.sum() / (present.sum() * counts[present])
+    return weights
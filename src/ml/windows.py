@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, List, Optional, Tuple
+
+class WindowDataset:
+    """
+    Rolling windows over one contiguous float32 feature matrix.
+    Window i covers rows [i, i + window) and is labelled with the target of
+    its last row. Windows are strided views (no samples x window x features
+    copy); only the rows of the current batch are materialised, and
+    normalized per window on the fly.
+    """
+
+    def __init__(self, X: np.ndarray, y: Optional[np.ndarray] = None, window: int = 64, normalize: bool = True, index: Optional[pd.Index] = None):
+        """
+        X: (rows, features) matrix. Copied once if not already contiguous float32.
+        normalize: z-score every window per feature (scale-free inputs across regimes / assets).
+        """
+        if len(X) < window:
+            raise ValueError(f"Need at least {window} rows, got {len(X)}")
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = y
+        self.window = window
+        self.normalize = normalize
+        self.index = index
+        # (n_windows, window, features) view over self.X
+        self.windows = sliding_window_view(self.X, window, axis=0).transpose(0, 2, 1)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, features: List[str], window: int = 64, target_col: Optional[str] = 'Target', normalize: bool = True) -> "WindowDataset":
+        y = df[target_col].to_numpy(dtype=np.int64) if target_col and target_col in df.columns else None
+        return cls(df[features].to_numpy(dtype=np.float32), y, window=window, normalize=normalize, index=df.index)
+
+    def __len__(self) -> int:
+        return self.windows.shape[0]
+
+    @property
+    def n_features(self) -> int:
+        return self.X.shape[1]
+
+    def labels(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Targets of the windows (target of their last row)."""
+        y = self.y[self.window - 1:]
+        return y if idx is None else y[idx]
+
+    def end_index(self, idx: Optional[np.ndarray] = None) -> pd.Index:
+        """Timestamps of the last row of the windows."""
+        ends = self.index[self.window - 1:]
+        return ends if idx is None else ends[idx]
+
+    def get(self, idx: np.ndarray) -> np.ndarray:
+        """Materialises windows idx as a (len(idx), window, features) float32 batch."""
+        batch = self.windows[idx]
+        if self.normalize:
+            mean = batch.mean(axis=1, keepdims=True)
+            std = batch.std(axis=1, keepdims=True)
+            batch = (batch - mean) / np.where(std > 1e-8, std, 1.0)
+        return batch
+
+    def batches(self, batch_size: int = 256, idx: Optional[np.ndarray] = None, shuffle: bool = False, seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Lazily yields (X batch, y batch) over windows idx (default: all)."""
+        idx = np.arange(len(self)) if idx is None else np.asarray(idx)
+        if shuffle:
+            idx = np.random.default_rng(seed).permutation(idx)
+        for start in range(0, len(idx), batch_size):
+            part = idx[start:start + batch_size]
+            yield self.get(part), (self.labels(part) if self.y is not None else None)
+
+    def split(self, test_size: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+        """Chronological split of window indices (test = most recent windows)."""
+        cut = int(len(self) * (1 - test_size))
+        return np.arange(cut), np.arange(cut, len(self))
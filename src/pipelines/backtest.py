@@ -1,10 +1,19 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from sklearn.model_selection import TimeSeriesSplit
 
 from src.features.engineering import FeatureEngineer
-from src.ml.predictor import MarketPredictor
+from src.infrastructure.telemetry import count, span, timed
+from src.pipelines.checkpoint import RunCheckpoint, config_hash, frame_fingerprint
+from src.ml.predictor import MarketPredictor, RefitPolicy
+from src.strategy.fills import IntrabarResolver
+from src.strategy.ledger import TRADES, TradeLedger
+from src.strategy.montecarlo import MonteCarloSimulator
 from src.strategy.risk import RiskManager
+from src.strategy.simulator import TradeSimulator
 
 class BacktestPipeline:
     def __init__(self, ticker: str, mode: str = "swing", initial_capital: float = 10000.0, threshold: float = 0.35):
@@ -19,8 +28,23 @@ class BacktestPipeline:
         self.model_file = f"{ticker}_{mode}_backtest.pkl" 
 from src.data.factory import DataProviderFactory
 
+
+def _train_fold(task: dict) -> dict:
+    """
+    Trains an isolated predictor on one fold and scores its test set.
+    Module-level so it can run inside a worker process.
+    """
+    predictor = MarketPredictor(model_name=task['model_file'], n_jobs=task['n_jobs'])
+    predictor.train(task['train_df'], save=task.get('save', False), target_col=task['target_col'])
+    predictions, confidences = predictor.predict_batch(task['test_df'])
+    return {
+        "fold": task['fold'],
+        "predictions": predictions,
+        "confidences": confidences
+    }
+
 class BacktestPipeline:
-    def __init__(self, ticker: str, mode: str = "swing", initial_capital: float = 10000.0, threshold: float = 0.65, source: str = "auto", risk_pct: float = 0.02, adx_threshold: int = 0, trend_filter: bool = False):
+    def __init__(self, ticker: str, mode: str = "swing", initial_capital: float = 10000.0, threshold: float = 0.65, source: str = "auto", risk_pct: float = 0.02, adx_threshold: int = 0, trend_filter: bool = False, n_splits: int = 3, window: str = "expanding", embargo: int = 0, workers: Optional[int] = None, warm_start: bool = False, refit_policy: Optional[RefitPolicy] = None, target_col: str = 'Target', monte_carlo: Optional[MonteCarloSimulator] = None, mc_risk_pct: Optional[float] = None, intrabar: Optional[str] = None, verbosity: int = TRADES, ledger_dir: Optional[str] = None, checkpoint: bool = False, run_root: Optional[str] = None):
         self.ticker = ticker
         self.mode = mode
         self.capital = initial_capital
@@ -30,15 +54,52 @@ class BacktestPipeline:
         self.risk_pct = risk_pct
         self.adx_threshold = adx_threshold
         self.trend_filter = trend_filter
+        self.target_col = target_col
+
+        # Optional Monte Carlo on the pooled trade ledger of all folds
+        self.monte_carlo = monte_carlo
+        self.mc_risk_pct = mc_risk_pct or risk_pct
+
+        # Optional lower-timeframe interval (e.g. '15m') to resolve ambiguous bars
+        self.intrabar = intrabar
+        self.source = source
+        self.resolver: Optional[IntrabarResolver] = None
+
+        # Trades and skipped signals of all folds (parquet batches if ledger_dir is set)
+        self.verbosity = verbosity
+        self.ledger = TradeLedger(ledger_dir, verbosity=verbosity)
+
+        # Resumable runs: fold artefacts persisted under data/runs/<config hash>
+        self.checkpoint = checkpoint
+        self.run_root = run_root
+        self.ckpt: Optional[RunCheckpoint] = None
+
+        # Walk-forward configuration
+        if window not in ("expanding", "sliding"):
+            raise ValueError(f"Unknown window type: {window} (expected 'expanding' or 'sliding')")
+        self.n_splits = n_splits
+        self.window = window
+        self.embargo = embargo
+        self.workers = workers or os.cpu_count() or 1
+
+        # Warm start: folds continue boosting from the previous fold's model.
+        # Only meaningful when each training set extends the previous one.
+        if warm_start and window == "sliding":
+            print("[!] Warning: Warm start needs an expanding window. Using full refits.")
+            warm_start = False
+        if warm_start and target_col != 'Target':
+            print("[!] Warning: Warm start only supports the default target. Using full refits.")
+            warm_start = False
+        self.warm_start = warm_start
+        # max_new_fraction None: allow one fold of new rows (set from the splits in prepare)
+        self.refit_policy = refit_policy or RefitPolicy(max_new_fraction=None)
         
         # We use a temporary model for backtesting to avoid overwriting production models
-        self.model_file = f"{ticker}_{mode}_backtest.pkl" 
+        self.model_file = f"{ticker}_{mode}_backtest" 
         self.data_provider = DataProviderFactory.get_provider(ticker, source)
-        self.predictor = MarketPredictor(model_name=self.model_file)
 
-    def run(self, period: str = "2y"):
-        print(f"\n🧪 STARTING BACKTEST: {self.ticker} [{self.mode.upper()}] | Capital: ${self.capital} | Threshold: {self.threshold} | Risk: {self.risk_pct*100}% | ADX: {self.adx_threshold} | Trend Filter: {self.trend_filter}")
-        
+    def build_dataset(self, period: str = "2y") -> pd.DataFrame:
+        """Fetches data and builds features + target for the configured mode."""
         # 0. Configure based on Mode
         if self.mode == "intraday":
             period = "59d"
@@ -50,38 +111,201 @@ class BacktestPipeline:
 
         # 1. Fetch Data
         df = self.data_provider.fetch_data(period=period, interval=interval)
-        if df.empty: return
+        if df.empty: return df
 
         # 2. Features
         fe = FeatureEngineer(df)
         df = fe.generate_all()
-        df = fe.add_target(horizon=horizon)
+        return fe.add_target(horizon=horizon)
+
+    def split_folds(self, df: pd.DataFrame) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Walk-forward splits.
+        - expanding: train on everything before the test window.
+        - sliding: train on a fixed-size window just before the test window.
+        - embargo: bars dropped between train and test (target look-ahead).
+        """
+        max_train_size = len(df) // (self.n_splits + 1) if self.window == "sliding" else None
+        tscv = TimeSeriesSplit(n_splits=self.n_splits, max_train_size=max_train_size, gap=self.embargo)
+        return list(tscv.split(df))
+
+    @staticmethod
+    def fold_fraction(splits: List[Tuple[np.ndarray, np.ndarray]]) -> float:
+        """
+        Share of new rows a warm fold brings: one fold of data, plus the 20%
+        early-stopping hold-out the previous update left for the next one.
+        """
+        sizes = [len(train_index) for train_index, _ in splits]
+        shares = [(size - previous) / size for previous, size in zip(sizes, sizes[1:])]
+        return min(1.0, 1.2 * max(shares)) if shares else 1.0
+
+    @timed("prepare")
+    def prepare(self, period: str = "2y", df: Optional[pd.DataFrame] = None):
+        """
+        Fetches data, builds features and trains one model per CV fold.
+        Returns the list of folds with their test set and cached predictions,
+        so that any number of simulations can be replayed without retraining.
+        df: prebuilt dataset (skips fetching and feature generation).
+        """
+        if df is None:
+            df = self.build_dataset(period=period)
+        if df.empty: return []
         
         # 3. Cross-Validation (Time Series Split)
-        print("[*] Running TimeSeries Cross-Validation (3 Splits)...")
-        tscv = TimeSeriesSplit(n_splits=3)
+        print(f"[*] Running TimeSeries Cross-Validation ({self.n_splits} Splits, {self.window}, embargo {self.embargo})...")
+        splits = self.split_folds(df)
+        if self.warm_start and self.refit_policy.max_new_fraction is None:
+            self.refit_policy.max_new_fraction = self.fold_fraction(splits)
+            print(f"[i] Warm start: full refit when new rows exceed {self.refit_policy.max_new_fraction:.0%} of a fold's training set")
+
+        self.ckpt = RunCheckpoint("backtest", self.checkpoint_config(period), root=self.run_root) if self.checkpoint else None
+
+        workers = min(self.workers, len(splits))
+        tasks, cached = [], {}
+        for fold, (train_index, test_index) in enumerate(splits, start=1):
+            print(f"---> FOLD {fold}: Train ({len(train_index)}) | Test ({len(test_index)})")
+            task = {
+                "fold": fold,
+                "model_file": self.model_file,
+                # Share the cores between concurrent folds
+                "n_jobs": max(1, (os.cpu_count() or 1) // workers),
+                "target_col": self.target_col,
+                "train_df": df.iloc[train_index],
+                "test_df": df.iloc[test_index]
+            }
+            if self.ckpt is not None:
+                # Fold inputs unchanged since a previous run -> reuse its predictions
+                task['fingerprint'] = frame_fingerprint(task['train_df']) + frame_fingerprint(task['test_df'])
+                task['model_file'] = self.ckpt.fold_name(fold, task['fingerprint'])
+                task['save'] = True
+                hit = self.ckpt.load_fold(fold, task['fingerprint'])
+                if hit is not None:
+                    cached[fold] = hit
+            tasks.append(task)
+
+        pending = [t for t in tasks if t['fold'] not in cached]
+        resume_from = None
+        if self.ckpt is not None and self.warm_start:
+            # Warm folds chain on each other: resume after the last completed fold of the chain
+            done = 0
+            while done < len(tasks) and tasks[done]['fold'] in cached and self.ckpt.has_fold_model(tasks[done]['fold'], tasks[done]['fingerprint']):
+                done += 1
+            pending = tasks[done:]
+            cached = {t['fold']: cached[t['fold']] for t in tasks[:done]}
+            resume_from = tasks[done - 1]['model_file'] if done else None
+        if self.ckpt is not None:
+            print(f"[i] Checkpoint {self.ckpt.directory}: {len(cached)}/{len(tasks)} folds reused")
+        workers = min(workers, max(len(pending), 1))
+        count("folds_trained", len(pending))
+        count("folds_reused", len(cached))
+
+        # Each fold trains its own predictor; results come back in fold order
+        with span("train_folds"):
+            if not pending:
+                outputs = []
+            elif self.warm_start:
+                outputs = self._train_folds_warm(pending, resume_from=resume_from)
+            elif workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    outputs = []
+                    for out in pool.map(_train_fold, pending):
+                        self._save_fold(out, tasks)
+                        outputs.append(out)
+            else:
+                outputs = []
+                for t in pending:
+                    out = _train_fold(t)
+                    self._save_fold(out, tasks)
+                    outputs.append(out)
+
+        by_fold = {**cached, **{out['fold']: out for out in outputs}}
+        folds = []
+        for task in tasks:
+            out = by_fold[task['fold']]
+            out['test_df'] = task['test_df']
+            out['fingerprint'] = task.get('fingerprint')
+            folds.append(out)
+
+        return folds
+
+    def checkpoint_config(self, period: str) -> dict:
+        """Everything the fold models depend on besides the data (the data is fingerprinted per fold)."""
+        return {
+            "ticker": self.ticker,
+            "mode": self.mode,
+            "period": period,
+            "n_splits": self.n_splits,
+            "window": self.window,
+            "embargo": self.embargo,
+            "warm_start": self.warm_start,
+            "refit_policy": vars(self.refit_policy) if self.warm_start else None,
+            "target_col": self.target_col,
+            "params": MarketPredictor.DEFAULT_PARAMS
+        }
+
+    def _save_fold(self, out: dict, tasks: List[dict]):
+        if self.ckpt is not None:
+            task = next(t for t in tasks if t['fold'] == out['fold'])
+            self.ckpt.save_fold(out['fold'], task['fingerprint'], out['predictions'], out['confidences'])
+
+    def _train_folds_warm(self, tasks: List[dict], resume_from: Optional[str] = None) -> List[dict]:
+        """
+        Sequential folds sharing one predictor that is updated, not refitted.
+        resume_from: checkpointed model of the fold before tasks[0] (continues the chain).
+        With a checkpoint, each fold's model and predictions are saved as soon as it completes.
+        """
+        predictor = MarketPredictor(model_name=resume_from or self.model_file)
+        if resume_from:
+            predictor.load_model()
+        outputs = []
+        for task in tasks:
+            if predictor.trained_until is None:
+                predictor.train(task['train_df'], save=False)
+                outcome = "train"
+            else:
+                outcome = predictor.update(task['train_df'], policy=self.refit_policy, save=False)
+            count(f"warm_{outcome}")
+            predictions, confidences = predictor.predict_batch(task['test_df'])
+            out = {
+                "fold": task['fold'],
+                "predictions": predictions,
+                "confidences": confidences,
+                "warm": outcome
+            }
+            if task.get('save'):
+                fold_model = MarketPredictor(model_name=task['model_file'])
+                predictor.model_path, predictor.meta_path = fold_model.model_path, fold_model.meta_path
+                predictor.save_model()
+                self._save_fold(out, [task])
+            outputs.append(out)
+        updates = [out['warm'] for out in outputs if out['warm'] != "train"]
+        if updates and all(outcome == "refit" for outcome in updates):
+            print("[!] Warm start: every fold fell back to a full refit (see --max_new_fraction / --max_updates).")
+        return outputs
+
+    def run(self, period: str = "2y"):
+        print(f"\n🧪 STARTING BACKTEST: {self.ticker} [{self.mode.upper()}] | Capital: ${self.capital} | Threshold: {self.threshold} | Risk: {self.risk_pct*100}% | ADX: {self.adx_threshold} | Trend Filter: {self.trend_filter}")
         
-        fold = 1
+        folds = self.prepare(period=period)
+        if not folds: return
+
+        if self.intrabar and self.resolver is None:
+            print(f"[*] Loading {self.intrabar} bars for intrabar fill resolution...")
+            try:
+                self.resolver = IntrabarResolver.from_storage(self.ticker, interval=self.intrabar, source=self.source, until=folds[-1]['test_df'].index[-1])
+            except Exception as e:
+                print(f"[!] Intrabar resolution disabled: {e}")
+
         results = []
-        
-        X = df # Full dataframe
-        
-        for train_index, test_index in tscv.split(X):
-            train_df = X.iloc[train_index]
-            test_df = X.iloc[test_index]
-            
-            print(f"\n---> FOLD {fold}: Train ({len(train_df)}) | Test ({len(test_df)})")
-            
-            # Train on this fold
-            self.predictor.train(train_df)
-            
-            # Simulate on this fold
-            metrics = self._simulate(test_df)
+        all_trades = []
+        for fold in folds:
+            print(f"\n---> SIMULATING FOLD {fold['fold']}")
+            self.ledger.bind(ticker=self.ticker, fold=fold['fold'])
+            metrics = self._simulate(fold['test_df'], fold['predictions'], fold['confidences'])
             if metrics:
                 results.append(metrics)
-            fold += 1
+            all_trades.extend(self.trades)
             
-            # Reset balance for next fold or keep cumulative? 
             # Standard CV resets to evaluate model performance, not cumulative wealth.
             self.balance = self.capital 
             self.trades = [] 
@@ -97,8 +321,10 @@ class BacktestPipeline:
             if active_results:
                 avg_win_rate = np.mean([r['win_rate'] for r in active_results])
                 avg_profit_factor = np.mean([r['profit_factor'] for r in active_results])
+                worst_drawdown = max(r['max_drawdown'] for r in active_results)
                 print(f"Avg Win Rate      : {avg_win_rate:.2f}%")
                 print(f"Avg Profit Factor : {avg_profit_factor:.2f}")
+                print(f"Worst Drawdown    : {worst_drawdown:.2f}%")
             else:
                  print("No trades executed in any fold.")
         else:
@@ -106,243 +332,42 @@ class BacktestPipeline:
             
         print("═"*45 + "\n")
 
-    def _simulate(self, test_df):
+        if self.ckpt is not None:
+            params = {"threshold": self.threshold, "risk_pct": self.risk_pct, "adx_threshold": self.adx_threshold, "trend_filter": self.trend_filter, "capital": self.capital, "intrabar": self.intrabar}
+            self.ckpt.save_metrics(f"metrics_{config_hash(params)}", {"params": params, "folds": results})
+
+        self.ledger.flush()
+        self.ledger.print_counts()
+        if self.ledger.directory:
+            print(f"[+] Trade ledger saved to {self.ledger.directory}")
+
+        if self.monte_carlo is not None:
+            with span("monte_carlo"):
+                mc = self.monte_carlo.run(MonteCarloSimulator.r_multiples(all_trades), initial_capital=self.capital, risk_pct=self.mc_risk_pct)
+            MonteCarloSimulator.print_report(mc, self.capital)
+
+        if self.resolver is not None:
+            print(f"[i] Intrabar: {self.resolver.resolved} ambiguous bars resolved on {self.intrabar} bars, {self.resolver.unresolved} without sub-bars (bar logic kept)")
+
+    def _simulator(self, verbose=None, ledger: Optional[TradeLedger] = None) -> TradeSimulator:
+        return TradeSimulator(
+            self.ticker,
+            initial_capital=self.capital,
+            threshold=self.threshold,
+            risk_pct=self.risk_pct,
+            adx_threshold=self.adx_threshold,
+            trend_filter=self.trend_filter,
+            verbose=self.verbosity if verbose is None else verbose,
+            resolver=self.resolver,
+            ledger=ledger
+        )
+
+    def _simulate(self, test_df, predictions, confidences):
         """Runs simulation on a specific test set."""
-        self.balance = self.capital
-        self.trades = []
-        rm = RiskManager(rr_ratio=2.0, atr_multiplier=2.0)
-        
-        # Iterate through Test Data
-        for i in range(len(test_df) - 8): # Buffer for horizon
-            current_row = test_df.iloc[i]
-            current_idx = test_df.index[i]
-            
-            # Predict
-            features = current_row[self.predictor.features].to_frame().T
-            prediction = self.predictor.model.predict(features)[0]
-            confidence = self.predictor.predict_proba(features)
-
-            # ADX FILTER (Regime Filter)
-            if self.adx_threshold > 0:
-                # Try to find ADX column
-                adx_cols = [c for c in test_df.columns if 'ADX' in c]
-                if adx_cols:
-                    adx_val = current_row[adx_cols[0]]
-                    if adx_val < self.adx_threshold and prediction != 0:
-                         print(f"  [~] Skipped signal {prediction} at {current_idx} (ADX: {adx_val:.2f} < {self.adx_threshold})")
-                         prediction = 0
-            
-            # TREND FILTER (EMA 200)
-            if self.trend_filter:
-                # Find EMA 200 column (could be Daily_EMA_200 or EMA_200)
-                ema_cols = [c for c in test_df.columns if 'EMA_200' in c]
-                if ema_cols:
-                    ema_val = current_row[ema_cols[0]]
-                    price = current_row['Close']
-                    if not np.isnan(ema_val):
-                        if prediction == 1 and price < ema_val:
-                            print(f"  [~] Skipped LONG at {current_idx} (Price {price:.2f} < EMA200 {ema_val:.2f})")
-                            prediction = 0
-                        elif prediction == 2 and price > ema_val:
-                            print(f"  [~] Skipped SHORT at {current_idx} (Price {price:.2f} > EMA200 {ema_val:.2f})")
-                            prediction = 0
-
-            # RSI MOMENTUM FILTER (Sniper Mode)
-            # Find RSI column
-            rsi_cols = [c for c in test_df.columns if 'RSI_14' in c]
-            if rsi_cols:
-                 rsi = current_row[rsi_cols[0]]
-                 
-                 # LONG Logic: 
-                 # 1. Must use "Momentum" (RSI > 50)
-                 # 2. Must NOT be Overbought (RSI < 70)
-                 if prediction == 1:
-                     if rsi <= 50:
-                         print(f"  [~] Skipped LONG at {current_idx} (RSI {rsi:.2f} <= 50 - No Momentum)")
-                         prediction = 0
-                    #  elif rsi >= 70:
-                    #      print(f"  [~] Skipped LONG at {current_idx} (RSI {rsi:.2f} >= 70 - Overbought)")
-                    #      prediction = 0
-                         
-                 # SHORT Logic:
-                 # 1. Must use "Momentum" (RSI < 50)
-                 # 2. Must NOT be Oversold (RSI > 30)
-                 elif prediction == 2:
-                     if rsi >= 50:
-                         print(f"  [~] Skipped SHORT at {current_idx} (RSI {rsi:.2f} >= 50 - No Momentum)")
-                         prediction = 0
-                    #  elif rsi <= 30:
-                    #      print(f"  [~] Skipped SHORT at {current_idx} (RSI {rsi:.2f} <= 30 - Oversold)")
-                    #      prediction = 0
-
-            # CONFIDENCE FILTER
-            if confidence < self.threshold and prediction != 0:
-                 # Only print if it was originally a signal (1 or 2)
-                 print(f"  [~] Skipped signal {prediction} at {current_idx} (Conf: {confidence:.2f} < {self.threshold})")
-                 prediction = 0 # Force Wait
-            
-            if prediction == 1: # SIGNAL LONG
-                price = current_row['Close']
-                direction = "LONG"
-                
-                # Get Strategy Params
-                plan = rm.generate_scenario(self.ticker, price, prediction, test_df.iloc[:i+1])
-                initial_sl = plan['sl']
-                risk_per_share = price - initial_sl
-                
-                if risk_per_share <= 0: continue
-                
-                outcome = "HOLD"
-                pnl = 0
-                max_price = price 
-                sl = initial_sl
-                
-                # ATR for Trailing
-                # We can calculate separate ATR or use the risk_per_share as proxy (Risk = 2*ATR often in RiskManager)
-                # Let's derive rough ATR from Risk Distance
-                # If Risk = 2 * ATR -> ATR = Risk / 2
-                atr_val = risk_per_share / 2.0
-                
-                future_window = test_df.iloc[i+1 : i+50] 
-                
-                for _, future_row in future_window.iterrows():
-                    current_high = future_row['High']
-                    current_low = future_row['Low']
-                    
-                    # Update Trailing (3x ATR Width)
-                    if current_high > max_price:
-                        max_price = current_high
-                        # New SL is High - 3*ATR (Wider)
-                        new_sl = max_price - (3.0 * atr_val)
-                        if new_sl > sl:
-                            sl = new_sl
-
-                    # Check SL Hit
-                    if current_low <= sl:
-                        if sl > price:
-                             outcome = "Trailing SL Hit 💰"
-                             pnl_per_share = sl - price
-                        else:
-                             outcome = "SL Hit ❌"
-                             pnl_per_share = sl - price # Negative
-                             
-                        exit_price = sl
-                        qty = (self.balance * self.risk_pct) / risk_per_share
-                        pnl = qty * pnl_per_share
-                        break
-                        
-                # Time Exit
-                if outcome == "HOLD":
-                    exit_price = future_window.iloc[-1]['Close']
-                    qty = (self.balance * self.risk_pct) / risk_per_share
-                    pnl = qty * (exit_price - price)
-                    outcome = "Time Exit ⏱️"
-
-            elif prediction == 2: # SIGNAL SHORT
-                if rsi >= 55:
-                    prediction = 0
-                    
-                price = current_row['Close']
-                direction = "SHORT"
-                
-                plan = rm.generate_scenario(self.ticker, price, prediction, test_df.iloc[:i+1])
-                initial_sl = plan['sl']
-                risk_per_share = initial_sl - price
-                
-                if risk_per_share <= 0: continue
-                
-                outcome = "HOLD"
-                pnl = 0
-                min_price = price
-                sl = initial_sl
-                
-                atr_val = risk_per_share / 2.0
-                
-                future_window = test_df.iloc[i+1 : i+50]
-                
-                for _, future_row in future_window.iterrows():
-                    current_high = future_row['High']
-                    current_low = future_row['Low']
-                    
-                    # Update Trailing
-                    if current_low < min_price:
-                        min_price = current_low
-                        new_sl = min_price + (3.0 * atr_val)
-                        if new_sl < sl:
-                            sl = new_sl
-                            
-                    # Check SL Hit
-                    if current_high >= sl:
-                        if sl < price:
-                             outcome = "Trailing SL Hit 💰"
-                             pnl_per_share = price - sl
-                        else:
-                             outcome = "SL Hit ❌"
-                             pnl_per_share = price - sl # Negative
-                        
-                        exit_price = sl
-                        qty = (self.balance * self.risk_pct) / risk_per_share
-                        pnl = qty * pnl_per_share
-                        break
-
-                if outcome == "HOLD":
-                    exit_price = future_window.iloc[-1]['Close']
-                    qty = (self.balance * self.risk_pct) / risk_per_share
-                    pnl = qty * (price - exit_price) 
-                    outcome = "Time Exit ⏱️"
-            
-            else: # NEUTRAL
-                continue
-
-            # Update Wallet
-            self.balance += pnl
-            self.trades.append({
-                "Date": current_idx,
-                "Type": direction,
-                "Entry": price,
-                "Outcome": outcome,
-                "PnL": round(pnl, 2),
-                "Balance": round(self.balance, 2)
-            })
-            print(f"  [Trade] {direction} @ {price:.2f} -> {outcome} ({pnl:+.2f}) Balance: {self.balance:.2f}")
-
-        return self._report(return_metrics=True)
-
-    def _report(self, return_metrics=False):
-        if not self.trades:
-            print("[!] No trades taken by the model.")
-            if return_metrics:
-                return {
-                    "win_rate": 0.0,
-                    "profit_factor": 0.0,
-                    "final_balance": self.balance,
-                    "total_trades": 0
-                }
-            return
-
-        df_res = pd.DataFrame(self.trades)
-        wins = df_res[df_res['PnL'] > 0]
-        losses = df_res[df_res['PnL'] <= 0]
-        
-        total_trades = len(df_res)
-        win_rate = (len(wins) / total_trades) * 100
-        
-        # Safe Profit Factor
-        total_loss = abs(losses['PnL'].sum())
-        profit_factor = wins['PnL'].sum() / total_loss if total_loss > 0 else float('inf')
-        
-        print("\n" + "═"*45)
-        print(f"📝 FOLD RESULTS")
-        print(f"Final Balance : ${self.balance:,.2f} ({((self.balance-self.capital)/self.capital)*100:+.2f}%)")
-        print(f"Total Trades  : {total_trades}")
-        print(f"Win Rate      : {win_rate:.2f}%")
-        print(f"Profit Factor : {profit_factor:.2f}")
-        print("═"*45)
-        
-        if return_metrics:
-            return {
-                "win_rate": win_rate,
-                "profit_factor": profit_factor,
-                "final_balance": self.balance,
-                "total_trades": total_trades
-            }
+        sim = self._simulator(ledger=self.ledger)
+        with span("simulate"):
+            metrics = sim.run(test_df, predictions, confidences)
+        count("trades", len(sim.trades))
+        self.balance = sim.balance
+        self.trades = sim.trades
+        return metrics
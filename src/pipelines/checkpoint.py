@@ -0,0 +1,121 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from src.config.settings import settings
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Short stable hash of a JSON-serializable configuration."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame (index, columns and values)."""
+    h = hashlib.sha1("|".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:12]
+
+class RunCheckpoint:
+    """
+    Run directory of a long backtest / sweep, keyed by the hash of its configuration
+    (data/runs/<kind>_<hash>/). Units are saved as soon as they complete:
+    - folds: model (.ubj + .json) and prediction arrays (.npz), named after a
+      fingerprint of their train / test data, so a rerun on changed data retrains
+      only the folds whose inputs differ;
+    - cells: one JSON line per parameter combination (cells.jsonl);
+    - metrics: JSON documents.
+    Files are written atomically (tmp + rename): an interrupted run never leaves
+    a half-written unit behind.
+    """
+
+    def __init__(self, kind: str, config: Dict[str, Any], root: Optional[str] = None):
+        self.kind = kind
+        self.config = config
+        self.key = config_hash(config)
+        self.directory = os.path.join(root or os.path.join(settings.DATA_DIR, "runs"), f"{kind}_{self.key}")
+        os.makedirs(self.directory, exist_ok=True)
+        self._cells_repaired = False
+
+        config_path = os.path.join(self.directory, "config.json")
+        if not os.path.exists(config_path):
+            self._write_json(config_path, config)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _write_json(path: str, data: Any):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp, path)
+
+    # --- Folds ---
+    def fold_name(self, fold: int, fingerprint: str) -> str:
+        """Base path of a fold's artefacts (also usable as a MarketPredictor model name)."""
+        return self.path(f"fold{fold}_{fingerprint}")
+
+    def has_fold_model(self, fold: int, fingerprint: str) -> bool:
+        """True if the fold's model was saved (warm-start chains resume from it)."""
+        name = self.fold_name(fold, fingerprint)
+        return os.path.exists(name + ".ubj") and os.path.exists(name + ".json")
+
+    def load_fold(self, fold: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Cached predictions of a fold, or None if it has not completed on these inputs."""
+        path = self.fold_name(fold, fingerprint) + ".npz"
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {"fold": fold, "predictions": data["predictions"], "confidences": data["confidences"]}
+
+    def save_fold(self, fold: int, fingerprint: str, predictions: np.ndarray, confidences: np.ndarray):
+        path = self.fold_name(fold, fingerprint) + ".npz"
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, predictions=np.asarray(predictions), confidences=np.asarray(confidences))
+        os.replace(tmp, path)
+
+    # --- Parameter cells ---
+    def _repair_cells(self):
+        """Truncates a last line cut short by a crash, so the next append starts on a fresh line."""
+        if self._cells_repaired:
+            return
+        self._cells_repaired = True
+        path = self.path("cells.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                print(f"[!] Checkpoint {self.directory}: dropping a partial cell line ({len(data) - end} bytes).")
+                f.truncate(end)
+
+    def load_cells(self) -> Dict[str, Dict[str, Any]]:
+        """Completed cells by key. A line cut short by a crash is truncated (that cell is recomputed)."""
+        self._repair_cells()
+        path = self.path("cells.jsonl")
+        cells = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    cells[record["key"]] = record["row"]
+        return cells
+
+    def save_cell(self, key: str, row: Dict[str, Any]):
+        self._repair_cells()
+        with open(self.path("cells.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "row": row}, default=float) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- Metrics ---
+    def save_metrics(self, name: str, metrics: Any):
+        self._write_json(self.path(f"{name}.json"), metrics)
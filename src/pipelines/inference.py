@@ -1,9 +1,9 @@
-from src.config.settings import settings
+import pandas as pd
 
 from src.features.engineering import FeatureEngineer
 from src.ml.predictor import MarketPredictor
 from src.strategy.risk import RiskManager
-from src.infrastructure.notion import NotionClient
+from src.infrastructure.telemetry import count, span
 
 class InferencePipeline:
     def __init__(self, ticker: str, mode: str = "swing"):
@@ -17,8 +17,9 @@ class InferencePipeline:
         self.mode = mode
         self.data_provider = DataProviderFactory.get_provider(ticker, source)
         # Load model specifically for this ticker AND mode
-        self.model_file = f"{ticker}_{mode}.pkl"
+        self.model_file = f"{ticker}_{mode}"
         self.predictor = MarketPredictor(model_name=self.model_file)
+        self.rm = RiskManager(rr_ratio=2.0, atr_multiplier=2.0)
 
     def run(self):
         """Executes the Inference Workflow based on mode."""
@@ -26,31 +27,49 @@ class InferencePipeline:
         
         # 1. Load Model
         try:
-            self.predictor.load_model()
+            with span("load_model"):
+                self.predictor.load_model()
         except FileNotFoundError:
             print("[!] Critical: Model not found. Run 'train' first.")
             return
 
         # 2. Fetch Recent Data (Enough for indicators)
-        if self.mode == "intraday":
-            # 15m intervals, limited to ~60 days. Fetch 59d buffer.
-            df = self.data_provider.fetch_data(period="59d", interval="15m")
-        else:
-            # Swing (Daily). Need >1 year for 252d indicators.
-            df = self.data_provider.fetch_data(period="2y", interval="1d")
-            
+        df = self.fetch_history()
         if df.empty:
             return
 
-        # 3. Feature Engineering
-        fe = FeatureEngineer(df)
+        # 3. Feature Engineering (only what the model uses)
+        fe = FeatureEngineer(df, required=self.predictor.features)
         df_enriched = fe.generate_all()
         
-        # 4. Predict on Latest Candle
-        # 4. Predict on Latest Candle
+        # 4-5. Predict on Latest Candle + Risk Management
+        plan, prediction, confidence_score = self.evaluate(df_enriched)
+        
+        # 6. Publish
+        self._publish(plan, prediction, confidence_score)
+        self._summary(plan)
+        print("✅ INFERENCE COMPLETE.\n")
+
+    def fetch_history(self, period: str = None):
+        """Recent bars for the mode (enough history for the indicators)."""
+        if self.mode == "intraday":
+            # 15m intervals, limited to ~60 days. Fetch 59d buffer.
+            return self.data_provider.fetch_data(period=period or "59d", interval="15m")
+        # Swing (Daily). Need >1 year for 252d indicators.
+        return self.data_provider.fetch_data(period=period or "2y", interval="1d")
+
+    def evaluate(self, df_enriched):
+        """
+        Scores the latest candle of an enriched frame and builds the trading plan.
+        Returns (plan, prediction, confidence).
+        """
+        # 4. Predict on Latest Candle (single booster call for class + probabilities)
         last_row = df_enriched.tail(1)
-        prediction = self.predictor.predict(last_row)
-        confidence_score = self.predictor.predict_proba(last_row)
+        with span("predict"):
+            x = self.predictor.fill_vector(df_enriched)
+            prediction, probs = self.predictor.predict_fast(x)
+        count("predictions")
+        confidence_score = float(probs.max())
         print(f"[*] AI Prediction: {prediction} | Confidence: {confidence_score:.2%}")
         
         if confidence_score < 0.5:
@@ -64,18 +83,16 @@ class InferencePipeline:
                  prediction = 0
         
         # 5. Risk Management
-        rm = RiskManager(rr_ratio=2.0, atr_multiplier=2.0)
-        plan = rm.generate_scenario(
+        plan = self.rm.generate_scenario(
             ticker=self.ticker,
             current_price=last_row['Close'].values[0],
             prediction=prediction,
             df=df_enriched
         )
-        
-        # 6. Publish
-        self._publish(plan, prediction)
-        self._summary(plan)
-        print("✅ INFERENCE COMPLETE.\n")
+        # Journal key of the signal (see infrastructure/journal.py)
+        plan['mode'] = self.mode
+        plan['bar'] = pd.Timestamp(df_enriched.index[-1]).isoformat()
+        return plan, prediction, confidence_score
 
     def _check_trend_bias(self, row, prediction) -> bool:
         """
@@ -123,16 +140,16 @@ class InferencePipeline:
                 
         return True
 
-    def _publish(self, plan, prediction):
+    def _publish(self, plan, prediction, confidence_score):
         try:
-            settings.validate()
             # Confidence mapping based on backtest results
             if prediction == 0:
                 print("[-] Signal Neutral (Wait). No publication.")
                 return
 
-            client = NotionClient(settings.NOTION_TOKEN, settings.ID_DB_SENTINEL)
-            client.publish_trading_plan(plan, confidence_score)
+            from src.infrastructure.publisher import publish_signals # aiohttp only when publishing
+            with span("publish"):
+                publish_signals([(plan, confidence_score)])
         except Exception as e:
             print(f"[!] Publishing failed: {e}")
 
@@ -0,0 +1,65 @@
+import pandas as pd
+import numpy as np
+from typing import List, Optional
+
+from src.features.labels import triple_barrier_labels
+from src.pipelines.backtest import BacktestPipeline
+
+class LabelComparisonPipeline:
+    """
+    Compares target definitions on the same features: the default ATR
+    close-to-close 'Target' and a triple-barrier label matrix. Features are
+    built once; each label trains its own walk-forward fold models, which are
+    then replayed through the trade simulator.
+    """
+
+    def __init__(self, ticker: str, mode: str = "swing", source: str = "auto", horizons: List[int] = (8, 20, 50), stop_mults: List[float] = (2.0,), tp_mults: List[float] = (2.0, 4.0), threshold: float = 0.65, risk_pct: float = 0.02, n_splits: int = 3, window: str = "expanding", embargo: int = 0, workers: Optional[int] = None):
+        self.ticker = ticker
+        self.mode = mode
+        self.horizons = list(horizons)
+        self.stop_mults = list(stop_mults)
+        self.tp_mults = list(tp_mults)
+        self.backtest = BacktestPipeline(ticker, mode=mode, source=source, threshold=threshold, risk_pct=risk_pct, n_splits=n_splits, window=window, embargo=embargo, workers=workers)
+
+    def run(self, period: str = "2y", output: Optional[str] = None) -> pd.DataFrame:
+        print(f"\n🏷️ STARTING LABEL COMPARISON: {self.ticker} [{self.mode.upper()}] | Horizons: {self.horizons} | SL: {self.stop_mults} | TP: {self.tp_mults}")
+
+        # 1. Features once, every label variant as a column of the target matrix
+        df = self.backtest.build_dataset(period=period)
+        if df.empty:
+            print("[!] Label comparison aborted: No data.")
+            return pd.DataFrame()
+        labels = triple_barrier_labels(df, horizons=self.horizons, stop_mults=self.stop_mults, tp_mults=self.tp_mults)
+        df = pd.concat([df, labels], axis=1)
+        print(f"[*] Target matrix: {len(df)} rows x {labels.shape[1] + 1} labels")
+
+        # 2. Walk-forward models per label, replayed through the simulator
+        rows = []
+        for target_col in ['Target'] + list(labels.columns):
+            print(f"\n---> LABEL {target_col}")
+            self.backtest.target_col = target_col
+            folds = self.backtest.prepare(period=period, df=df)
+            results = [self.backtest._simulator(verbose=False).run(f['test_df'], f['predictions'], f['confidences']) for f in folds]
+            active = [r for r in results if r['total_trades'] > 0]
+            counts = df[target_col].value_counts(normalize=True)
+            rows.append({
+                "label": target_col,
+                "long_pct": counts.get(1, 0.0) * 100,
+                "short_pct": counts.get(2, 0.0) * 100,
+                "total_trades": sum(r['total_trades'] for r in results),
+                "win_rate": np.mean([r['win_rate'] for r in active]) if active else 0.0,
+                "profit_factor": np.mean([r['profit_factor'] for r in active]) if active else 0.0,
+                "max_drawdown": max(r['max_drawdown'] for r in active) if active else 0.0,
+            })
+
+        table = pd.DataFrame(rows).sort_values(by=['profit_factor', 'win_rate'], ascending=[False, False]).reset_index(drop=True)
+
+        print("\n" + "═"*45)
+        print("🏷️ LABEL COMPARISON (walk-forward, simulated)")
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+        print("═"*45 + "\n")
+
+        if output:
+            table.to_csv(output, index=False)
+            print(f"[+] Results saved to {output}")
+        return table
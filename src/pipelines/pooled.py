@@ -0,0 +1,157 @@
+import json
+import pandas as pd
+from typing import Dict, List, Optional
+
+from src.data.factory import DataProviderFactory
+from src.features.engineering import FeatureEngineer
+from src.infrastructure.telemetry import count, span, timed
+from src.ml.pooled import PooledPredictor, normalize_features
+from src.pipelines.staging import StagingPipeline
+
+def load_sectors(tickers: List[str], source: str = "auto", path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Sector of each ticker: from a JSON file {ticker: sector} if given,
+    otherwise 'Crypto' for Binance symbols and 'Equity' for the rest.
+    """
+    mapping = {}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+    sectors = {}
+    for ticker in tickers:
+        if ticker in mapping:
+            sectors[ticker] = mapping[ticker]
+        else:
+            sectors[ticker] = "Crypto" if DataProviderFactory.resolve_source(ticker, source) == "binance" else "Equity"
+    return sectors
+
+def _fetch_bars(task: dict) -> pd.DataFrame:
+    """Fetch stage (sequential or in staging fetcher threads)."""
+    df = DataProviderFactory.get_provider(task['ticker'], task['source']).fetch_data(period=task['period'], interval=task['interval'])
+    return None if df.empty else df
+
+def _training_frame(task: dict, df: pd.DataFrame) -> pd.DataFrame:
+    """Compute stage of training: features + target of one ticker."""
+    fe = FeatureEngineer(df)
+    fe.generate_all()
+    return fe.add_target(horizon=task['horizon'])
+
+def _latest_row(task: dict, df: pd.DataFrame) -> pd.DataFrame:
+    """Compute stage of inference: latest normalized feature row of one ticker."""
+    last = normalize_features(FeatureEngineer(df).generate_all().tail(1))
+    last['Symbol'] = task['ticker']
+    last['Sector'] = task['sector']
+    return last
+
+@timed("per_ticker")
+def _per_ticker(tasks: List[dict], compute, prefetch: int = 0, fetchers: int = 4, workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    fetch -> compute for every ticker. Sequential by default; with prefetch > 0,
+    fetcher threads stage the bars while a process pool computes (pipelines/staging.py).
+    """
+    results = {}
+    if prefetch <= 0:
+        for task in tasks:
+            df = _fetch_bars(task)
+            if df is None:
+                print(f"[!] {task['ticker']}: No data. Skipped.")
+                count("tickers_skipped")
+                continue
+            results[task['ticker']] = compute(task, df)
+        return results
+
+    staging = StagingPipeline(_fetch_bars, compute, fetchers=fetchers, workers=workers, queue_size=prefetch)
+    for task, result in staging.run(tasks):
+        if isinstance(result, pd.DataFrame):
+            results[task['ticker']] = result
+        else:
+            print(f"[!] {task['ticker']}: {result or 'No data'}. Skipped.")
+    staging.print_stats()
+    count("tickers_skipped", len(tasks) - len(results))
+    # Input order (results arrive as they complete)
+    return {t['ticker']: results[t['ticker']] for t in tasks if t['ticker'] in results}
+
+class PooledTrainingPipeline:
+    """Trains one model on the stacked history of a universe of tickers."""
+
+    def __init__(self, tickers: List[str], mode: str = "swing", source: str = "auto", sectors_file: Optional[str] = None, model_name: Optional[str] = None, prefetch: int = 0, fetchers: int = 4, workers: Optional[int] = None):
+        """prefetch / fetchers / workers: staging pipeline (0 = sequential fetch then features)."""
+        self.tickers = list(dict.fromkeys(tickers))
+        self.mode = mode
+        self.source = source
+        self.sectors = load_sectors(self.tickers, source, sectors_file)
+        self.model_file = model_name or f"pooled_{mode}"
+        self.predictor = PooledPredictor(model_name=self.model_file)
+        self.staging = dict(prefetch=prefetch, fetchers=fetchers, workers=workers)
+
+    def run(self, period: str = "5y"):
+        print(f"\n🚀 STARTING POOLED TRAINING: {len(self.tickers)} tickers [{self.mode.upper()}]")
+
+        if self.mode == "intraday":
+            period, interval, horizon = "59d", "15m", 8
+        else:
+            interval, horizon = "1d", 5
+
+        # 1. Per-ticker features and targets
+        tasks = [{"ticker": t, "source": self.source, "period": period, "interval": interval, "horizon": horizon} for t in self.tickers]
+        frames = _per_ticker(tasks, _training_frame, **self.staging)
+
+        if not frames:
+            print("[!] Pooled training aborted: No data.")
+            return
+
+        # 2. One normalized, stacked frame -> one model
+        if self.predictor.load_params():
+            print(f"[*] Using stored hyperparameters: {self.predictor.params}")
+        pooled = self.predictor.stack(frames, self.sectors)
+        print(f"[*] Training pooled model on {len(pooled)} rows from {len(frames)} tickers ({len(self.predictor.sectors)} sectors)...")
+        with span("train"):
+            self.predictor.train(pooled)
+        self.predictor.get_feature_importance()
+        print("✅ POOLED TRAINING COMPLETE. One model ready for the whole universe.\n")
+
+class PooledInferencePipeline:
+    """Scores the latest bar of every ticker with the pooled model in one batched call."""
+
+    def __init__(self, tickers: List[str], mode: str = "swing", source: str = "auto", sectors_file: Optional[str] = None, model_name: Optional[str] = None, prefetch: int = 0, fetchers: int = 4, workers: Optional[int] = None):
+        """prefetch / fetchers / workers: staging pipeline (0 = sequential fetch then features)."""
+        self.tickers = list(dict.fromkeys(tickers))
+        self.mode = mode
+        self.source = source
+        self.sectors = load_sectors(self.tickers, source, sectors_file)
+        self.model_file = model_name or f"pooled_{mode}"
+        self.predictor = PooledPredictor(model_name=self.model_file)
+        self.staging = dict(prefetch=prefetch, fetchers=fetchers, workers=workers)
+
+    def run(self) -> pd.DataFrame:
+        print(f"\n🔮 STARTING POOLED INFERENCE: {len(self.tickers)} tickers [{self.mode.upper()}]")
+
+        try:
+            self.predictor.load_model()
+        except FileNotFoundError:
+            print("[!] Critical: Pooled model not found. Run 'pool train' first.")
+            return pd.DataFrame()
+
+        period, interval = ("59d", "15m") if self.mode == "intraday" else ("2y", "1d")
+
+        # 1. Latest normalized feature row of each ticker
+        tasks = [{"ticker": t, "source": self.source, "period": period, "interval": interval, "sector": self.sectors[t]} for t in self.tickers]
+        latest = _per_ticker(tasks, _latest_row, **self.staging)
+        rows = [last.reindex(columns=self.predictor.features + ['Close']) for last in latest.values()]
+
+        if not rows:
+            print("[!] Pooled inference aborted: No data.")
+            return pd.DataFrame()
+
+        # 2. One booster call for the whole universe
+        batch = pd.concat(rows)
+        with span("predict"):
+            results = self.predictor.predict_universe(batch)
+        results['Close'] = batch['Close'].to_numpy()
+        results = results.sort_values(by='Confidence', ascending=False).reset_index(names='Bar')
+
+        print("\n" + "═"*45)
+        print(f"📡 POOLED SIGNALS ({len(results)} tickers)")
+        print(results.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        print("═"*45 + "\n")
+        return results
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+from src.pipelines.backtest import BacktestPipeline
+from src.strategy.portfolio import PortfolioBacktester
+from src.strategy.simulator import TradeSimulator
+
+class PortfolioPipeline:
+    """
+    Multi-asset backtest on one account.
+    Each ticker gets out-of-sample predictions from its own walk-forward fold
+    models (as in 'backtest'); the fold test windows are stitched together and
+    all tickers are replayed through the event-driven PortfolioBacktester.
+    """
+
+    def __init__(self, tickers: List[str], mode: str = "swing", source: str = "auto", initial_capital: float = 100000.0, risk_pct: float = 0.01, max_positions: int = 10, max_exposure: float = 1.0, leverage: float = 1.0, threshold: float = 0.65, adx_threshold: int = 0, trend_filter: bool = False, n_splits: int = 3, window: str = "expanding", embargo: int = 0, workers: Optional[int] = None):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.mode = mode
+        self.source = source
+        self.cv = dict(n_splits=n_splits, window=window, embargo=embargo, workers=workers)
+        self.backtester = PortfolioBacktester(
+            initial_capital=initial_capital, risk_pct=risk_pct, max_positions=max_positions,
+            max_exposure=max_exposure, leverage=leverage, threshold=threshold,
+            adx_threshold=adx_threshold, trend_filter=trend_filter
+        )
+
+    def collect_signals(self, period: str = "2y") -> dict:
+        """Out-of-sample (bars, predictions, confidences) per ticker, fold test windows concatenated."""
+        signals = {}
+        for ticker in self.tickers:
+            print(f"\n---> {ticker}")
+            folds = BacktestPipeline(ticker, mode=self.mode, source=self.source, **self.cv).prepare(period=period)
+            if not folds:
+                print(f"[!] {ticker}: No data. Skipped.")
+                continue
+            bars = pd.concat([f['test_df'] for f in folds])
+            signals[ticker] = (
+                bars[TradeSimulator.required_columns(bars)],
+                np.concatenate([f['predictions'] for f in folds]),
+                np.concatenate([f['confidences'] for f in folds])
+            )
+        return signals
+
+    def run(self, period: str = "2y", output: Optional[str] = None) -> dict:
+        bt = self.backtester
+        print(f"\n💼 STARTING PORTFOLIO BACKTEST: {len(self.tickers)} tickers [{self.mode.upper()}] | Capital: ${bt.capital} | Risk: {bt.risk_pct*100}% | Max Positions: {bt.max_positions} | Max Exposure: {bt.max_exposure}x | Leverage: {bt.leverage}x")
+
+        signals = self.collect_signals(period=period)
+        if not signals:
+            print("[!] Portfolio backtest aborted: No data.")
+            return {}
+
+        n_bars = sum(len(s[0]) for s in signals.values())
+        print(f"\n[*] Replaying {n_bars} bars from {len(signals)} tickers as one event stream...")
+        metrics = bt.run(signals)
+
+        print("\n" + "═"*45)
+        print("💼 PORTFOLIO RESULTS")
+        print(f"Final Equity       : ${metrics['final_balance']:,.2f} ({metrics['return_pct']:+.2f}%)")
+        print(f"Total Trades       : {metrics['total_trades']}")
+        print(f"Win Rate           : {metrics['win_rate']:.2f}%")
+        print(f"Profit Factor      : {metrics['profit_factor']:.2f}")
+        print(f"Max Drawdown       : {metrics['max_drawdown']:.2f}% ({metrics['max_drawdown_duration']} bars underwater)")
+        print(f"Sharpe / Sortino   : {metrics['sharpe']:.2f} / {metrics['sortino']:.2f}")
+        print(f"Calmar             : {metrics['calmar']:.2f}")
+        print(f"Max Open Positions : {metrics['max_concurrent']}")
+        print(f"Max Gross Exposure : {metrics['max_gross_exposure']:.2f}x equity")
+        print(f"Time in Market     : {metrics['time_in_market_pct']:.1f}%")
+        if metrics['skipped']:
+            print(f"Skipped Signals    : {metrics['skipped']}")
+        print("═"*45 + "\n")
+
+        if output:
+            pd.DataFrame(bt.trades).to_csv(output, index=False)
+            print(f"[+] Trades saved to {output}")
+        return metrics
@@ -0,0 +1,224 @@
+import io
+import os
+import time
+import contextlib
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Any, Dict, List, Optional
+
+from src.features.engineering import FeatureEngineer
+from src.infrastructure.telemetry import count, span
+from src.pipelines.inference import InferencePipeline
+from src.pipelines.staging import StagingPipeline
+
+STAGES = ("fetch", "features", "predict")
+
+# Per-worker cache: one InferencePipeline (data provider + loaded model) per (ticker, mode, source)
+_PIPELINES: Dict[tuple, InferencePipeline] = {}
+
+def load_tickers(tickers: Optional[List[str]] = None, path: Optional[str] = None) -> List[str]:
+    """Tickers from the command line and / or a file (one per line or comma separated, '#' comments)."""
+    symbols = list(tickers or [])
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0]
+                symbols.extend(s.strip() for s in line.split(",") if s.strip())
+    return list(dict.fromkeys(symbols))
+
+def _pipeline(ticker: str, mode: str, source: str) -> InferencePipeline:
+    key = (ticker, mode, source)
+    if key not in _PIPELINES:
+        pipeline = InferencePipeline(ticker, mode=mode, source=source)
+        pipeline.predictor.load_model() # Raises FileNotFoundError before caching
+        _PIPELINES[key] = pipeline
+    return _PIPELINES[key]
+
+def _score(task: Dict[str, Any], df, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Features -> prediction on fetched bars; fills the row."""
+    pipeline = _pipeline(task['ticker'], task['mode'], task['source'])
+
+    start = time.perf_counter()
+    enriched = FeatureEngineer(df, required=pipeline.predictor.features).generate_all()
+    row["t_features"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plan, prediction, confidence = pipeline.evaluate(enriched)
+    row["t_predict"] = time.perf_counter() - start
+
+    risk = abs(plan['entry'] - plan['sl'])
+    row.update(
+        direction=plan['direction'], signal=prediction, confidence=confidence,
+        entry=plan['entry'], sl=plan['sl'], tp=plan['tp'], bar=plan['bar'],
+        rr=abs(plan['tp'] - plan['entry']) / risk if risk > 0 else 0.0
+    )
+    return row
+
+def _run_quiet(task: Dict[str, Any], func, *args) -> Dict[str, Any]:
+    """Runs one ticker stage, silencing its output in quiet mode and turning failures into statuses."""
+    row = {"ticker": task['ticker'], "status": "ok", **{f"t_{s}": 0.0 for s in STAGES}}
+    out = io.StringIO() if task['quiet'] else None
+    with (contextlib.redirect_stdout(out) if out is not None else contextlib.nullcontext()):
+        try:
+            return func(task, *args, row)
+        except FileNotFoundError:
+            row["status"] = "no_model"
+        except Exception as e:
+            row.update(status="error", error=str(e))
+    return row
+
+def _fetch_and_score(task: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+    pipeline = _pipeline(task['ticker'], task['mode'], task['source'])
+    start = time.perf_counter()
+    df = pipeline.fetch_history()
+    row["t_fetch"] = time.perf_counter() - start
+    if df.empty:
+        row["status"] = "no_data"
+        return row
+    return _score(task, df, row)
+
+def _scan_ticker(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch -> features -> prediction for one ticker. Module-level so it runs in worker processes."""
+    return _run_quiet(task, _fetch_and_score)
+
+def _scan_staged(task: Dict[str, Any], staged) -> Dict[str, Any]:
+    """Compute stage of the staging pipeline: bars already fetched by a thread."""
+    df, t_fetch = staged
+    row = _run_quiet(task, _score, df)
+    row["t_fetch"] = t_fetch
+    return row
+
+class ScanPipeline:
+    """
+    Scores a universe of tickers with their own models.
+    Every ticker is an independent fetch -> features -> inference task spread
+    over a process pool; each worker keeps its providers and loaded models
+    between tasks. Returns the signals ranked by confidence and reward / risk.
+    """
+
+    def __init__(self, tickers: List[str], mode: str = "swing", source: str = "auto", workers: Optional[int] = None, budget: Optional[float] = None, quiet: bool = True, prefetch: int = 0, fetchers: int = 4):
+        """
+        budget: Wall-clock limit in seconds; tickers not scored in time are reported and dropped.
+        quiet: Silence the per-ticker pipeline output of the workers.
+        prefetch: > 0 enables the staging pipeline: fetcher threads download bars into a
+                  queue of this size while the workers only compute (see pipelines/staging.py).
+        """
+        self.tickers = list(dict.fromkeys(tickers))
+        self.mode = mode
+        self.source = source
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+        self.quiet = quiet
+        self.prefetch = prefetch
+        self.fetchers = fetchers
+
+    def _fetch(self, task: Dict[str, Any]):
+        """Fetch stage (fetcher threads): bars and download time, None without data (reported as no_data)."""
+        start = time.perf_counter()
+        df = InferencePipeline(task['ticker'], mode=task['mode'], source=task['source']).fetch_history()
+        if df.empty:
+            return None
+        return df, time.perf_counter() - start
+
+    def _execute_staged(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        staging = StagingPipeline(self._fetch, _scan_staged, fetchers=self.fetchers, workers=self.workers, queue_size=self.prefetch)
+        deadline = time.perf_counter() + self.budget if self.budget else None
+        rows = []
+        for task, result in staging.run(tasks, deadline=deadline):
+            if isinstance(result, dict):
+                rows.append(result)
+            else: # Fetch failure
+                rows.append({"ticker": task['ticker'], "status": "error" if result is not None else "no_data", "error": str(result or ""), **{f"t_{s}": 0.0 for s in STAGES}})
+            if len(rows) % 50 == 0:
+                print(f"  [{len(rows)}/{len(tasks)}] scanned")
+        if deadline is not None and time.perf_counter() > deadline:
+            print(f"[!] Budget of {self.budget}s reached.")
+        staging.print_stats()
+        return rows
+
+    def _execute(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.workers <= 1:
+            rows = []
+            deadline = time.perf_counter() + self.budget if self.budget else None
+            for task in tasks:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                rows.append(_scan_ticker(task))
+            return rows
+
+        rows = []
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [pool.submit(_scan_ticker, t) for t in tasks]
+        try:
+            for future in as_completed(futures, timeout=self.budget):
+                rows.append(future.result())
+                if len(rows) % 50 == 0:
+                    print(f"  [{len(rows)}/{len(tasks)}] scanned")
+        except FuturesTimeout:
+            print(f"[!] Budget of {self.budget}s reached.")
+        finally:
+            # Drop what has not started; running tasks are not waited for
+            pool.shutdown(wait=False, cancel_futures=True)
+        return rows
+
+    def publish(self, ranked: pd.DataFrame):
+        """Publishes the ranked signals to Notion in one concurrent batch."""
+        signals = [({
+            "ticker": r.ticker, "mode": self.mode, "bar": r.bar, "direction": r.direction,
+            "entry": r.entry, "sl": r.sl, "tp": r.tp, "rr_ratio": round(r.rr, 2)
+        }, float(r.confidence)) for r in ranked.itertuples()]
+        try:
+            from src.infrastructure.publisher import publish_signals # aiohttp only when publishing
+            with span("publish"):
+                publish_signals(signals)
+        except Exception as e:
+            print(f"[!] Publishing failed: {e}")
+
+    def run(self, output: Optional[str] = None, top: int = 30, publish: bool = False) -> pd.DataFrame:
+        print(f"\n📡 STARTING SCAN: {len(self.tickers)} tickers [{self.mode.upper()}] | Workers: {self.workers} | Budget: {self.budget or 'none'}s")
+        tasks = [{"ticker": t, "mode": self.mode, "source": self.source, "quiet": self.quiet} for t in self.tickers]
+
+        start = time.perf_counter()
+        with span("scan"):
+            rows = self._execute_staged(tasks) if self.prefetch > 0 else self._execute(tasks)
+        wall = time.perf_counter() - start
+
+        results = pd.DataFrame(rows)
+        if results.empty:
+            print("[!] Scan aborted: No ticker scored.")
+            return results
+
+        scored = results[results['status'] == 'ok']
+        signals = scored[scored['signal'] != 0] if not scored.empty else scored
+        ranked = signals.sort_values(by=['confidence', 'rr'], ascending=[False, False]).reset_index(drop=True) if not signals.empty else signals
+
+        print("\n" + "═"*45)
+        print(f"📡 SCAN SIGNALS ({len(ranked)} / {len(scored)} scored tickers)")
+        if not ranked.empty:
+            cols = ['ticker', 'direction', 'confidence', 'rr', 'entry', 'sl', 'tp']
+            print(ranked[cols].head(top).to_string(float_format=lambda v: f"{v:.4f}"))
+        else:
+            print("No actionable signal.")
+        print("═"*45)
+
+        # Per-stage timings (worker time, summed and per ticker)
+        print(f"[i] Wall clock: {wall:.1f}s for {len(results)} tickers ({len(results) / wall:.1f} tickers/s)")
+        for stage in STAGES:
+            col = results[f"t_{stage}"]
+            print(f"[i] {stage:<9}: total {col.sum():.1f}s | median {col.median() * 1000:.0f} ms | max {col.max() * 1000:.0f} ms")
+            count(f"scan_{stage}_seconds", float(col.sum())) # Worker time (spans inside workers are not collected)
+        count("tickers_scored", len(scored))
+        failed = results[results['status'] != 'ok']['status'].value_counts().to_dict()
+        if failed:
+            print(f"[!] Not scored: {failed}")
+        missing = len(self.tickers) - len(results)
+        if missing:
+            print(f"[!] {missing} tickers not reached within the budget.")
+        print()
+
+        if output:
+            results.to_csv(output, index=False)
+            print(f"[+] Scan results saved to {output}")
+        if publish and not ranked.empty:
+            self.publish(ranked)
+        return ranked
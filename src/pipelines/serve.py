@@ -0,0 +1,175 @@
+import time
+import pandas as pd
+from typing import List, Optional, Tuple
+
+from src.features.engineering import FeatureEngineer
+from src.infrastructure.telemetry import count, span, telemetry
+from src.pipelines.inference import InferencePipeline
+
+# Candle of each mode: (interval, bar duration, short refresh period, first retry delay after a miss)
+CANDLES = {
+    "intraday": ("15m", pd.Timedelta(minutes=15), "1d", pd.Timedelta(seconds=30)),
+    "swing": ("1d", pd.Timedelta(days=1), "5d", pd.Timedelta(minutes=5)),
+}
+
+def parse_targets(specs: List[str]) -> List[Tuple[str, str]]:
+    """'BTCUSD:intraday', 'AAPL' (swing by default) -> [(ticker, mode), ...]"""
+    targets = []
+    for spec in specs:
+        ticker, _, mode = spec.partition(":")
+        mode = mode or "swing"
+        if mode not in CANDLES:
+            raise ValueError(f"Unknown mode '{mode}' in '{spec}' (expected one of {list(CANDLES)})")
+        targets.append((ticker, mode))
+    return targets
+
+class ServeSession:
+    """In-memory state of one (ticker, mode): warm model and the recent closed bars."""
+
+    def __init__(self, ticker: str, mode: str, source: str = "auto", history: Optional[int] = None):
+        self.pipeline = InferencePipeline(ticker, mode=mode, source=source)
+        self.interval, self.step, self.refresh_period, self.retry = CANDLES[mode]
+        self.history = history
+        self.bars = pd.DataFrame()
+        self.last_scored = None
+        self.misses = 0
+        self.retry_at: Optional[pd.Timestamp] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.pipeline.ticker} [{self.pipeline.mode}]"
+
+    def _now(self) -> pd.Timestamp:
+        """Current time in the timezone convention of the bar index (naive = UTC)."""
+        tz = getattr(self.bars.index, "tz", None)
+        now = pd.Timestamp.now(tz="UTC")
+        return now.tz_convert(tz) if tz is not None else now.tz_localize(None)
+
+    def _closed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drops the candle still forming (open time + duration in the future)."""
+        if df.empty:
+            return df
+        return df[df.index + self.step <= self._now()]
+
+    def warm_up(self) -> bool:
+        """Loads the model once and the full history (the only long download)."""
+        try:
+            self.pipeline.predictor.load_model()
+        except FileNotFoundError:
+            print(f"[!] {self.name}: Model not found. Run 'train' first. Skipped.")
+            return False
+        bars = self.pipeline.fetch_history()
+        if bars.empty:
+            print(f"[!] {self.name}: No data. Skipped.")
+            return False
+        self.bars = bars # Sets the index timezone used by _closed
+        self.bars = self._closed(bars).tail(self.history) if self.history else self._closed(bars)
+        self.history = self.history or len(self.bars) # Same window as 'predict' (daily / weekly indicators need weeks of 15m bars)
+        self.last_scored = self.bars.index[-1]
+        print(f"[+] {self.name}: {len(self.bars)} bars in memory, last close {self.last_scored}")
+        return True
+
+    def next_close(self) -> pd.Timestamp:
+        """
+        Close of the candle after the last scored one (UTC), from the session's
+        own bars: its open is last bar + 1 step in the index timezone (Yahoo daily
+        bars open at 00:00 exchange time, not 00:00 UTC), its close 1 step later.
+        After a miss, the retry time instead.
+        """
+        if self.retry_at is not None:
+            return self.retry_at
+        close = self.last_scored + 2 * self.step
+        return close.tz_convert("UTC") if close.tz is not None else close.tz_localize("UTC")
+
+    def missed(self):
+        """No new bar (provider late, market closed) or failed tick: check again soon, backing off up to one candle."""
+        self.misses += 1
+        delay = min(self.step, self.retry * 2 ** (self.misses - 1))
+        self.retry_at = pd.Timestamp.now(tz="UTC") + delay
+
+    def tick(self) -> Optional[Tuple[dict, int, float]]:
+        """
+        Appends the bars closed since the last tick (short download) and scores
+        only the newest one. Returns (plan, prediction, confidence), or None if no new bar closed.
+        """
+        start = time.perf_counter()
+        recent = self._closed(self.pipeline.data_provider.fetch_data(period=self.refresh_period, interval=self.interval))
+        new = recent[recent.index > self.last_scored] if not recent.empty else recent
+        if new.empty:
+            self.missed()
+            print(f"[~] {self.name}: No new closed bar yet. Retrying at {self.retry_at}.")
+            return None
+        self.misses, self.retry_at = 0, None
+
+        self.bars = pd.concat([self.bars, new[self.bars.columns.intersection(new.columns)]]).tail(self.history)
+        self.last_scored = self.bars.index[-1]
+
+        # Features on the in-memory window, prediction on the last bar only
+        enriched = FeatureEngineer(self.bars, required=self.pipeline.predictor.features).generate_all()
+        plan, prediction, confidence = self.pipeline.evaluate(enriched)
+        print(f"[+] {self.name}: bar {self.last_scored} -> {plan['direction']} ({confidence:.2%}) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return plan, prediction, confidence
+
+class ServePipeline:
+    """
+    Long-running scorer for a list of (ticker, mode).
+    Models and recent bars stay in memory; the process sleeps until the next
+    candle close of any target (derived from its own bars), then refreshes
+    only the last bars and scores the new candle of every target due.
+    """
+
+    def __init__(self, targets: List[Tuple[str, str]], source: str = "auto", grace: float = 5.0, history: Optional[int] = None, publish: bool = True):
+        """
+        grace: Seconds waited after a candle close before fetching (lets the provider publish the bar).
+        history: Closed bars kept in memory per target (indicator warm-up window).
+                 Default: everything the warm-up download returns, as scored by 'predict'.
+        """
+        self.sessions = [ServeSession(ticker, mode, source=source, history=history) for ticker, mode in targets]
+        self.grace = grace
+        self.publish = publish
+
+    def run(self, max_ticks: Optional[int] = None):
+        print(f"\n🛰️ STARTING SERVE: {len(self.sessions)} targets | Grace: {self.grace}s | Publish: {self.publish}")
+        self.sessions = [s for s in self.sessions if s.warm_up()]
+        if not self.sessions:
+            print("[!] Serve aborted: No target could be loaded.")
+            return
+
+        ticks = 0
+        try:
+            while max_ticks is None or ticks < max_ticks:
+                closes = {id(s): s.next_close() for s in self.sessions}
+                wake = min(closes.values())
+                delay = (wake - pd.Timestamp.now(tz="UTC")).total_seconds() + self.grace
+                print(f"[*] Sleeping {max(delay, 0):.0f}s until candle close {wake}...")
+                if delay > 0:
+                    time.sleep(delay)
+
+                signals = []
+                for session in self.sessions:
+                    if closes[id(session)] > wake:
+                        continue
+                    try:
+                        with span(f"tick_{session.name}"):
+                            scored = session.tick()
+                    except Exception as e:
+                        session.missed()
+                        print(f"[!] {session.name}: Tick failed: {e}")
+                        continue
+                    if scored is not None and scored[1] != 0:
+                        signals.append((scored[0], scored[2]))
+
+                # One concurrent batch for every signal of this close
+                if self.publish and signals:
+                    try:
+                        from src.infrastructure.publisher import publish_signals
+                        with span("publish"):
+                            publish_signals(signals)
+                    except Exception as e:
+                        print(f"[!] Publishing failed: {e}")
+                ticks += 1
+                count("closes")
+                count("signals", len(signals))
+                telemetry.write() # Refreshes the Prometheus file between closes (no-op when disabled)
+        except KeyboardInterrupt:
+            print("\n[i] Serve stopped.")
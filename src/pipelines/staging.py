@@ -0,0 +1,139 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+_DONE = object() # End-of-stream marker of one fetcher thread
+
+class StagingPipeline:
+    """
+    Producer / consumer pipeline overlapping network I/O with compute.
+    Fetcher threads download the bars of the next items into a bounded queue
+    while a process pool computes features / predictions on the items already
+    staged. Backpressure:
+    - queue_size: fetched items waiting for compute (fetchers block when full);
+    - max_inflight: items submitted to the pool and not finished yet.
+    Results are yielded as they complete (not in input order).
+    """
+
+    def __init__(self, fetch: Callable[[Any], Any], compute: Callable[[Any, Any], Any], fetchers: int = 4, workers: Optional[int] = None, queue_size: int = 8, max_inflight: Optional[int] = None):
+        """
+        fetch: item -> data (runs in threads; None = nothing to compute).
+        compute: (item, data) -> result; must be a module-level function (pickled to workers).
+        workers: Compute processes (1 = compute inline in the consumer thread).
+        """
+        self.fetch = fetch
+        self.compute = compute
+        self.fetchers = max(1, fetchers)
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = max(1, queue_size)
+        self.max_inflight = max_inflight or 2 * self.workers
+        self.stats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, key: str, value: float):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0.0) + value
+
+    @staticmethod
+    def _put(q: queue.Queue, entry, stop: threading.Event) -> bool:
+        """Blocking put that gives up when the pipeline stops."""
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _producer(self, todo: queue.Queue, staged: queue.Queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                item = todo.get_nowait()
+            except queue.Empty:
+                break
+            start = time.perf_counter()
+            try:
+                data, error = self.fetch(item), None
+            except Exception as e:
+                data, error = None, e
+            self._add("fetch_s", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            if not self._put(staged, (item, data, error), stop):
+                return
+            self._add("fetch_blocked_s", time.perf_counter() - start)
+        self._put(staged, _DONE, stop)
+
+    def run(self, items: Iterable[Any], deadline: Optional[float] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yields (item, result). result is the exception raised by fetch / compute,
+        or None when fetch returned None.
+        deadline: time.perf_counter() value after which no new result is collected.
+        """
+        self.stats = {"fetch_s": 0.0, "fetch_blocked_s": 0.0, "compute_starved_s": 0.0}
+        todo: queue.Queue = queue.Queue()
+        for item in items:
+            todo.put(item)
+        staged: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        threads = [threading.Thread(target=self._producer, args=(todo, staged, stop), daemon=True) for _ in range(self.fetchers)]
+        for t in threads:
+            t.start()
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        inflight: Dict[Any, Any] = {}
+        producers_left = len(threads)
+        try:
+            while producers_left or inflight:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+
+                # Collect finished computations without blocking
+                for future in [f for f in inflight if f.done()]:
+                    item = inflight.pop(future)
+                    error = future.exception()
+                    yield item, error if error is not None else future.result()
+
+                # Pool saturated or nothing left to stage: wait for a computation
+                if inflight and (len(inflight) >= self.max_inflight or not producers_left):
+                    wait(list(inflight), timeout=None if deadline is None else max(deadline - time.perf_counter(), 0), return_when=FIRST_COMPLETED)
+                    continue
+                if not producers_left:
+                    continue
+
+                start = time.perf_counter()
+                timeout = 0.1 if inflight else None
+                if deadline is not None: # A hung fetch must not hold the consumer past the deadline
+                    timeout = max(0.0, min(0.1, deadline - start))
+                try:
+                    entry = staged.get(timeout=timeout)
+                except queue.Empty:
+                    continue # Check the running computations again
+                finally:
+                    self._add("compute_starved_s", time.perf_counter() - start)
+                if entry is _DONE:
+                    producers_left -= 1
+                    continue
+
+                item, data, error = entry
+                if error is not None or data is None:
+                    yield item, error
+                elif pool is not None:
+                    inflight[pool.submit(self.compute, item, data)] = item
+                else:
+                    try:
+                        yield item, self.compute(item, data)
+                    except Exception as e:
+                        yield item, e
+        finally:
+            stop.set()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def print_stats(self):
+        """Where the time went: I/O bound if compute starves, compute bound if fetchers block."""
+        s = self.stats
+        print(f"[i] Staging: fetch {s.get('fetch_s', 0):.1f}s (thread time) | fetchers blocked by backpressure {s.get('fetch_blocked_s', 0):.1f}s | compute waiting for data {s.get('compute_starved_s', 0):.1f}s")
@@ -0,0 +1,148 @@
+import os
+import itertools
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.infrastructure.telemetry import count, span
+from src.pipelines.backtest import BacktestPipeline
+from src.pipelines.checkpoint import RunCheckpoint, config_hash
+from src.strategy.simulator import TradeSimulator
+
+# Folds shared with every worker process (set once by the pool initializer)
+_FOLDS: List[Dict[str, Any]] = []
+
+def _init_worker(folds: List[Dict[str, Any]]):
+    global _FOLDS
+    _FOLDS = folds
+
+def _evaluate_cell(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulates one parameter combination across all cached folds."""
+    results = []
+    for fold in _FOLDS:
+        sim = TradeSimulator(
+            task['ticker'],
+            initial_capital=task['capital'],
+            threshold=task['threshold'],
+            risk_pct=task['risk_pct'],
+            adx_threshold=task['adx_threshold'],
+            trend_filter=task['trend_filter'],
+            verbose=False
+        )
+        results.append(sim.run(fold['test_df'], fold['predictions'], fold['confidences']))
+
+    active = [r for r in results if r['total_trades'] > 0]
+    row = {
+        "threshold": task['threshold'],
+        "risk_pct": task['risk_pct'],
+        "adx_threshold": task['adx_threshold'],
+        "trend_filter": task['trend_filter'],
+        "total_trades": sum(r['total_trades'] for r in results),
+        "active_folds": len(active),
+        "win_rate": np.mean([r['win_rate'] for r in active]) if active else 0.0,
+        "profit_factor": np.mean([r['profit_factor'] for r in active]) if active else 0.0,
+        "max_drawdown": max(r['max_drawdown'] for r in active) if active else 0.0,
+        "sharpe_per_trade": np.mean([r['sharpe_per_trade'] for r in active]) if active else 0.0,
+        "avg_return_pct": np.mean([(r['final_balance'] - task['capital']) / task['capital'] * 100 for r in results])
+    }
+    return row
+
+class SweepPipeline:
+    """
+    Grid search over the backtest trading parameters.
+    Features and fold models are computed once, then every combination of
+    threshold / risk / ADX filter / trend filter is replayed on the cached
+    fold predictions across a process pool.
+    """
+
+    def __init__(self, ticker: str, mode: str = "swing", source: str = "auto", initial_capital: float = 10000.0, workers: Optional[int] = None, n_splits: int = 3, window: str = "expanding", embargo: int = 0, checkpoint: bool = False):
+        self.ticker = ticker
+        self.checkpoint = checkpoint
+        self.mode = mode
+        self.capital = initial_capital
+        self.workers = workers or os.cpu_count() or 1
+        self.backtest = BacktestPipeline(ticker, mode=mode, source=source, initial_capital=initial_capital, n_splits=n_splits, window=window, embargo=embargo, workers=self.workers, checkpoint=checkpoint)
+
+    def run(self, period: str = "2y", thresholds: List[float] = None, risks: List[float] = None, adx_thresholds: List[int] = None, trend_filters: List[bool] = None, top: int = 20, output: Optional[str] = None) -> pd.DataFrame:
+        thresholds = thresholds or [self.backtest.threshold]
+        risks = risks or [self.backtest.risk_pct]
+        adx_thresholds = adx_thresholds or [0]
+        trend_filters = trend_filters or [False]
+
+        grid = list(itertools.product(thresholds, risks, adx_thresholds, trend_filters))
+        print(f"\n🧮 STARTING SWEEP: {self.ticker} [{self.mode.upper()}] | {len(grid)} combinations | Workers: {self.workers}")
+
+        # 1. Features + fold models, once
+        folds = self.backtest.prepare(period=period)
+        if not folds:
+            print("[!] Sweep aborted: No data.")
+            return pd.DataFrame()
+
+        # Ship only what the simulator reads to the workers
+        slim_folds = []
+        for fold in folds:
+            cols = TradeSimulator.required_columns(fold['test_df'])
+            slim_folds.append({
+                "test_df": fold['test_df'][cols],
+                "predictions": np.asarray(fold['predictions']),
+                "confidences": np.asarray(fold['confidences'])
+            })
+
+        tasks = [{
+            "ticker": self.ticker,
+            "capital": self.capital,
+            "threshold": th,
+            "risk_pct": risk,
+            "adx_threshold": adx,
+            "trend_filter": bool(tf)
+        } for th, risk, adx, tf in grid]
+
+        # Resumable: cells already evaluated on the same fold predictions are skipped
+        done, keys, ckpt = {}, {}, None
+        if self.checkpoint:
+            ckpt = RunCheckpoint("sweep", {**self.backtest.checkpoint_config(period), "capital": self.capital})
+            folds_digest = config_hash([f['fingerprint'] for f in folds])
+            keys = {id(t): f"{t['threshold']}|{t['risk_pct']}|{t['adx_threshold']}|{int(t['trend_filter'])}|{folds_digest}" for t in tasks}
+            cells = ckpt.load_cells()
+            done = {id(t): cells[keys[id(t)]] for t in tasks if keys[id(t)] in cells}
+            print(f"[i] Checkpoint {ckpt.directory}: {len(done)}/{len(tasks)} combinations reused")
+        pending = [t for t in tasks if id(t) not in done]
+
+        # 2. Evaluate every remaining cell (saved as soon as it completes)
+        print(f"[*] Evaluating {len(pending)} combinations on {len(slim_folds)} folds...")
+        rows = list(done.values())
+        with span("evaluate_cells"):
+            if self.workers > 1 and len(pending) > 1:
+                chunksize = max(1, len(pending) // (self.workers * 4))
+                with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(slim_folds,)) as pool:
+                    for task, row in zip(pending, pool.map(_evaluate_cell, pending, chunksize=chunksize)):
+                        if ckpt is not None:
+                            ckpt.save_cell(keys[id(task)], row)
+                        rows.append(row)
+            else:
+                _init_worker(slim_folds)
+                for task in pending:
+                    row = _evaluate_cell(task)
+                    if ckpt is not None:
+                        ckpt.save_cell(keys[id(task)], row)
+                    rows.append(row)
+        count("cells_evaluated", len(pending))
+        count("cells_reused", len(done))
+
+        # 3. Rank
+        results = pd.DataFrame(rows).sort_values(
+            by=['profit_factor', 'win_rate', 'max_drawdown'],
+            ascending=[False, False, True]
+        ).reset_index(drop=True)
+
+        print("\n" + "═"*45)
+        print("🏆 SWEEP RESULTS (ranked by Profit Factor)")
+        print(results.head(top).to_string(float_format=lambda v: f"{v:.2f}"))
+        print("═"*45 + "\n")
+
+        if output:
+            results.to_csv(output, index=False)
+            print(f"[+] Sweep results saved to {output}")
+
+        return results
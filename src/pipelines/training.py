@@ -1,8 +1,11 @@
+import os
 from src.config.settings import settings
 
 from src.data.storage.filesystem import LocalStorage
 from src.features.engineering import FeatureEngineer
-from src.ml.predictor import MarketPredictor
+from src.ml.predictor import MarketPredictor, RefitPolicy
+from src.ml.streaming import FeatureShards
+from src.infrastructure.telemetry import span
 
 class TrainingPipeline:
     def __init__(self, ticker: str, mode: str = "swing"):
@@ -11,13 +14,34 @@ class TrainingPipeline:
 from src.data.factory import DataProviderFactory
 
 class TrainingPipeline:
-    def __init__(self, ticker: str, mode: str = "swing", source: str = "auto"):
+    def __init__(self, ticker: str, mode: str = "swing", source: str = "auto", incremental: bool = False, refit_policy: RefitPolicy = None, select_features: bool = False, stream: bool = False, chunk_rows: int = 50_000, external_memory: bool = False, model_type: str = "xgboost", seq_window: int = 64):
+        """
+        stream: Out-of-core training. Features are generated chunk by chunk
+                (chunk_rows bars) into parquet shards and streamed into XGBoost,
+                so the full feature frame is never held in memory.
+                external_memory additionally keeps the quantized matrix on disk.
+        model_type: 'xgboost' or 'sequence' (CPU convolutional model on
+                    seq_window-bar windows, saved as '<ticker>_<mode>_seq').
+        """
+        if model_type not in ("xgboost", "sequence"):
+            raise ValueError(f"Unknown model type: {model_type} (expected 'xgboost' or 'sequence')")
+        if stream and (incremental or select_features):
+            print("[!] Warning: --stream does not support incremental training or feature selection. Ignoring them.")
+            incremental = select_features = False
         self.ticker = ticker
         self.mode = mode
+        self.incremental = incremental
+        self.select_features = select_features
+        self.stream = stream
+        self.chunk_rows = chunk_rows
+        self.external_memory = external_memory
+        self.model_type = model_type
+        self.seq_window = seq_window
+        self.refit_policy = refit_policy or RefitPolicy()
         self.data_provider = DataProviderFactory.get_provider(ticker, source)
         self.storage = LocalStorage()
         # Save model specifically for this ticker AND mode
-        self.model_file = f"{ticker}_{mode}.pkl"
+        self.model_file = f"{ticker}_{mode}"
         self.predictor = MarketPredictor(model_name=self.model_file)
 
     def run(self, period: str = "5y", interval: str = "1d"):
@@ -26,7 +50,8 @@ class TrainingPipeline:
         
         # 0. Configure based on Mode
         if self.mode == "intraday":
-            period = "59d" # 60d limit for 15m
+            if not self.stream:
+                period = "59d" # 60d limit for 15m (streaming is meant for long Binance histories)
             interval = "15m"
             horizon = 8 # Predict 2 hours ahead (8 * 15m)
         else:
@@ -41,15 +66,66 @@ class TrainingPipeline:
         # 2. Save Raw Data
         self.storage.save(df, f"{self.ticker}.parquet")
         
-        # 3. Feature Engineering
+        if self.stream:
+            self._run_streaming(df, horizon)
+            return
+
+        # 3. Feature Engineering (only the stored feature subset, unless re-selecting)
+        has_previous = self.incremental and self._load_previous()
+        if not has_previous and self.predictor.load_params():
+            print(f"[*] Using stored hyperparameters: {self.predictor.params}")
+        if self.select_features:
+            self.predictor.selected_features = None
         print("[*] Generating Features...")
-        fe = FeatureEngineer(df)
+        fe = FeatureEngineer(df, required=self.predictor.selected_features)
         df_final = fe.generate_all()
         df_final = fe.add_target(horizon=horizon)
         
-        # 4. Train Model
-        print(f"[*] Training Model on {len(df_final)} samples...")
-        self.predictor.train(df_final)
+        if self.model_type == "sequence":
+            from src.ml.sequence import SequencePredictor # Only the sequence model needs it
+            print(f"[*] Training Sequence Model on {len(df_final)} samples...")
+            with span("train"):
+                SequencePredictor(model_name=f"{self.model_file}_seq", window=self.seq_window).train(df_final)
+            print("✅ TRAINING COMPLETE. Sequence model ready.\n")
+            return
+
+        # 4. Train Model (warm start from the saved model if requested)
+        if has_previous:
+            print(f"[*] Updating Model with data up to {df_final.index[-1]}...")
+            with span("train"):
+                outcome = self.predictor.update(df_final, policy=self.refit_policy)
+            if outcome == "skipped":
+                print("✅ TRAINING COMPLETE. Model unchanged.\n")
+                return
+        else:
+            print(f"[*] Training Model on {len(df_final)} samples...")
+            with span("train"):
+                self.predictor.train(df_final)
+            if self.select_features:
+                with span("feature_selection"):
+                    self.predictor.prune_features(df_final)
         self.predictor.get_feature_importance()
         
         print("✅ TRAINING COMPLETE. Model ready for inference.\n")
+
+    def _run_streaming(self, df, horizon: int):
+        """Out-of-core variant of steps 3-4: feature shards on disk, streamed training."""
+        if self.predictor.load_params():
+            print(f"[*] Using stored hyperparameters: {self.predictor.params}")
+        print(f"[*] Generating Features in chunks of {self.chunk_rows} bars...")
+        shard_dir = os.path.join(settings.DATA_DIR, "features", self.model_file)
+        with span("feature_shards"):
+            shards = FeatureShards.write(df, shard_dir, horizon=horizon, chunk_rows=self.chunk_rows, required=self.predictor.selected_features)
+        with span("train"):
+            self.predictor.train_streaming(shards, external_memory=self.external_memory)
+        self.predictor.get_feature_importance()
+        print("✅ TRAINING COMPLETE. Model ready for inference.\n")
+
+    def _load_previous(self) -> bool:
+        """Loads the current model to continue from. False if there is none yet."""
+        try:
+            self.predictor.load_model()
+            return True
+        except FileNotFoundError:
+            print("[*] No previous model. Falling back to a full training.")
+            return False
@@ -0,0 +1,179 @@
+import os
+import statistics
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+from typing import Any, Dict, List, Optional
+from sklearn.metrics import log_loss, precision_score
+from sklearn.utils.class_weight import compute_sample_weight
+
+from src.ml.predictor import MarketPredictor
+from src.pipelines.backtest import BacktestPipeline
+
+# Search space: name -> (kind, low, high). 'log' samples uniformly in log space.
+SEARCH_SPACE = {
+    "n_estimators": ("int", 100, 600),
+    "max_depth": ("int", 2, 8),
+    "learning_rate": ("log", 0.005, 0.2),
+    "subsample": ("float", 0.5, 1.0),
+    "colsample_bytree": ("float", 0.4, 1.0),
+    "min_child_weight": ("log", 1.0, 20.0),
+}
+
+# Shared with every worker process (set once by the pool initializer)
+_DATA: Dict[str, Any] = {}
+
+def _init_worker(X: np.ndarray, y: np.ndarray, splits: list, fold_scores: list, n_startup: int, n_jobs: int, metric: str):
+    _DATA.update(X=X, y=y, splits=splits, fold_scores=fold_scores, n_startup=n_startup, n_jobs=n_jobs, metric=metric)
+
+def _fold_score(model, X_test: np.ndarray, y_test: np.ndarray, metric: str) -> float:
+    """Higher is better. 'precision' = macro precision on the trade classes (Long, Short)."""
+    if metric == "logloss":
+        return -log_loss(y_test, model.predict_proba(X_test), labels=[0, 1, 2])
+    return precision_score(y_test, model.predict(X_test), labels=[1, 2], average='macro', zero_division=0)
+
+def _run_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Walk-forward evaluation of one parameter set.
+    After each fold, the running mean score is compared to the median of the
+    other trials at the same fold; the trial is pruned if it is below.
+    """
+    X, y = _DATA['X'], _DATA['y']
+    predictor = MarketPredictor(n_jobs=_DATA['n_jobs'], params=trial['params'])
+    scores: List[float] = []
+    result = {"trial": trial['id'], "state": "complete", "folds": 0, **trial['params']}
+
+    for k, (train_idx, test_idx) in enumerate(_DATA['splits']):
+        # Same inner time split / early stopping / class weights as MarketPredictor.train
+        cut = int(len(train_idx) * 0.8)
+        fit_idx, eval_idx = train_idx[:cut], train_idx[cut:]
+        if len(set(y[fit_idx])) < 3:
+            result.update(state="failed", score=np.nan)
+            return result
+
+        model = predictor.make_estimator()
+        model.fit(
+            X[fit_idx], y[fit_idx],
+            sample_weight=compute_sample_weight(class_weight='balanced', y=y[fit_idx]),
+            eval_set=[(X[eval_idx], y[eval_idx])],
+            verbose=False
+        )
+        scores.append(_fold_score(model, X[test_idx], y[test_idx], _DATA['metric']))
+        intermediate = float(np.mean(scores))
+        result["folds"] = k + 1
+
+        peers = list(_DATA['fold_scores'][k])
+        _DATA['fold_scores'][k].append(intermediate)
+        if k < len(_DATA['splits']) - 1 and len(peers) >= _DATA['n_startup'] and intermediate < statistics.median(peers):
+            result.update(state="pruned", score=intermediate)
+            return result
+
+    result["score"] = float(np.mean(scores))
+    return result
+
+class TuningPipeline:
+    """
+    Random hyperparameter search for MarketPredictor over walk-forward folds.
+    The feature matrix is built once and shared with every worker; trials
+    whose intermediate fold score falls below the median of their peers are
+    pruned early. The best configuration is used to train and save the
+    production model, and is stored in its sidecar.
+    """
+
+    def __init__(self, ticker: str, mode: str = "swing", source: str = "auto", n_splits: int = 3, window: str = "expanding", embargo: int = 0, workers: Optional[int] = None, metric: str = "precision", seed: int = 42, n_startup: int = 5):
+        if metric not in ("precision", "logloss"):
+            raise ValueError(f"Unknown metric: {metric} (expected 'precision' or 'logloss')")
+        self.ticker = ticker
+        self.mode = mode
+        self.metric = metric
+        self.seed = seed
+        self.n_startup = n_startup
+        self.workers = workers or os.cpu_count() or 1
+        self.backtest = BacktestPipeline(ticker, mode=mode, source=source, n_splits=n_splits, window=window, embargo=embargo, workers=1)
+        self.model_file = f"{ticker}_{mode}"
+
+    @staticmethod
+    def _sample(rng: np.random.Generator) -> Dict[str, Any]:
+        params = {}
+        for name, (kind, low, high) in SEARCH_SPACE.items():
+            if kind == "int":
+                params[name] = int(rng.integers(low, high + 1))
+            elif kind == "log":
+                params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        return params
+
+    def run(self, period: str = "2y", n_trials: int = 50, top: int = 10) -> pd.DataFrame:
+        print(f"\n🎛️ STARTING TUNING: {self.ticker} [{self.mode.upper()}] | {n_trials} trials | Metric: {self.metric} | Workers: {self.workers}")
+
+        # 1. One feature matrix for every trial
+        df = self.backtest.build_dataset(period=period)
+        if df.empty:
+            print("[!] Tuning aborted: No data.")
+            return pd.DataFrame()
+
+        splits = self.backtest.split_folds(df)
+        # Keep the feature subset stored with the production model (see 'train --select_features')
+        stored = MarketPredictor(model_name=self.model_file)
+        selected = stored.selected_features if stored.load_params() else None
+        features = list(selected or MarketPredictor.feature_columns(df))
+        if selected:
+            print(f"[i] Tuning on the {len(selected)} features selected for {self.model_file}")
+        X = df[features].to_numpy(dtype=np.float32)
+        y = df['Target'].to_numpy(dtype=int)
+        print(f"[*] Feature matrix: {X.shape[0]} rows x {X.shape[1]} features | {len(splits)} folds")
+
+        # Trial 0 is the current default configuration (baseline)
+        rng = np.random.default_rng(self.seed)
+        trials = [{"id": 0, "params": dict(MarketPredictor.DEFAULT_PARAMS)}]
+        trials += [{"id": i, "params": self._sample(rng)} for i in range(1, n_trials)]
+
+        # 2. Search
+        workers = min(self.workers, len(trials))
+        n_jobs = max(1, (os.cpu_count() or 1) // workers)
+        if workers > 1:
+            with Manager() as manager:
+                fold_scores = [manager.list() for _ in splits]
+                initargs = (X, y, splits, fold_scores, self.n_startup, n_jobs, self.metric)
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                    rows = list(pool.map(_run_trial, trials))
+        else:
+            _init_worker(X, y, splits, [[] for _ in splits], self.n_startup, n_jobs, self.metric)
+            rows = [_run_trial(t) for t in trials]
+
+        results = pd.DataFrame(rows)
+        complete = results[results['state'] == "complete"].sort_values(by='score', ascending=False)
+
+        print("\n" + "═"*45)
+        print(f"🏆 TUNING RESULTS ({len(complete)} complete, {(results['state'] == 'pruned').sum()} pruned, {(results['state'] == 'failed').sum()} failed)")
+        print(complete.head(top).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        print("═"*45 + "\n")
+
+        if complete.empty:
+            print("[!] No trial completed. Model unchanged.")
+            return results
+
+        # 3. Train and save the production model with the best configuration
+        best = complete.iloc[0]
+        best_params = {
+            name: (int(best[name]) if SEARCH_SPACE[name][0] == "int" else float(best[name]))
+            for name in SEARCH_SPACE if not pd.isna(best[name])
+        }
+        print(f"[*] Best params (score {best['score']:.4f}): {best_params}")
+
+        predictor = MarketPredictor(model_name=self.model_file, params=best_params)
+        predictor.selected_features, predictor.selection = stored.selected_features, stored.selection
+        baseline = results.loc[results['trial'] == 0].iloc[0]
+        predictor.tuning = {
+            "metric": self.metric,
+            "score": float(best['score']),
+            "baseline_score": float(baseline['score']) if baseline['state'] == "complete" else None,
+            "n_trials": int(n_trials),
+            "n_pruned": int((results['state'] == "pruned").sum()),
+            "folds": len(splits)
+        }
+        predictor.train(df)
+        print("✅ TUNING COMPLETE. Best configuration stored with the model.\n")
+        return results
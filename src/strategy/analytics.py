@@ -0,0 +1,135 @@
+"""
+Vectorized performance analytics.
+Every function works on the last axis, so a 2-D array (runs x periods,
+e.g. one row per sweep cell) is processed in one call without Python loops.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple, Union
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+
+def _values(x: ArrayLike) -> np.ndarray:
+    """DataFrames are taken as one column per run (time on the index)."""
+    if isinstance(x, pd.DataFrame):
+        return x.to_numpy(dtype=float).T
+    return np.asarray(x, dtype=float)
+
+def equity_curve(pnl: ArrayLike, initial_capital: float = 10000.0) -> np.ndarray:
+    """Equity after each trade / period from PnL amounts, starting point included."""
+    pnl = _values(pnl)
+    start = np.full(pnl.shape[:-1] + (1,), initial_capital)
+    return np.concatenate([start, initial_capital + np.cumsum(pnl, axis=-1)], axis=-1)
+
+def returns(equity: ArrayLike) -> np.ndarray:
+    """Simple period returns of an equity curve (one fewer point)."""
+    eq = _values(equity)
+    return np.diff(eq, axis=-1) / eq[..., :-1]
+
+def drawdown_series(equity: ArrayLike) -> np.ndarray:
+    """Drawdown from the running peak, as a positive fraction (0 = at a high)."""
+    eq = _values(equity)
+    peaks = np.maximum.accumulate(eq, axis=-1)
+    return (peaks - eq) / peaks
+
+def max_drawdown(equity: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (max drawdown fraction, longest underwater duration in periods).
+    Duration = longest run of consecutive periods below the previous peak.
+    """
+    dd = drawdown_series(equity)
+    idx = np.broadcast_to(np.arange(dd.shape[-1]), dd.shape)
+    # Index of the last period at a peak, carried forward
+    last_peak = np.maximum.accumulate(np.where(dd <= 0, idx, 0), axis=-1)
+    duration = (idx - last_peak).max(axis=-1)
+    return dd.max(axis=-1), duration
+
+def sharpe_ratio(rets: ArrayLike, periods_per_year: float = 252) -> np.ndarray:
+    """Annualized Sharpe ratio (risk-free rate 0). 0 when returns are constant."""
+    r = _values(rets)
+    std = r.std(axis=-1, ddof=1) if r.shape[-1] > 1 else np.zeros(r.shape[:-1])
+    mean = r.mean(axis=-1) if r.shape[-1] else np.zeros(r.shape[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, mean / std * np.sqrt(periods_per_year), 0.0)
+
+def sortino_ratio(rets: ArrayLike, periods_per_year: float = 252) -> np.ndarray:
+    """Annualized Sortino ratio (downside deviation of negative returns, target 0)."""
+    r = _values(rets)
+    mean = r.mean(axis=-1) if r.shape[-1] else np.zeros(r.shape[:-1])
+    downside = np.sqrt((np.minimum(r, 0.0) ** 2).mean(axis=-1)) if r.shape[-1] else np.zeros(r.shape[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(downside > 0, mean / downside * np.sqrt(periods_per_year), 0.0)
+
+def cagr(equity: ArrayLike, periods_per_year: float = 252) -> np.ndarray:
+    """Compound annual growth rate of an equity curve."""
+    eq = _values(equity)
+    years = max(eq.shape[-1] - 1, 1) / periods_per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(eq[..., -1] > 0, (eq[..., -1] / eq[..., 0]) ** (1 / years) - 1, -1.0)
+
+def calmar_ratio(equity: ArrayLike, periods_per_year: float = 252) -> np.ndarray:
+    """CAGR / max drawdown. 0 without drawdown."""
+    mdd, _ = max_drawdown(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mdd > 0, cagr(equity, periods_per_year) / mdd, 0.0)
+
+def exposure(in_market: ArrayLike) -> np.ndarray:
+    """Share of periods with an open position (boolean or position-size array)."""
+    return (_values(in_market) != 0).mean(axis=-1)
+
+def period_returns(equity: pd.Series, freq: str = "M") -> pd.Series:
+    """Returns per calendar period (e.g. 'W', 'M', 'Y') of a dated equity curve."""
+    rule = {"M": "ME", "Y": "YE", "Q": "QE"}.get(freq, freq)
+    try:
+        closes = equity.resample(rule).last().dropna()
+    except ValueError:
+        closes = equity.resample(freq).last().dropna() # pandas < 2.2 aliases
+    previous = closes.shift(1)
+    previous.iloc[0] = equity.iloc[0]
+    return closes / previous - 1
+
+def stack_curves(curves) -> np.ndarray:
+    """
+    Stacks equity curves of different lengths (e.g. one per sweep cell) into
+    a runs x periods array, holding each curve flat after its last point.
+    """
+    curves = [np.asarray(c, dtype=float) for c in curves]
+    width = max(len(c) for c in curves)
+    out = np.empty((len(curves), width))
+    for row, c in enumerate(curves):
+        out[row, :len(c)] = c
+        out[row, len(c):] = c[-1]
+    return out
+
+def infer_periods_per_year(index: pd.DatetimeIndex) -> float:
+    """Annualization factor from the median spacing of a datetime index."""
+    if len(index) < 2:
+        return 252.0
+    step = pd.Series(index).diff().median()
+    return float(pd.Timedelta(days=365.25) / step)
+
+def summary(equity: ArrayLike, periods_per_year: Optional[float] = None, in_market: Optional[ArrayLike] = None) -> Dict[str, Any]:
+    """
+    All metrics of one equity curve (floats) or of many (arrays, one per run).
+    periods_per_year is inferred from a dated pd.Series if omitted.
+    """
+    if periods_per_year is None:
+        periods_per_year = infer_periods_per_year(equity.index) if isinstance(equity, (pd.Series, pd.DataFrame)) and isinstance(equity.index, pd.DatetimeIndex) else 252.0
+    eq = _values(equity)
+    r = returns(eq)
+    mdd, duration = max_drawdown(eq)
+    metrics = {
+        "total_return_pct": (eq[..., -1] / eq[..., 0] - 1) * 100,
+        "cagr_pct": cagr(eq, periods_per_year) * 100,
+        "volatility_pct": (r.std(axis=-1, ddof=1) if r.shape[-1] > 1 else np.zeros(r.shape[:-1])) * np.sqrt(periods_per_year) * 100,
+        "sharpe": sharpe_ratio(r, periods_per_year),
+        "sortino": sortino_ratio(r, periods_per_year),
+        "calmar": calmar_ratio(eq, periods_per_year),
+        "max_drawdown_pct": mdd * 100,
+        "max_drawdown_duration": duration,
+    }
+    if in_market is not None:
+        metrics["exposure_pct"] = exposure(in_market) * 100
+    if eq.ndim == 1:
+        metrics = {k: (int(v) if k == "max_drawdown_duration" else float(v)) for k, v in metrics.items()}
+    return metrics
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from src.data.factory import DataProviderFactory
+from src.data.storage.filesystem import LocalStorage
+
+# Longest history Yahoo serves per intraday interval (longer periods come back empty)
+YAHOO_MAX_DAYS = {"1m": 7, "2m": 59, "5m": 59, "15m": 59, "30m": 59, "90m": 59, "60m": 729, "1h": 729}
+
+def _period_days(period: str) -> int:
+    """'59d' -> 59, '2y' -> 730, 'max' -> a very large number."""
+    if period.endswith("d"):
+        return int(period[:-1])
+    if period.endswith("y"):
+        return 365 * int(period[:-1])
+    return 10 ** 6
+
+def _ns(index: pd.Index) -> np.ndarray:
+    """Timestamps as int64 nanoseconds (UTC for tz-aware indexes)."""
+    return pd.DatetimeIndex(index).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+class IntrabarResolver:
+    """
+    Resolves ambiguous bars of the trade simulation with lower-timeframe bars.
+    A bar is ambiguous when its High moves the trailing stop and its Low
+    crosses the new stop: the bar alone cannot tell which came first. Only
+    those bars are replayed on their sub-bars; a searchsorted index maps
+    every simulated bar to its sub-bar range once per run, so unambiguous
+    bars cost nothing.
+    """
+
+    def __init__(self, sub_bars: pd.DataFrame):
+        sub_bars = sub_bars.sort_index()
+        self.ts = _ns(sub_bars.index)
+        self.high = sub_bars['High'].to_numpy(dtype=float)
+        self.low = sub_bars['Low'].to_numpy(dtype=float)
+        self.resolved = 0
+        self.unresolved = 0
+
+    @classmethod
+    def from_storage(cls, ticker: str, interval: str = "15m", source: str = "auto", period: str = "2y", storage: Optional[LocalStorage] = None, refresh: bool = False, until: Optional[pd.Timestamp] = None) -> "IntrabarResolver":
+        """
+        Lower-timeframe bars from the local parquet cache. Fetched on first use,
+        and again when the cache ends before `until` (e.g. the last test bar):
+        the new bars are merged into the cache, so it grows past the provider's
+        history limit over successive runs.
+        period: Clamped to what Yahoo serves for intraday intervals (~60 days of 15m, 7 days of 1m).
+        """
+        storage = storage or LocalStorage()
+        filename = f"{ticker}_{interval}.parquet"
+        cached = pd.DataFrame() if refresh else storage.load(filename)
+        df = cached
+        if cached.empty or (until is not None and _ns(cached.index[-1:])[0] < _ns(pd.DatetimeIndex([until]))[0]):
+            if DataProviderFactory.resolve_source(ticker, source) == "yahoo" and _period_days(period) > YAHOO_MAX_DAYS.get(interval, 10 ** 6):
+                period = f"{YAHOO_MAX_DAYS[interval]}d"
+            fresh = DataProviderFactory.get_provider(ticker, source).fetch_data(period=period, interval=interval)
+            if not fresh.empty:
+                same_tz = str(getattr(cached.index, "tz", None)) == str(getattr(fresh.index, "tz", None))
+                df = pd.concat([cached, fresh]) if not cached.empty and same_tz else fresh
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                storage.save(df, filename)
+            elif cached.empty:
+                raise ValueError(f"No {interval} data for {ticker} (period {period})")
+            else:
+                print(f"[!] No new {interval} bars for {ticker}: using the cache up to {cached.index[-1]}")
+        print(f"[i] {interval} sub-bars: {df.index[0]} -> {df.index[-1]} ({len(df)} bars)")
+        return cls(df)
+
+    def spans(self, bar_index: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (start, end) sub-bar positions of every bar: sub-bars in [bar open, next bar open).
+        The bar duration is the median spacing of the index (gaps such as weekends ignored).
+        """
+        bar_ts = _ns(bar_index)
+        duration = int(np.median(np.diff(bar_ts))) if len(bar_ts) > 1 else 0
+        return np.searchsorted(self.ts, bar_ts, side='left'), np.searchsorted(self.ts, bar_ts + duration, side='left')
+
+    def walk(self, start: int, end: int, side: int, sl: float, extreme: float, trail: float):
+        """
+        Replays one ambiguous bar on its sub-bars (stop checked before the
+        trailing update inside each sub-bar: conservative).
+        Returns (exit_price or None, sl, extreme), or None if no sub-bars are available.
+        """
+        if end <= start:
+            self.unresolved += 1
+            return None
+        self.resolved += 1
+        for h, l in zip(self.high[start:end], self.low[start:end]):
+            if side == 1:
+                if l <= sl:
+                    return sl, sl, extreme
+                if h > extreme:
+                    extreme = h
+                    sl = max(sl, extreme - trail)
+            else:
+                if h >= sl:
+                    return sl, sl, extreme
+                if l < extreme:
+                    extreme = l
+                    sl = min(sl, extreme + trail)
+        return None, sl, extreme
@@ -0,0 +1,93 @@
+import os
+import glob
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+# Verbosity levels of the simulations
+QUIET = 0    # Nothing printed
+SUMMARY = 1  # Fold reports and aggregated skip counters
+TRADES = 2   # + one line per trade
+DEBUG = 3    # + one line per skipped signal
+
+def verbosity_level(verbose) -> int:
+    """Maps the legacy boolean 'verbose' flag to a level (True = DEBUG, False = QUIET)."""
+    if isinstance(verbose, bool):
+        return DEBUG if verbose else QUIET
+    return int(verbose)
+
+class TradeLedger:
+    """
+    Structured record of the trades and skipped signals of a simulation.
+    Skip reasons are always counted; rows are only buffered when the ledger
+    has a directory, and written there in parquet batches
+    (trades-00000.parquet, skips-00000.parquet, ...).
+    Lines are formatted and printed only at the matching verbosity level,
+    so a quiet run does no per-bar string formatting.
+    """
+
+    KINDS = ("trades", "skips")
+
+    def __init__(self, directory: Optional[str] = None, verbosity: int = SUMMARY, batch_size: int = 10000):
+        self.directory = directory
+        self.verbosity = verbosity
+        self.batch_size = batch_size
+        self.counts: Dict[str, int] = {}
+        self.context: Dict[str, Any] = {}
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in self.KINDS}
+        self._parts: Dict[str, int] = {kind: 0 for kind in self.KINDS}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def bind(self, **context):
+        """Constant columns (e.g. ticker, fold) added to the following rows."""
+        self.flush()
+        self.context = context
+
+    def skip(self, reason: str, ts, signal: int, value: float, limit: float):
+        """Records a signal removed by a filter (value compared against limit)."""
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+        if self.directory:
+            self._append("skips", {"Date": ts, "Reason": reason, "Signal": signal, "Value": value, "Limit": limit})
+        if self.verbosity >= DEBUG:
+            print(f"  [~] Skipped signal {signal} at {ts} ({reason}: {value:.2f} vs {limit:.2f})")
+
+    def trade(self, trade: Dict[str, Any]):
+        """Records a closed trade (the simulator's trade dict)."""
+        if self.directory:
+            self._append("trades", trade)
+        if self.verbosity >= TRADES:
+            print(f"  [Trade] {trade['Type']} @ {trade['Entry']:.2f} -> {trade['Outcome']} ({trade['PnL']:+.2f}) Balance: {trade['Balance']:.2f}")
+
+    def _append(self, kind: str, row: Dict[str, Any]):
+        buffer = self._buffers[kind]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._write(kind)
+
+    def _write(self, kind: str):
+        buffer = self._buffers[kind]
+        if not buffer or not self.directory:
+            return
+        df = pd.DataFrame(buffer)
+        for col, value in self.context.items():
+            df[col] = value
+        df.to_parquet(os.path.join(self.directory, f"{kind}-{self._parts[kind]:05d}.parquet"), engine='pyarrow', index=False)
+        self._parts[kind] += 1
+        buffer.clear()
+
+    def flush(self):
+        """Writes the buffered rows of every kind."""
+        for kind in self.KINDS:
+            self._write(kind)
+
+    def print_counts(self):
+        if self.counts and self.verbosity >= SUMMARY:
+            print(f"[i] Skipped signals: {', '.join(f'{k}={v}' for k, v in sorted(self.counts.items()))}")
+
+    @staticmethod
+    def read(directory: str, kind: str = "trades") -> pd.DataFrame:
+        """Concatenates the parquet batches of one kind."""
+        files = sorted(glob.glob(os.path.join(directory, f"{kind}-*.parquet")))
+        if not files:
+            return pd.DataFrame()
+        return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
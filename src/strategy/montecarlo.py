@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.strategy import analytics
+
+class MonteCarloSimulator:
+    """
+    Trade-sequence Monte Carlo on a backtest ledger.
+    Trades are expressed as R-multiples (PnL / initial risk) and replayed with
+    fixed-fraction sizing at `risk_pct`, so robustness can be assessed for any
+    risk level. All simulations of a chunk are computed at once as a
+    (simulations x trades) matrix.
+
+    Methods:
+    - 'bootstrap': trades drawn with replacement (iid).
+    - 'shuffle': same trades, random order (final balance fixed, path varies).
+    - 'block': moving-block bootstrap, keeps streaks / serial correlation.
+    """
+
+    METHODS = ("bootstrap", "shuffle", "block")
+    # Profit factor of a simulation without any losing trade (infinite): capped so percentiles stay finite
+    MAX_PROFIT_FACTOR = 100.0
+
+    def __init__(self, n_sims: int = 20000, method: str = "bootstrap", block_size: int = 5, ruin_drawdown: float = 0.5, seed: Optional[int] = 42, chunk_size: int = 5000):
+        """
+        ruin_drawdown: Equity loss from the initial capital counted as ruin (0.5 = -50%).
+        chunk_size: Simulations per vectorized chunk (bounds memory).
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method} (expected one of {self.METHODS})")
+        self.n_sims = n_sims
+        self.method = method
+        self.block_size = block_size
+        self.ruin_drawdown = ruin_drawdown
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def r_multiples(trades: List[Dict[str, Any]]) -> np.ndarray:
+        return np.array([t['R'] for t in trades], dtype=float)
+
+    def _sample(self, n_sims: int, n_trades: int) -> np.ndarray:
+        """(n_sims, n_trades) matrix of trade indices."""
+        if self.method == "shuffle":
+            return self.rng.permuted(np.tile(np.arange(n_trades), (n_sims, 1)), axis=1)
+        if self.method == "block":
+            b = max(1, min(self.block_size, n_trades))
+            n_blocks = -(-n_trades // b)
+            starts = self.rng.integers(0, n_trades - b + 1, size=(n_sims, n_blocks))
+            return (starts[:, :, None] + np.arange(b)).reshape(n_sims, -1)[:, :n_trades]
+        return self.rng.integers(0, n_trades, size=(n_sims, n_trades))
+
+    def run(self, r: Sequence[float], initial_capital: float = 10000.0, risk_pct: float = 0.02) -> Dict[str, Any]:
+        r = np.asarray(r, dtype=float)
+        if len(r) == 0:
+            return {}
+
+        finals, drawdowns, profit_factors, ruined, no_loss = [], [], [], [], []
+        for start in range(0, self.n_sims, self.chunk_size):
+            n = min(self.chunk_size, self.n_sims - start)
+            R = r[self._sample(n, len(r))]
+
+            # Fixed-fraction compounding: each trade risks risk_pct of current equity
+            growth = np.maximum(1.0 + risk_pct * R, 0.0)
+            equity = initial_capital * np.cumprod(growth, axis=1)
+            equity = np.concatenate([np.full((n, 1), initial_capital), equity], axis=1)
+
+            mdd, _ = analytics.max_drawdown(np.maximum(equity, 1e-12))
+            gains = np.where(R > 0, R, 0.0).sum(axis=1)
+            losses = -np.where(R <= 0, R, 0.0).sum(axis=1)
+
+            finals.append(equity[:, -1])
+            drawdowns.append(mdd)
+            pf = np.where(losses > 0, gains / np.where(losses > 0, losses, 1.0), np.inf)
+            profit_factors.append(np.minimum(pf, self.MAX_PROFIT_FACTOR))
+            no_loss.append(losses == 0)
+            ruined.append((equity.min(axis=1) <= initial_capital * (1 - self.ruin_drawdown)))
+
+        finals, drawdowns = np.concatenate(finals), np.concatenate(drawdowns) * 100
+        profit_factors, ruined, no_loss = np.concatenate(profit_factors), np.concatenate(ruined), np.concatenate(no_loss)
+        q = [5, 50, 95]
+        return {
+            "n_trades": len(r),
+            "n_sims": self.n_sims,
+            "method": self.method,
+            "risk_pct": risk_pct,
+            "final_balance": dict(zip(("p5", "p50", "p95"), np.percentile(finals, q))),
+            "max_drawdown": dict(zip(("p5", "p50", "p95"), np.percentile(drawdowns, q))),
+            "profit_factor": dict(zip(("p5", "p50", "p95"), np.percentile(profit_factors, q))),
+            "no_loss_share": float(no_loss.mean()),
+            "prob_loss": float((finals < initial_capital).mean()),
+            "prob_ruin": float(ruined.mean()),
+        }
+
+    @staticmethod
+    def print_report(result: Dict[str, Any], initial_capital: float):
+        if not result:
+            print("[!] Monte Carlo skipped: No trades.")
+            return
+        fb, dd = result['final_balance'], result['max_drawdown']
+        pf = {k: (f"{v:.2f}" if v < MonteCarloSimulator.MAX_PROFIT_FACTOR else f">={v:.0f}") for k, v in result['profit_factor'].items()}
+        print("\n" + "═"*45)
+        print(f"🎲 MONTE CARLO ({result['n_sims']} x {result['n_trades']} trades, {result['method']}, risk {result['risk_pct']*100:.1f}%)")
+        print(f"Final Balance 90% CI : ${fb['p5']:,.2f} .. ${fb['p95']:,.2f} (median ${fb['p50']:,.2f}, start ${initial_capital:,.2f})")
+        print(f"Max Drawdown 90% CI  : {dd['p5']:.2f}% .. {dd['p95']:.2f}% (median {dd['p50']:.2f}%)")
+        print(f"Profit Factor 90% CI : {pf['p5']} .. {pf['p95']} (median {pf['p50']}, {result['no_loss_share']:.2%} of runs without a loss)")
+        print(f"P(Loss)              : {result['prob_loss']:.2%}")
+        print(f"P(Ruin)              : {result['prob_ruin']:.2%}")
+        print("═"*45 + "\n")
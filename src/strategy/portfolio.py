@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from src.strategy import analytics
+from src.strategy.risk import RiskManager
+from src.strategy.simulator import TradeSimulator
+
+class PortfolioBacktester:
+    """
+    Event-driven backtest of many symbols sharing one account.
+    The bar timelines of every symbol are merged into a single chronological
+    event stream (heapq.merge over per-symbol iterators, no global sort).
+    At most one position per symbol; entries are sized on current equity and
+    capped by the number of open positions, gross exposure and margin.
+    Exit rules match TradeSimulator (2x ATR initial stop, 3x ATR trailing, time exit).
+    """
+
+    def __init__(self, initial_capital: float = 100000.0, risk_pct: float = 0.01, max_positions: int = 10, max_exposure: float = 1.0, leverage: float = 1.0, threshold: float = 0.65, adx_threshold: int = 0, trend_filter: bool = False, stop_mult: float = 2.0, trail_mult: float = 3.0, max_hold: int = TradeSimulator.MAX_HOLD - 1, verbose: bool = False):
+        """
+        max_exposure: Gross notional of open positions, as a multiple of equity.
+        leverage: Margin requirement is notional / leverage, taken from free equity.
+        max_hold: Bars before a time exit (same window as TradeSimulator).
+        """
+        self.capital = initial_capital
+        self.risk_pct = risk_pct
+        self.max_positions = max_positions
+        self.max_exposure = max_exposure
+        self.leverage = leverage
+        self.stop_mult = stop_mult
+        self.trail_mult = trail_mult
+        self.max_hold = max_hold
+        self.verbose = verbose
+        self.gate = TradeSimulator("PORTFOLIO", threshold=threshold, adx_threshold=adx_threshold, trend_filter=trend_filter, verbose=False)
+
+        self.trades: List[Dict[str, Any]] = []
+        self.equity = pd.Series(dtype=float)
+        self.skipped: Dict[str, int] = {}
+
+    def _prepare(self, symbol: str, df: pd.DataFrame, predictions: np.ndarray, confidences: np.ndarray) -> Dict[str, np.ndarray]:
+        close = df['Close'].to_numpy(dtype=float)
+        atr = RiskManager.atr_values(df)
+        return {
+            "symbol": symbol,
+            "ts": df.index.to_numpy(dtype='datetime64[ns]').astype(np.int64),
+            "high": df['High'].to_numpy(dtype=float),
+            "low": df['Low'].to_numpy(dtype=float),
+            "close": close,
+            "atr": atr,
+            "signal": self.gate.filter_signals(df, predictions, confidences)
+        }
+
+    def _skip(self, reason: str):
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def run(self, signals: Dict[str, Tuple[pd.DataFrame, np.ndarray, np.ndarray]]) -> Dict[str, Any]:
+        """
+        signals: symbol -> (bars with OHLC / ATR / filter columns, predictions, confidences).
+        Returns the portfolio report; trades and the equity curve are kept on the instance.
+        """
+        books = [self._prepare(sym, *signals[sym]) for sym in sorted(signals)]
+        self.trades, self.skipped = [], {}
+
+        cash = self.capital
+        positions: Dict[int, Dict[str, Any]] = {}
+        unrealized = 0.0
+        gross = 0.0 # Notional of open positions at entry
+        max_concurrent, max_gross_ratio, exposed_events = 0, 0.0, 0
+        equity_ts, equity_val = [], []
+        last_ts = None
+
+        # One chronological stream of (timestamp, symbol index, bar index)
+        events = heapq.merge(*(zip(b['ts'], itertools.repeat(k), range(len(b['ts']))) for k, b in enumerate(books)))
+
+        for ts, k, i in events:
+            if ts != last_ts:
+                if last_ts is not None:
+                    equity_ts.append(last_ts)
+                    equity_val.append(cash + unrealized)
+                    exposed_events += bool(positions)
+                last_ts = ts
+            book = books[k]
+            high, low, close = book['high'][i], book['low'][i], book['close'][i]
+
+            # 1. Manage the open position of this symbol on the new bar
+            pos = positions.get(k)
+            if pos is not None:
+                pos['bars'] += 1
+                side = pos['side']
+                exit_price, outcome = None, None
+                if side == 1:
+                    if high > pos['extreme']:
+                        pos['extreme'] = high
+                        pos['sl'] = max(pos['sl'], high - self.trail_mult * pos['atr'])
+                    if low <= pos['sl']:
+                        exit_price, outcome = pos['sl'], "Trailing SL Hit 💰" if pos['sl'] > pos['entry'] else "SL Hit ❌"
+                else:
+                    if low < pos['extreme']:
+                        pos['extreme'] = low
+                        pos['sl'] = min(pos['sl'], low + self.trail_mult * pos['atr'])
+                    if high >= pos['sl']:
+                        exit_price, outcome = pos['sl'], "Trailing SL Hit 💰" if pos['sl'] < pos['entry'] else "SL Hit ❌"
+                if exit_price is None and (pos['bars'] >= self.max_hold or i == len(book['ts']) - 1):
+                    exit_price, outcome = close, "Time Exit ⏱️" if pos['bars'] >= self.max_hold else "End of Data"
+
+                mark = exit_price if exit_price is not None else close
+                pnl = pos['qty'] * (mark - pos['entry']) * side
+                unrealized += pnl - pos['pnl']
+                pos['pnl'] = pnl
+                if exit_price is not None:
+                    cash += pnl
+                    unrealized -= pnl
+                    gross -= pos['notional']
+                    del positions[k]
+                    self.trades.append({
+                        "Symbol": book['symbol'], "Type": "LONG" if side == 1 else "SHORT",
+                        "Entry_Date": pd.Timestamp(pos['ts']), "Exit_Date": pd.Timestamp(ts),
+                        "Entry": pos['entry'], "Exit": exit_price, "Qty": pos['qty'],
+                        "Outcome": outcome, "PnL": round(pnl, 2), "Bars": pos['bars']
+                    })
+                    if self.verbose:
+                        print(f"  [Exit] {book['symbol']} {outcome} ({pnl:+.2f}) Equity: {cash + unrealized:.2f}")
+                    continue # No re-entry on the exit bar
+
+            # 2. New entry on this symbol
+            signal = book['signal'][i]
+            if signal == 0 or k in positions or i >= len(book['ts']) - 1:
+                continue
+            if len(positions) >= self.max_positions:
+                self._skip("max_positions")
+                continue
+
+            equity = cash + unrealized
+            risk_per_unit = self.stop_mult * book['atr'][i]
+            qty = equity * self.risk_pct / risk_per_unit
+            used_margin = gross / self.leverage
+            room = min(self.max_exposure * equity - gross, (equity - used_margin) * self.leverage)
+            if room <= 0:
+                self._skip("exposure" if self.max_exposure * equity - gross <= 0 else "margin")
+                continue
+            if qty * close > room:
+                qty = room / close # Scale down to the available exposure / margin
+
+            side = 1 if signal == 1 else -1
+            positions[k] = {
+                "side": side, "entry": close, "qty": qty, "notional": qty * close,
+                "sl": close - side * risk_per_unit, "atr": book['atr'][i], "extreme": close,
+                "bars": 0, "pnl": 0.0, "ts": ts
+            }
+            gross += qty * close
+            max_concurrent = max(max_concurrent, len(positions))
+            max_gross_ratio = max(max_gross_ratio, gross / equity if equity > 0 else 0.0)
+            if self.verbose:
+                print(f"  [Entry] {book['symbol']} {'LONG' if side == 1 else 'SHORT'} @ {close:.2f} x {qty:.4f} | Open: {len(positions)}")
+
+        if last_ts is not None:
+            equity_ts.append(last_ts)
+            equity_val.append(cash + unrealized)
+            exposed_events += bool(positions)
+
+        self.equity = pd.Series(equity_val, index=pd.to_datetime(np.asarray(equity_ts, dtype=np.int64)), name="Equity")
+        return self.report(max_concurrent, max_gross_ratio, exposed_events)
+
+    def report(self, max_concurrent: int = 0, max_gross_ratio: float = 0.0, exposed_events: int = 0) -> Dict[str, Any]:
+        equity = self.equity if len(self.equity) else pd.Series([self.capital], dtype=float)
+        stats = analytics.summary(pd.concat([pd.Series([self.capital]), equity.reset_index(drop=True)]), periods_per_year=analytics.infer_periods_per_year(equity.index) if len(self.equity) > 1 else 252.0)
+
+        pnl = np.array([t['PnL'] for t in self.trades], dtype=float)
+        wins, losses = pnl[pnl > 0], pnl[pnl <= 0]
+        total_loss = abs(losses.sum())
+        metrics = {
+            "final_balance": float(equity.iloc[-1]),
+            "return_pct": stats['total_return_pct'],
+            "total_trades": len(pnl),
+            "win_rate": len(wins) / len(pnl) * 100 if len(pnl) else 0.0,
+            "profit_factor": wins.sum() / total_loss if total_loss > 0 else (float('inf') if len(wins) else 0.0),
+            "max_drawdown": stats['max_drawdown_pct'],
+            "max_drawdown_duration": stats['max_drawdown_duration'],
+            "sharpe": stats['sharpe'],
+            "sortino": stats['sortino'],
+            "calmar": stats['calmar'],
+            "max_concurrent": max_concurrent,
+            "max_gross_exposure": max_gross_ratio,
+            "time_in_market_pct": exposed_events / len(self.equity) * 100 if len(self.equity) else 0.0,
+            "skipped": dict(self.skipped)
+        }
+        return metrics
@@ -9,48 +9,61 @@ class RiskManager:
         self.rr_ratio = rr_ratio
         self.atr_multiplier = atr_multiplier
 
+    ATR_COLUMNS = ('ATR_14', 'ATR_20', 'ATR')
+
+    @classmethod
+    def atr_values(cls, df: pd.DataFrame) -> np.ndarray:
+        """
+        ATR of every row from the first available ATR feature column.
+        Invalid values (missing column, NaN, <= 0) fall back to 2% of the close.
+        """
+        close = df['Close'].to_numpy(dtype=float)
+        col = next((c for c in cls.ATR_COLUMNS if c in df.columns), None)
+        atr = df[col].to_numpy(dtype=float) if col else np.full(len(df), np.nan)
+        return np.where(np.isnan(atr) | (atr <= 0), close * 0.02, atr)
+
+    def plan_batch(self, entries: np.ndarray, predictions: np.ndarray, atr: np.ndarray, balance=None, risk_pct: float = 0.02) -> Dict[str, np.ndarray]:
+        """
+        Vectorized trading plans: one SL / TP / risk per share (and position
+        size if a balance is given) for every (entry, prediction, ATR) row.
+        predictions: 1 = LONG, 2 = SHORT, anything else = WAIT (all zeros).
+        balance: scalar or per-row account balance used for the position size.
+        """
+        entries = np.asarray(entries, dtype=float)
+        predictions = np.asarray(predictions)
+        atr = np.asarray(atr, dtype=float)
+        # +1 LONG, -1 SHORT, 0 WAIT
+        side = np.where(predictions == 1, 1.0, np.where(predictions == 2, -1.0, 0.0))
+
+        risk = np.abs(side) * atr * self.atr_multiplier
+        stop_loss = np.where(side != 0, entries - side * risk, 0.0)
+        take_profit = np.where(side != 0, entries + side * risk * self.rr_ratio, 0.0)
+        plan = {"side": side, "sl": stop_loss, "tp": take_profit, "risk": risk}
+        if balance is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                plan["qty"] = np.where(risk > 0, np.asarray(balance, dtype=float) * risk_pct / risk, 0.0)
+        return plan
+
     def generate_scenario(self, ticker: str, current_price: float, prediction: int, df: pd.DataFrame) -> Dict[str, Any]:
         """Generates a trading plan based on prediction and volatility."""
         
-        # Get latest ATR
-        # Get latest ATR
-        if 'ATR_14' in df.columns:
-             atr = df['ATR_14'].iloc[-1]
-        elif 'ATR_20' in df.columns:
-             atr = df['ATR_20'].iloc[-1]
-        elif 'ATR' in df.columns:
-             atr = df['ATR'].iloc[-1]
-        else:
-             atr = 0.0 # Will trigger fallback below
-        
-        # Fallback if ATR is invalid
-        if np.isnan(atr) or atr <= 0:
-            atr = current_price * 0.02
+        # Latest ATR (2% of the price if unavailable)
+        atr = self.atr_values(df.iloc[-1:].assign(Close=current_price))
+        plan = self.plan_batch(np.array([current_price]), np.array([prediction]), atr)
 
         if prediction == 1:  # LONG
             direction = "LONG 🚀"
-            stop_loss = current_price - (atr * self.atr_multiplier)
-            risk = current_price - stop_loss
-            take_profit = current_price + (risk * self.rr_ratio)
-            
         elif prediction == 2:  # SHORT
             direction = "SHORT 📉"
-            stop_loss = current_price + (atr * self.atr_multiplier)
-            risk = stop_loss - current_price
-            take_profit = current_price - (risk * self.rr_ratio)
-            
         else: # NEUTRAL / WAIT
             direction = "WAIT ⏳"
-            stop_loss = 0.0
-            take_profit = 0.0
-            risk = 0.0
 
         return {
             "ticker": ticker,
             "direction": direction,
             "entry": round(current_price, 2),
-            "sl": round(stop_loss, 2),
-            "tp": round(take_profit, 2),
-            "risk_amount": round(risk, 2),
+            "sl": round(float(plan['sl'][0]), 2),
+            "tp": round(float(plan['tp'][0]), 2),
+            "risk_amount": round(float(plan['risk'][0]), 2),
             "rr_ratio": self.rr_ratio
         }
@@ -0,0 +1,298 @@
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, List, Optional, Union
+
+from src.strategy import analytics
+from src.strategy.ledger import SUMMARY, TradeLedger, verbosity_level
+from src.strategy.risk import RiskManager
+
+class TradeSimulator:
+    """
+    Replays precomputed model signals over a test window.
+    Applies the backtest filters (ADX, EMA 200 trend, RSI momentum, confidence)
+    and the exit rules (3x ATR trailing stop, 50 bars time exit).
+    """
+
+    HORIZON_BUFFER = 8
+    MAX_HOLD = 50
+
+    def __init__(self, ticker: str, initial_capital: float = 10000.0, threshold: float = 0.65, risk_pct: float = 0.02, adx_threshold: int = 0, trend_filter: bool = False, verbose: Union[bool, int] = True, resolver=None, ledger: Optional[TradeLedger] = None):
+        """
+        verbose: bool or verbosity level (strategy/ledger.py: QUIET, SUMMARY, TRADES, DEBUG).
+        resolver: optional IntrabarResolver (strategy/fills.py) for ambiguous bars.
+        ledger: shared TradeLedger (e.g. across folds); an in-memory one by default.
+        """
+        self.ticker = ticker
+        self.capital = initial_capital
+        self.balance = initial_capital
+        self.threshold = threshold
+        self.risk_pct = risk_pct
+        self.adx_threshold = adx_threshold
+        self.trend_filter = trend_filter
+        self.verbosity = verbosity_level(verbose)
+        self.verbose = self.verbosity >= SUMMARY
+        self.ledger = ledger or TradeLedger(verbosity=self.verbosity)
+        self.trades: List[Dict[str, Any]] = []
+        self.rm = RiskManager(rr_ratio=2.0, atr_multiplier=2.0)
+        self.resolver = resolver
+
+    @staticmethod
+    def _first_col(df: pd.DataFrame, pattern: str):
+        cols = [c for c in df.columns if pattern in c]
+        return cols[0] if cols else None
+
+    @staticmethod
+    def required_columns(df: pd.DataFrame) -> List[str]:
+        """
+        Columns the simulation reads, in their original order.
+        Lets callers ship a slim frame to worker processes while keeping
+        the same column discovery as on the full feature frame.
+        """
+        wanted = {'Open', 'High', 'Low', 'Close', 'ATR_14', 'ATR_20', 'ATR'}
+        for pattern in ['ADX', 'EMA_200', 'RSI_14']:
+            col = TradeSimulator._first_col(df, pattern)
+            if col:
+                wanted.add(col)
+        return [c for c in df.columns if c in wanted]
+
+    def filter_signals(self, test_df: pd.DataFrame, predictions: np.ndarray, confidences: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of the entry filters of run() (ADX, EMA 200 trend,
+        RSI momentum, confidence). Returns the predictions with filtered
+        signals set to 0 (Wait).
+        """
+        signals = np.asarray(predictions, dtype=int).copy()
+        close = test_df['Close'].to_numpy(dtype=float)
+
+        adx_col = self._first_col(test_df, 'ADX')
+        if self.adx_threshold > 0 and adx_col:
+            signals[test_df[adx_col].to_numpy(dtype=float) < self.adx_threshold] = 0
+
+        ema_col = self._first_col(test_df, 'EMA_200')
+        if self.trend_filter and ema_col:
+            ema = test_df[ema_col].to_numpy(dtype=float)
+            signals[(signals == 1) & (close < ema)] = 0
+            signals[(signals == 2) & (close > ema)] = 0
+
+        rsi_col = self._first_col(test_df, 'RSI_14')
+        if rsi_col:
+            rsi = test_df[rsi_col].to_numpy(dtype=float)
+            signals[(signals == 1) & (rsi <= 50)] = 0
+            signals[(signals == 2) & (rsi >= 50)] = 0
+
+        signals[np.asarray(confidences, dtype=float) < self.threshold] = 0
+        return signals
+
+    def run(self, test_df: pd.DataFrame, predictions: np.ndarray, confidences: np.ndarray) -> Dict[str, Any]:
+        """Runs the simulation on a test set given per-row predictions and confidences."""
+        self.balance = self.capital
+        self.trades = []
+        ledger = self.ledger
+
+        adx_col = self._first_col(test_df, 'ADX')
+        ema_col = self._first_col(test_df, 'EMA_200')
+        rsi_col = self._first_col(test_df, 'RSI_14')
+
+        close = test_df['Close'].to_numpy(dtype=float)
+        high = test_df['High'].to_numpy(dtype=float)
+        low = test_df['Low'].to_numpy(dtype=float)
+        adx = test_df[adx_col].to_numpy(dtype=float) if adx_col else None
+        ema = test_df[ema_col].to_numpy(dtype=float) if ema_col else None
+        rsi_arr = test_df[rsi_col].to_numpy(dtype=float) if rsi_col else None
+        # Stops and risk per share of every row in one call; trailing uses the feature ATR
+        atr = RiskManager.atr_values(test_df)
+        plan = self.rm.plan_batch(close, predictions, atr)
+        # Sub-bar ranges of every bar, computed once (intrabar resolution)
+        starts, ends = self.resolver.spans(test_df.index) if self.resolver is not None else (None, None)
+
+        for i in range(len(test_df) - self.HORIZON_BUFFER):
+            current_idx = test_df.index[i]
+            prediction = int(predictions[i])
+            confidence = float(confidences[i])
+            rsi = rsi_arr[i] if rsi_arr is not None else np.nan
+
+            # ADX FILTER (Regime Filter)
+            if self.adx_threshold > 0 and adx is not None:
+                adx_val = adx[i]
+                if adx_val < self.adx_threshold and prediction != 0:
+                    ledger.skip("adx", current_idx, prediction, adx_val, self.adx_threshold)
+                    prediction = 0
+
+            # TREND FILTER (EMA 200)
+            if self.trend_filter and ema is not None:
+                ema_val = ema[i]
+                price = close[i]
+                if not np.isnan(ema_val):
+                    if (prediction == 1 and price < ema_val) or (prediction == 2 and price > ema_val):
+                        ledger.skip("trend", current_idx, prediction, price, ema_val)
+                        prediction = 0
+
+            # RSI MOMENTUM FILTER (Sniper Mode)
+            # LONG needs momentum (RSI > 50), SHORT needs momentum (RSI < 50)
+            if rsi_arr is not None:
+                if (prediction == 1 and rsi <= 50) or (prediction == 2 and rsi >= 50):
+                    ledger.skip("rsi", current_idx, prediction, rsi, 50.0)
+                    prediction = 0
+
+            # CONFIDENCE FILTER
+            if confidence < self.threshold and prediction != 0:
+                ledger.skip("confidence", current_idx, prediction, confidence, self.threshold)
+                prediction = 0 # Force Wait
+
+            if prediction == 0:
+                continue
+
+            if prediction == 2 and rsi >= 55:
+                continue
+
+            price = close[i]
+            direction = "LONG" if prediction == 1 else "SHORT"
+
+            initial_sl = plan['sl'][i]
+            risk_per_share = plan['risk'][i]
+
+            if risk_per_share <= 0:
+                ledger.skip("risk", current_idx, prediction, risk_per_share, 0.0)
+                continue
+
+            atr_val = atr[i]
+            qty = (self.balance * self.risk_pct) / risk_per_share
+
+            window = slice(i + 1, i + self.MAX_HOLD)
+            spans = (starts[window], ends[window]) if starts is not None else (None, None)
+            outcome, exit_price = self._walk_exit(prediction, price, initial_sl, atr_val, high[window], low[window], close[window], *spans)
+
+            if prediction == 1:
+                pnl = qty * (exit_price - price)
+            else:
+                pnl = qty * (price - exit_price)
+
+            # Update Wallet
+            self.balance += pnl
+            trade = {
+                "Date": current_idx,
+                "Type": direction,
+                "Entry": price,
+                "Outcome": outcome,
+                "PnL": round(pnl, 2),
+                "R": pnl / (qty * risk_per_share), # Result in multiples of the initial risk
+                "Balance": round(self.balance, 2)
+            }
+            self.trades.append(trade)
+            ledger.trade(trade)
+
+        ledger.flush()
+        return self.report()
+
+    def _walk_exit(self, prediction: int, price: float, sl: float, atr_val: float, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, starts: np.ndarray = None, ends: np.ndarray = None):
+        """
+        Walks the future window bar by bar and returns (outcome, exit_price).
+        With an intrabar resolver (starts / ends = sub-bar ranges of the window),
+        bars where the trailing update and the stop hit are ambiguous are replayed
+        on their lower-timeframe sub-bars.
+        """
+        trail = 3.0 * atr_val # Trailing (3x ATR Width)
+        if prediction == 1:
+            max_price = price
+            for j, (current_high, current_low) in enumerate(zip(highs, lows)):
+                if self.resolver is not None and current_high > max_price and current_low <= max(sl, current_high - trail) and max(sl, current_high - trail) > sl:
+                    resolved = self.resolver.walk(starts[j], ends[j], 1, sl, max_price, trail)
+                    if resolved is not None:
+                        exit_price, sl, max_price = resolved
+                        if exit_price is not None:
+                            return ("Trailing SL Hit 💰" if sl > price else "SL Hit ❌"), exit_price
+                        continue
+
+                # Update Trailing (3x ATR Width)
+                if current_high > max_price:
+                    max_price = current_high
+                    new_sl = max_price - trail
+                    if new_sl > sl:
+                        sl = new_sl
+
+                # Check SL Hit
+                if current_low <= sl:
+                    outcome = "Trailing SL Hit 💰" if sl > price else "SL Hit ❌"
+                    return outcome, sl
+        else:
+            min_price = price
+            for j, (current_high, current_low) in enumerate(zip(highs, lows)):
+                if self.resolver is not None and current_low < min_price and current_high >= min(sl, current_low + trail) and min(sl, current_low + trail) < sl:
+                    resolved = self.resolver.walk(starts[j], ends[j], -1, sl, min_price, trail)
+                    if resolved is not None:
+                        exit_price, sl, min_price = resolved
+                        if exit_price is not None:
+                            return ("Trailing SL Hit 💰" if sl < price else "SL Hit ❌"), exit_price
+                        continue
+
+                # Update Trailing
+                if current_low < min_price:
+                    min_price = current_low
+                    new_sl = min_price + trail
+                    if new_sl < sl:
+                        sl = new_sl
+
+                # Check SL Hit
+                if current_high >= sl:
+                    outcome = "Trailing SL Hit 💰" if sl < price else "SL Hit ❌"
+                    return outcome, sl
+
+        # Time Exit
+        return "Time Exit ⏱️", closes[-1]
+
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough drop of the balance, in percent."""
+        if not self.trades:
+            return 0.0
+        balances = np.array([self.capital] + [t['Balance'] for t in self.trades])
+        mdd, _ = analytics.max_drawdown(balances)
+        return float(mdd * 100)
+
+    def report(self) -> Dict[str, Any]:
+        """Computes fold metrics and prints them when verbose."""
+        if not self.trades:
+            if self.verbose:
+                print("[!] No trades taken by the model.")
+            return {
+                "win_rate": 0.0,
+                "profit_factor": 0.0,
+                "max_drawdown": 0.0,
+                "final_balance": self.balance,
+                "total_trades": 0,
+                "sharpe_per_trade": 0.0
+            }
+
+        df_res = pd.DataFrame(self.trades)
+        wins = df_res[df_res['PnL'] > 0]
+        losses = df_res[df_res['PnL'] <= 0]
+
+        total_trades = len(df_res)
+        win_rate = (len(wins) / total_trades) * 100
+
+        # Safe Profit Factor
+        total_loss = abs(losses['PnL'].sum())
+        profit_factor = wins['PnL'].sum() / total_loss if total_loss > 0 else float('inf')
+        max_dd = self.max_drawdown()
+        # Per-trade Sharpe (not annualized: trades are not evenly spaced)
+        balances = np.array([self.capital] + [t['Balance'] for t in self.trades])
+        sharpe = float(analytics.sharpe_ratio(analytics.returns(balances), periods_per_year=1))
+
+        if self.verbose:
+            print("\n" + "═"*45)
+            print(f"📝 FOLD RESULTS")
+            print(f"Final Balance : ${self.balance:,.2f} ({((self.balance-self.capital)/self.capital)*100:+.2f}%)")
+            print(f"Total Trades  : {total_trades}")
+            print(f"Win Rate      : {win_rate:.2f}%")
+            print(f"Profit Factor : {profit_factor:.2f}")
+            print(f"Max Drawdown  : {max_dd:.2f}%")
+            print(f"Sharpe/Trade  : {sharpe:.2f}")
+            print("═"*45)
+
+        return {
+            "win_rate": win_rate,
+            "profit_factor": profit_factor,
+            "max_drawdown": max_dd,
+            "final_balance": self.balance,
+            "total_trades": total_trades,
+            "sharpe_per_trade": sharpe
+        }
@@ -0,0 +1,64 @@
+"""Vectorized analytics: known answers on 1-D curves and on runs x periods arrays."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.strategy import analytics
+
+NEVER_RECOVERS = [100.0, 120.0, 90.0, 80.0, 85.0] # Peak 120, trough 80, still underwater at the end
+RECOVERS = [100.0, 90.0, 110.0, 100.0, 120.0]
+
+def test_max_drawdown_and_duration_1d():
+    mdd, duration = analytics.max_drawdown(np.array(NEVER_RECOVERS))
+    assert mdd == pytest.approx(40 / 120) and duration == 3
+    mdd, duration = analytics.max_drawdown(np.array(RECOVERS))
+    assert mdd == pytest.approx(0.1) and duration == 1
+    mdd, duration = analytics.max_drawdown(np.array([100.0, 101.0, 102.0]))
+    assert mdd == 0 and duration == 0
+
+def test_max_drawdown_2d_matches_rows():
+    mdd, duration = analytics.max_drawdown(np.array([NEVER_RECOVERS, RECOVERS]))
+    np.testing.assert_allclose(mdd, [40 / 120, 0.1])
+    assert duration.tolist() == [3, 1]
+    # DataFrames hold one run per column
+    mdd_df, duration_df = analytics.max_drawdown(pd.DataFrame({"a": NEVER_RECOVERS, "b": RECOVERS}))
+    np.testing.assert_allclose(mdd_df, mdd)
+    assert duration_df.tolist() == [3, 1]
+
+def test_cagr():
+    assert analytics.cagr(np.array([100.0, 121.0]), periods_per_year=1) == pytest.approx(0.21)
+    np.testing.assert_allclose(analytics.cagr(np.array([[100.0, 110.0, 121.0], [100.0, 90.0, 81.0]]), periods_per_year=2), [0.21, -0.19])
+    assert analytics.cagr(np.array([100.0, 50.0, 0.0]), periods_per_year=2) == -1.0 # Wiped out
+
+def test_sortino_ratio():
+    # mean 0.005, downside deviation sqrt(0.01^2 / 2)
+    assert analytics.sortino_ratio(np.array([0.02, -0.01]), periods_per_year=1) == pytest.approx(0.005 / np.sqrt(0.0001 / 2))
+    np.testing.assert_allclose(analytics.sortino_ratio(np.array([[0.02, -0.01], [0.01, 0.02]]), periods_per_year=4), [2 * 0.005 / np.sqrt(0.0001 / 2), 0.0])
+
+def test_period_returns():
+    equity = pd.Series([100.0, 110.0, 99.0, 108.9], index=pd.to_datetime(["2024-01-01", "2024-01-31", "2024-02-29", "2024-03-31"]))
+    monthly = analytics.period_returns(equity, "M")
+    np.testing.assert_allclose(monthly.to_numpy(), [0.1, -0.1, 0.1])
+    assert analytics.period_returns(equity, "Y").iloc[0] == pytest.approx(0.089)
+
+def test_stack_curves_holds_short_runs_flat():
+    stacked = analytics.stack_curves([[1.0, 2.0, 3.0], [5.0], [4.0, 2.0]])
+    assert stacked.tolist() == [[1.0, 2.0, 3.0], [5.0, 5.0, 5.0], [4.0, 2.0, 2.0]]
+    _, duration = analytics.max_drawdown(stacked)
+    assert duration.tolist() == [0, 0, 2]
+
+def test_summary_1d_and_2d_agree():
+    one = analytics.summary(np.array(NEVER_RECOVERS), periods_per_year=4)
+    both = analytics.summary(np.array([NEVER_RECOVERS, RECOVERS]), periods_per_year=4)
+    assert one["max_drawdown_duration"] == 3 and isinstance(one["max_drawdown_duration"], int)
+    for key, value in one.items():
+        assert both[key][0] == pytest.approx(value)
+    assert one["total_return_pct"] == pytest.approx(-15.0)
+
+def test_simulator_max_drawdown_uses_the_balance_curve():
+    pytest.importorskip("pandas_ta")
+    from src.strategy.simulator import TradeSimulator
+    sim = TradeSimulator("T", initial_capital=100.0, verbose=False)
+    sim.trades = [{"Balance": b} for b in NEVER_RECOVERS[1:]]
+    assert sim.max_drawdown() == pytest.approx(100 * 40 / 120)
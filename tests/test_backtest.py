@@ -0,0 +1,72 @@
+"""BacktestPipeline warm-start folds on synthetic features (no data download)."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("xgboost")
+pytest.importorskip("sklearn")
+
+from src.pipelines import backtest
+from src.pipelines.backtest import BacktestPipeline
+
+def _frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n, freq="D")
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=[f"F_{i}" for i in range(4)], index=index)
+    df['Target'] = np.tile([0, 1, 2], n // 3 + 1)[:n]
+    return df
+
+@pytest.fixture
+def pipeline_factory(monkeypatch, tmp_path):
+    monkeypatch.setattr(backtest.DataProviderFactory, "get_provider", lambda ticker, source="auto": None)
+    monkeypatch.setattr(backtest.MarketPredictor, "DEFAULT_PARAMS", {"n_estimators": 20, "max_depth": 2})
+    def factory(**kwargs):
+        return BacktestPipeline("TEST", workers=1, run_root=str(tmp_path), **kwargs)
+    return factory
+
+def test_fold_fraction_allows_one_fold_of_new_rows():
+    splits = [(np.arange(100), None), (np.arange(200), None), (np.arange(300), None)]
+    assert BacktestPipeline.fold_fraction(splits) == pytest.approx(0.6)
+    assert BacktestPipeline.fold_fraction(splits[:1]) == 1.0
+
+def test_default_warm_start_updates_instead_of_refitting(pipeline_factory):
+    pipeline = pipeline_factory(warm_start=True, n_splits=3)
+    folds = pipeline.prepare(df=_frame(800))
+    assert [f['warm'] for f in folds] == ["train", "incremental", "incremental"]
+
+def test_all_refits_are_reported(pipeline_factory, capsys):
+    pipeline = pipeline_factory(warm_start=True, n_splits=3, refit_policy=backtest.RefitPolicy(max_new_fraction=0.1))
+    folds = pipeline.prepare(df=_frame(800))
+    assert [f['warm'] for f in folds] == ["train", "refit", "refit"]
+    assert "every fold fell back to a full refit" in capsys.readouterr().out
+
+def test_warm_chain_resumes_after_a_crash(pipeline_factory, monkeypatch):
+    df = _frame(800)
+    update = backtest.MarketPredictor.update
+    calls = []
+
+    def crash_on_fold_3(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt # Killed while training fold 3
+        return update(self, *args, **kwargs)
+
+    monkeypatch.setattr(backtest.MarketPredictor, "update", crash_on_fold_3)
+    with pytest.raises(KeyboardInterrupt):
+        pipeline_factory(warm_start=True, n_splits=3, checkpoint=True).prepare(df=df)
+    monkeypatch.setattr(backtest.MarketPredictor, "update", update)
+
+    trains = []
+    train = backtest.MarketPredictor.train
+    monkeypatch.setattr(backtest.MarketPredictor, "train", lambda self, *a, **k: trains.append(1) or train(self, *a, **k))
+    pipeline = pipeline_factory(warm_start=True, n_splits=3, checkpoint=True)
+    folds = pipeline.prepare(df=df)
+    assert trains == [] # Folds 1-2 come from the checkpoint, fold 3 continues from fold 2's model
+    assert [f['fold'] for f in folds] == [1, 2, 3]
+    assert folds[2]['warm'] == "incremental" and 'warm' not in folds[0]
+    assert all(len(f['fingerprint']) == 24 for f in folds)
+
+    # Complete chain: nothing retrained
+    rerun = pipeline_factory(warm_start=True, n_splits=3, checkpoint=True).prepare(df=df)
+    assert trains == [] and all('warm' not in f for f in rerun)
@@ -0,0 +1,30 @@
+"""RunCheckpoint: resumable cells and folds."""
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("dotenv")
+
+from src.pipelines.checkpoint import RunCheckpoint, config_hash
+
+def test_config_hash_is_order_independent():
+    assert config_hash({"a": 1, "b": [1, 2]}) == config_hash({"b": [1, 2], "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+def test_cells_survive_a_crash_mid_append(tmp_path):
+    ckpt = RunCheckpoint("sweep", {"ticker": "T"}, root=str(tmp_path))
+    ckpt.save_cell("a", {"profit_factor": 1.5})
+    with open(ckpt.path("cells.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"key": "b", "row": {"profit') # Killed mid-write
+
+    resumed = RunCheckpoint("sweep", {"ticker": "T"}, root=str(tmp_path))
+    resumed.save_cell("c", {"profit_factor": 0.8}) # Appended before any load
+    assert resumed.load_cells() == {"a": {"profit_factor": 1.5}, "c": {"profit_factor": 0.8}}
+
+def test_fold_roundtrip(tmp_path):
+    ckpt = RunCheckpoint("backtest", {"ticker": "T"}, root=str(tmp_path))
+    assert ckpt.load_fold(1, "abc") is None
+    ckpt.save_fold(1, "abc", np.array([0, 1, 2]), np.array([0.5, 0.6, 0.7]))
+    hit = ckpt.load_fold(1, "abc")
+    assert hit["predictions"].tolist() == [0, 1, 2]
+    assert ckpt.load_fold(1, "other") is None
@@ -0,0 +1,47 @@
+"""FeatureEngineer: the declared module outputs must match the columns the modules write."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+
+from src.features import engineering
+from src.features.engineering import FeatureEngineer, MODULE_OUTPUTS
+
+MODULES = {
+    'stats': engineering.stats.add_stats_features,
+    'momentum': engineering.momentum.add_momentum_features,
+    'trend': engineering.trend.add_trend_features,
+    'volatility': engineering.volatility.add_volatility_features,
+    'volume': engineering.volume.add_volume_features,
+}
+
+def _bars(n=400):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.002, n)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000, 5_000, n).astype(float),
+        'VIX': rng.uniform(10, 30, n),
+    }, index=pd.date_range("2024-01-01", periods=n, freq="D"))
+
+@pytest.mark.parametrize("name", sorted(MODULES))
+def test_module_outputs_match_written_columns(name):
+    df = _bars()
+    before = set(df.columns)
+    written = set(MODULES[name](df, prefix="").columns) - before
+    assert written == set(MODULE_OUTPUTS[name])
+
+def test_required_column_without_module_raises():
+    with pytest.raises(ValueError, match="EMA_13"):
+        FeatureEngineer(_bars(), required=['RSI_14', 'EMA_13_daily'])
+
+def test_known_required_columns_are_accepted():
+    df = _bars()
+    df['Taker_Buy_Vol'] = df['Volume'] / 2
+    required = ['RSI_14_weekly', 'OBV_SMA20', 'Recent_FVG_Bull', 'Body_Strength', 'OrderFlow_Pct', 'Taker_Buy_Vol', 'VIX']
+    fe = FeatureEngineer(df, required=required)
+    assert set(required) <= fe.required
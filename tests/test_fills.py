@@ -0,0 +1,79 @@
+"""IntrabarResolver: sub-bar spans, ambiguous bar replay and the sub-bar cache (no download)."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("dotenv")
+
+from src.strategy import fills
+from src.strategy.fills import IntrabarResolver
+from src.strategy.simulator import TradeSimulator
+
+def _sub_bars(day: str, bars):
+    """15m sub-bars (high, low) starting at 10:00 of a day."""
+    index = pd.date_range(f"{day} 10:00", periods=len(bars), freq="15min")
+    return pd.DataFrame(bars, columns=['High', 'Low'], index=index)
+
+def test_spans_map_each_bar_to_its_sub_bars():
+    days = pd.date_range("2024-01-01", periods=3, freq="D")
+    sub = pd.concat([_sub_bars("2024-01-01", [(1, 0)] * 4), _sub_bars("2024-01-03", [(1, 0)] * 2)])
+    starts, ends = IntrabarResolver(sub).spans(days)
+    assert starts.tolist() == [0, 4, 4]
+    assert ends.tolist() == [4, 4, 6] # 2024-01-02 has no sub-bars
+
+def test_walk_follows_the_sub_bar_order():
+    # Long from 100, stop 95, trail 3: the daily bar (high 106, low 94) moves the stop to 103 and crosses it
+    trail_first = IntrabarResolver(_sub_bars("2024-01-01", [(106, 101), (104, 94)]))
+    assert trail_first.walk(0, 2, 1, 95.0, 100.0, 3.0) == (103.0, 103.0, 106.0)
+    stop_first = IntrabarResolver(_sub_bars("2024-01-01", [(101, 94), (106, 100)]))
+    assert stop_first.walk(0, 2, 1, 95.0, 100.0, 3.0) == (95.0, 95.0, 100.0)
+    assert stop_first.walk(2, 2, 1, 95.0, 100.0, 3.0) is None
+    assert (stop_first.resolved, stop_first.unresolved) == (1, 1)
+
+def test_ambiguous_bar_is_replayed_by_the_simulator():
+    highs, lows, closes = np.array([106.0]), np.array([94.0]), np.array([100.0])
+    bar_logic = TradeSimulator("T", verbose=False)
+    assert bar_logic._walk_exit(1, 100.0, 95.0, 1.0, highs, lows, closes) == ("Trailing SL Hit 💰", 103.0)
+
+    resolver = IntrabarResolver(_sub_bars("2024-01-01", [(101, 94), (106, 100)]))
+    resolved = TradeSimulator("T", verbose=False, resolver=resolver)
+    assert resolved._walk_exit(1, 100.0, 95.0, 1.0, highs, lows, closes, np.array([0]), np.array([2])) == ("SL Hit ❌", 95.0)
+
+    # No sub-bars for that bar: the bar logic is kept
+    assert resolved._walk_exit(1, 100.0, 95.0, 1.0, highs, lows, closes, np.array([2]), np.array([2])) == ("Trailing SL Hit 💰", 103.0)
+    assert resolver.unresolved == 1
+
+class _Storage:
+    def __init__(self, df):
+        self.df, self.saved = df, None
+
+    def load(self, filename):
+        return self.df
+
+    def save(self, df, filename):
+        self.saved = df
+
+class _Provider:
+    def __init__(self, df):
+        self.df, self.periods = df, []
+
+    def fetch_data(self, period="1y", interval="1d"):
+        self.periods.append(period)
+        return self.df
+
+def test_cache_is_extended_with_a_clamped_period(monkeypatch):
+    old = _sub_bars("2024-01-01", [(1, 0)] * 4)
+    new = _sub_bars("2024-03-01", [(2, 1)] * 4)
+    provider = _Provider(new)
+    monkeypatch.setattr(fills.DataProviderFactory, "get_provider", lambda ticker, source="auto": provider)
+    storage = _Storage(old)
+
+    resolver = IntrabarResolver.from_storage("AAPL", interval="15m", source="yahoo", storage=storage, until=pd.Timestamp("2024-03-01"))
+    assert provider.periods == ["59d"] # Yahoo serves ~60 days of 15m bars, not the default 2y
+    assert len(storage.saved) == 8 and storage.saved.index.is_monotonic_increasing
+    assert len(resolver.ts) == 8
+
+    # Cache covers the test bars: no download
+    IntrabarResolver.from_storage("AAPL", interval="15m", source="yahoo", storage=_Storage(storage.saved), until=pd.Timestamp("2024-03-01"))
+    assert provider.periods == ["59d"]
@@ -0,0 +1,49 @@
+"""MonteCarloSimulator: sampling methods, profit factor of loss-free runs and ruin probability."""
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas")
+
+from src.strategy.montecarlo import MonteCarloSimulator
+
+def test_profit_factor_stays_finite_without_losses():
+    r = [2.0] * 20 + [-1.0] * 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # No RuntimeWarning from percentiles over infinities
+        result = MonteCarloSimulator(n_sims=5000).run(r)
+    pf = result['profit_factor']
+    assert all(np.isfinite(v) for v in pf.values())
+    assert pf['p95'] == MonteCarloSimulator.MAX_PROFIT_FACTOR
+    # P(no loss drawn in 22 iid draws) = (20/22)^22 ~ 12%
+    assert result['no_loss_share'] == pytest.approx((20 / 22) ** 22, abs=0.02)
+    assert MonteCarloSimulator(n_sims=500, method="shuffle").run(r)['no_loss_share'] == 0.0
+
+def test_shuffle_keeps_the_trades():
+    sim = MonteCarloSimulator(method="shuffle")
+    idx = sim._sample(200, 17)
+    assert (np.sort(idx, axis=1) == np.arange(17)).all()
+
+def test_block_keeps_runs_of_consecutive_trades():
+    sim = MonteCarloSimulator(method="block", block_size=4)
+    idx = sim._sample(200, 18)
+    assert idx.shape == (200, 18) and idx.min() >= 0 and idx.max() < 18
+    blocks = np.pad(idx, ((0, 0), (0, 2)), constant_values=-1).reshape(200, -1, 4)[:, :-1] # 4 full blocks + a truncated one
+    assert (np.diff(blocks, axis=2) == 1).all()
+    assert (np.diff(idx[:, 16:], axis=1) == 1).all()
+
+def test_ruin_probability():
+    losers = [-1.0] * 10
+    # 10% risk per losing trade: equity 0.9^k, 0.9^7 = 0.48 crosses -50%, 0.9^10 = 0.35 never reaches -70%
+    assert MonteCarloSimulator(n_sims=100, ruin_drawdown=0.5).run(losers, risk_pct=0.1)['prob_ruin'] == 1.0
+    assert MonteCarloSimulator(n_sims=100, ruin_drawdown=0.7).run(losers, risk_pct=0.1)['prob_ruin'] == 0.0
+    # One -1R trade among +1R ones at 60% risk: ruin (-50%) only if it comes first
+    mixed = [-1.0] + [1.0] * 3
+    assert MonteCarloSimulator(n_sims=20000, method="shuffle").run(mixed, risk_pct=0.6)['prob_ruin'] == pytest.approx(0.25, abs=0.02)
+
+def test_report_prints_capped_profit_factor(capsys):
+    sim = MonteCarloSimulator(n_sims=2000)
+    sim.print_report(sim.run([2.0] * 20 + [-1.0] * 2), 10000.0)
+    out = capsys.readouterr().out
+    assert "nan" not in out and ">=100" in out and "without a loss" in out
@@ -0,0 +1,35 @@
+"""normalize_features: pooled features must not depend on the price / volume scale of a symbol."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("xgboost")
+pytest.importorskip("sklearn")
+
+from src.ml.pooled import PRICE_UNITS, normalize_features
+
+def _frame(price_scale: float = 1.0, volume_scale: float = 1.0, n: int = 50) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))) * price_scale
+    volume = rng.uniform(1_000, 5_000, n) * volume_scale
+    volume_1h = volume * 4 * rng.uniform(0.8, 1.2, n)
+    obv_1h = np.cumsum(np.sign(rng.normal(size=n)) * volume_1h)
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close, 'Volume': volume,
+        'EMA_50_1h': close * 0.98, 'ATR_14': close * 0.02, 'RSI_14': rng.uniform(20, 80, n),
+        'Volume_SMA20': pd.Series(volume).rolling(5, min_periods=1).mean().to_numpy(),
+        'Volume_SMA20_1h': pd.Series(volume_1h).rolling(5, min_periods=1).mean().to_numpy(),
+        'OBV_1h': obv_1h, 'OBV_SMA20_1h': pd.Series(obv_1h).rolling(5, min_periods=1).mean().to_numpy(),
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+def test_features_are_scale_free():
+    reference = normalize_features(_frame())
+    scaled = normalize_features(_frame(price_scale=250.0, volume_scale=1e4))
+    features = reference.columns.difference(['Open', 'High', 'Low', 'Close', 'Volume'])
+    assert 'Volume_SMA20_1h' in features and 'OBV_1h' in features
+    assert 'OBV_SMA20_1h' not in features # Folded into OBV_1h
+    pd.testing.assert_frame_equal(reference[features], scaled[features], rtol=1e-9)
+
+def test_price_units_are_produced_features():
+    assert not {'FVG_Bull', 'FVG_Bear'} & set(PRICE_UNITS)
@@ -0,0 +1,60 @@
+"""MarketPredictor warm start on synthetic features (no data download)."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("xgboost")
+pytest.importorskip("sklearn")
+
+from src.ml.predictor import MarketPredictor, RefitPolicy
+
+def _frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n, freq="D")
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=[f"F_{i}" for i in range(4)], index=index)
+    df['Target'] = np.tile([0, 1, 2], n // 3 + 1)[:n]
+    return df
+
+def test_update_trains_on_the_previous_holdout():
+    df = _frame(600)
+    predictor = MarketPredictor(model_name="test_warm", params={"n_estimators": 20})
+    predictor.train(df.iloc[:500], save=False)
+    policy = RefitPolicy(max_new_fraction=0.5, min_new_rows=10, incremental_rounds=5)
+
+    assert predictor.update(df, policy=policy, save=False) == "incremental"
+    # 100 new rows: the last 20 were the early-stopping hold-out, not boosted on yet
+    assert predictor.trained_until == df.index[579]
+    assert predictor.rows_trained == 580
+
+    more = pd.concat([df, _frame(660, seed=1).iloc[600:]])
+    new_rows = more[more.index > predictor.trained_until]
+    assert new_rows.index[0] == df.index[580] # The previous hold-out comes first in the next increment
+    assert predictor.update(more, policy=policy, save=False) == "incremental"
+
+def test_prune_features_is_judged_on_an_untouched_slice(monkeypatch):
+    df = _frame(600)
+    df['F_copy'] = df['F_0'] # Correlated duplicate: pruned
+    predictor = MarketPredictor(model_name="test_prune", params={"n_estimators": 20})
+    predictor.train(df, save=False)
+
+    fitted, scored = [], []
+    train, logloss = MarketPredictor.train, MarketPredictor._logloss
+    monkeypatch.setattr(MarketPredictor, "train", lambda self, frame, *a, **k: fitted.append(frame.index[-1]) or train(self, frame, *a, **k))
+    monkeypatch.setattr(MarketPredictor, "_logloss", lambda self, frame: scored.append(frame.index[0]) or logloss(self, frame))
+    adopted = predictor.prune_features(df, tolerance=1.0, save=False)
+
+    assert adopted and len(predictor.features) < 5
+    # Both compared models stop before the validation slice; the adopted one is refitted on everything
+    assert fitted[0] < scored[0] and fitted[1] < scored[0] and scored[0] == df.index[480]
+    assert fitted[-1] == df.index[-1] and predictor.trained_until == df.index[-1]
+    assert predictor.selection["validation_rows"] == 120
+
+def test_rejected_pruning_restores_the_full_model():
+    df = _frame(600)
+    predictor = MarketPredictor(model_name="test_prune", params={"n_estimators": 20})
+    predictor.train(df, save=False)
+    model = predictor.model
+    assert not predictor.prune_features(df, tolerance=-1.0, save=False)
+    assert predictor.model is model and predictor.trained_until == df.index[-1]
+    assert predictor.selected_features is None
@@ -0,0 +1,157 @@
+"""
+AsyncNotionPublisher against a local stand-in Notion server (aiohttp, ephemeral port).
+The stand-in answers each POST /v1/pages with the next scripted status, then 200.
+"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("dotenv")
+pytest.importorskip("pytz")
+pytest.importorskip("requests")
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.infrastructure.journal import SignalJournal
+from src.infrastructure.publisher import AsyncNotionPublisher, Outbox, TokenBucket, retry_after
+
+def _signal(i: int = 0, bar: str = "2024-01-02T00:00:00"):
+    return ({"ticker": f"T{i:03d}", "mode": "swing", "bar": bar, "direction": "LONG 🚀", "entry": 100.0, "sl": 95.0, "tp": 110.0, "rr_ratio": 2.0}, 0.7)
+
+class StandIn:
+    """Scripted Notion stand-in: `script` is a list of (status, headers) served in order."""
+
+    def __init__(self):
+        self.script = []
+        self.pages = []
+        self.hits = []
+
+    async def create_page(self, request: web.Request) -> web.Response:
+        self.hits.append(time.monotonic())
+        payload = await request.json()
+        if self.script:
+            status, headers = self.script.pop(0)
+            return web.json_response({"object": "error", "status": status}, status=status, headers=headers)
+        self.pages.append(payload["properties"]["Ticker (ex: Alphabet, Apple)"]["title"][0]["text"]["content"])
+        return web.json_response({"object": "page", "id": f"page-{len(self.pages)}"})
+
+@pytest.fixture
+def standin():
+    return StandIn()
+
+@pytest.fixture
+def workdir(tmp_path):
+    return {"outbox": Outbox(str(tmp_path / "outbox.jsonl"), base_delay=0.0), "journal": SignalJournal(str(tmp_path / "signals.db"))}
+
+def _run(standin: StandIn, workdir: dict, scenario, **kwargs):
+    """Starts the stand-in on a free port and runs scenario(publisher) against it."""
+    async def main():
+        app = web.Application()
+        app.router.add_post("/v1/pages", standin.create_page)
+        server = TestServer(app, port=0)
+        await server.start_server()
+        try:
+            options = {"rate": 100.0, "max_retries": 1, **workdir, **kwargs}
+            async with AsyncNotionPublisher(token="standin", database_id="standin-db", base_url=str(server.make_url("/v1")), **options) as publisher:
+                return await scenario(publisher)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+def _status(journal: SignalJournal) -> list:
+    return journal.history()['status'].tolist()
+
+def test_token_bucket_paces_requests():
+    async def acquire(n):
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+    # First token is immediate, the next 5 arrive every 0.1 s
+    assert asyncio.run(acquire(6)) >= 0.45
+
+def test_publisher_respects_rate(standin, workdir):
+    # Burst of 5 (capacity = rate), then one request every 0.2 s
+    stats = _run(standin, workdir, lambda p: p.publish([_signal(i) for i in range(8)]), rate=5.0)
+    assert stats["sent"] == 8
+    assert standin.hits[-1] - standin.hits[0] >= 0.5
+
+def test_retry_after_header():
+    assert retry_after("2") == 2.0
+    assert retry_after(None) == 1.0
+    assert retry_after("soon") == 1.0
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0 # Date in the past
+
+def test_429_honours_retry_after(standin, workdir):
+    standin.script = [(429, {"Retry-After": "0.3"})]
+    start = time.monotonic()
+    stats = _run(standin, workdir, lambda p: p.publish([_signal()]))
+    assert time.monotonic() - start >= 0.3
+    assert stats["rate_limited"] == 1
+    assert stats["sent"] == 1
+    assert standin.pages == ["T000"]
+    assert _status(workdir["journal"]) == ["published"]
+
+def test_5xx_goes_to_outbox_then_flush_delivers(standin, workdir):
+    standin.script = [(503, {}), (503, {})] # Both attempts (max_retries=1)
+
+    async def scenario(publisher):
+        stats = await publisher.publish([_signal()])
+        queued = len(publisher.outbox)
+        status = _status(publisher.journal)
+        delivered = await publisher.flush_outbox()
+        return stats, queued, status, delivered
+
+    stats, queued, status, delivered = _run(standin, workdir, scenario)
+    assert stats["failed"] == 1 and stats["retries"] == 1
+    assert queued == 1 and status == ["failed"]
+    assert delivered == 1
+    assert len(workdir["outbox"]) == 0
+    assert standin.pages == ["T000"]
+    assert _status(workdir["journal"]) == ["published"]
+
+def test_4xx_is_rejected_without_retry(standin, workdir):
+    standin.script = [(400, {})]
+    stats = _run(standin, workdir, lambda p: p.publish([_signal()]))
+    assert stats["rejected"] == 1 and stats["retries"] == 0
+    assert len(standin.hits) == 1
+    assert len(workdir["outbox"]) == 0
+    assert _status(workdir["journal"]) == ["rejected"]
+
+def test_unexpected_error_goes_to_outbox(standin, workdir, monkeypatch):
+    async def broken(self, payload):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(AsyncNotionPublisher, "_post", broken)
+    stats = _run(standin, workdir, lambda p: p.publish([_signal()]))
+    assert stats["failed"] == 1
+    assert len(workdir["outbox"]) == 1
+    assert _status(workdir["journal"]) == ["failed"]
+
+def test_journal_deduplicates_republish(standin, workdir):
+    signals = [_signal(i) for i in range(3)]
+
+    async def scenario(publisher):
+        await publisher.publish(signals)
+        return await publisher.publish(signals) # Same candle again
+
+    stats = _run(standin, workdir, scenario)
+    assert stats["duplicates"] == 3
+    assert sorted(standin.pages) == ["T000", "T001", "T002"]
+    # A new candle is a new signal
+    stats = _run(standin, workdir, lambda p: p.publish([_signal(0, bar="2024-01-03T00:00:00")]))
+    assert stats["duplicates"] == 0 and len(standin.pages) == 4
+
+def test_abandoned_claim_is_reclaimed(tmp_path):
+    journal = SignalJournal(str(tmp_path / "signals.db"), lease=60.0)
+    plan, confidence = _signal()
+    first = journal.claim(plan, confidence)
+    assert first is not None
+    assert journal.claim(plan, confidence) is None # Claimed by a live run
+    journal.lease = 0.0 # The run died without an outcome
+    assert journal.claim(plan, confidence) == first
+    journal.mark(first, "published")
+    assert journal.claim(plan, confidence) is None
@@ -0,0 +1,27 @@
+"""ScanPipeline staged path: fetch outcomes mapped to row statuses (no network, no model)."""
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+
+from src.pipelines import scan
+from src.pipelines.scan import ScanPipeline
+
+class _EmptyProvider:
+    """Stands in for InferencePipeline in the fetcher threads: every download comes back empty."""
+
+    def __init__(self, ticker, mode="swing", source="auto"):
+        self.ticker = ticker
+
+    def fetch_history(self, period=None):
+        if self.ticker == "FAIL":
+            raise ConnectionError("provider down")
+        return pd.DataFrame()
+
+def test_staged_empty_download_is_no_data(monkeypatch):
+    monkeypatch.setattr(scan, "InferencePipeline", _EmptyProvider)
+    pipeline = ScanPipeline(["EMPTY", "FAIL"], workers=1, prefetch=2, fetchers=2)
+    tasks = [{"ticker": t, "mode": "swing", "source": "auto", "quiet": True} for t in pipeline.tickers]
+    rows = {r["ticker"]: r for r in pipeline._execute_staged(tasks)}
+    assert rows["EMPTY"]["status"] == "no_data"
+    assert rows["FAIL"]["status"] == "error" and "provider down" in rows["FAIL"]["error"]
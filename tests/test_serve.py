@@ -0,0 +1,78 @@
+"""Wake-up times of the serve daemon (ServeSession.next_close / missed), without network or model."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+
+from src.pipelines.serve import CANDLES, ServeSession
+
+def _session(mode: str, last_bar: pd.Timestamp) -> ServeSession:
+    session = ServeSession.__new__(ServeSession) # No provider / model needed
+    session.interval, session.step, session.refresh_period, session.retry = CANDLES[mode]
+    session.last_scored = last_bar
+    session.misses, session.retry_at = 0, None
+    return session
+
+def test_daily_close_follows_exchange_timezone():
+    # Yahoo daily bar of Thursday, opened 00:00 New York: Friday's bar closes Saturday 00:00 New York
+    session = _session("swing", pd.Timestamp("2024-01-04", tz="America/New_York"))
+    assert session.next_close() == pd.Timestamp("2024-01-06 05:00", tz="UTC")
+
+def test_intraday_close_on_naive_utc_index():
+    session = _session("intraday", pd.Timestamp("2024-01-04 10:15"))
+    assert session.next_close() == pd.Timestamp("2024-01-04 10:45", tz="UTC")
+
+def test_miss_retries_soon_then_backs_off_up_to_a_candle():
+    session = _session("intraday", pd.Timestamp("2024-01-04 10:15"))
+    delays = []
+    for _ in range(6):
+        before = pd.Timestamp.now(tz="UTC")
+        session.missed()
+        delays.append(session.next_close() - before)
+    assert delays[0] < pd.Timedelta(minutes=1)
+    assert delays[1] > delays[0]
+    assert max(delays) <= session.step + pd.Timedelta(seconds=1)
+
+class _IntradayPipeline:
+    """Stands in for InferencePipeline: 59 days of 15m bars (what 'predict' downloads), the last hour arriving on refresh."""
+
+    def __init__(self, ticker, mode="swing", source="auto"):
+        self.ticker, self.mode = ticker, mode
+        self.data_provider = self
+        self.predictor = self
+        self.features = ['RSI_14', 'ATR_14_1h']
+        self.scored = None
+        end = pd.Timestamp.now(tz="UTC").floor("15min").tz_localize(None) - pd.Timedelta(minutes=15)
+        index = pd.date_range(end=end, periods=59 * 96, freq="15min")
+        close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.002, len(index))))
+        self.bars = pd.DataFrame({'Open': close, 'High': close * 1.002, 'Low': close * 0.998, 'Close': close, 'Volume': 1_000.0}, index=index)
+
+    def load_model(self):
+        pass
+
+    def fetch_history(self, period=None):
+        return self.bars.iloc[:-4]
+
+    def fetch_data(self, period=None, interval=None):
+        return self.bars.tail(96)
+
+    def evaluate(self, enriched):
+        self.scored = enriched
+        return {'direction': 'LONG'}, 1, 0.7
+
+def test_intraday_tick_scores_with_the_predict_window(monkeypatch):
+    from src.pipelines import serve
+    monkeypatch.setattr(serve, "InferencePipeline", _IntradayPipeline)
+    session = ServeSession("BTCUSD", "intraday")
+    assert session.warm_up()
+    scored = session.tick()
+    assert scored is not None
+    assert session.last_scored == session.pipeline.bars.index[-1]
+    assert len(session.bars) == len(session.pipeline.fetch_history()) # Rolling window of the warm-up size
+    # Same window as 'predict' run at this close: same features for the newest bar
+    from src.features.engineering import FeatureEngineer
+    expected = FeatureEngineer(session.pipeline.bars.tail(len(session.bars)), required=session.pipeline.features).generate_all()
+    scored = session.pipeline.scored
+    assert scored.index[-1] == session.last_scored == expected.index[-1]
+    pd.testing.assert_series_equal(scored.iloc[-1], expected.iloc[-1])
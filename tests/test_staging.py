@@ -0,0 +1,28 @@
+"""StagingPipeline: fetch threads -> bounded queue -> compute (inline, workers=1)."""
+import time
+
+from src.pipelines.staging import StagingPipeline
+
+def _fetch(item):
+    if item == "hung":
+        time.sleep(2.0)
+    return None if item == "empty" else item * 2
+
+def _compute(item, data):
+    if item == "bad":
+        raise ValueError("bad item")
+    return data.upper()
+
+def test_results_errors_and_empty_fetches():
+    staging = StagingPipeline(_fetch, _compute, fetchers=2, workers=1, queue_size=2)
+    results = dict(staging.run(["a", "b", "empty", "bad"]))
+    assert results["a"] == "AA" and results["b"] == "BB"
+    assert results["empty"] is None
+    assert isinstance(results["bad"], ValueError)
+
+def test_deadline_bounds_wall_time_with_a_hung_fetch():
+    staging = StagingPipeline(_fetch, _compute, fetchers=1, workers=1, queue_size=1)
+    start = time.perf_counter()
+    results = dict(staging.run(["a", "hung", "b"], deadline=start + 0.3))
+    assert time.perf_counter() - start < 1.0
+    assert results == {"a": "AA"}
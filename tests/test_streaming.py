@@ -0,0 +1,48 @@
+"""FeatureShards: streamed shards must match the features computed on the whole history."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("xgboost")
+pytest.importorskip("pyarrow")
+
+from src.ml import streaming
+from src.ml.streaming import FeatureShards
+
+class _CumulativeEngineer:
+    """Minimal FeatureEngineer: a cumulative OBV (level depends on the window start) and a windowed feature."""
+
+    def __init__(self, df, required=None):
+        self.df = df.copy()
+
+    def generate_all(self):
+        direction = np.sign(self.df['Close'].diff()).fillna(0)
+        self.df['OBV'] = (direction * self.df['Volume']).cumsum()
+        self.df['OBV_SMA20'] = self.df['OBV'].rolling(20).mean()
+        self.df['Ret_5'] = self.df['Close'].pct_change(5)
+        self.df.dropna(inplace=True)
+        return self.df
+
+    def add_target(self, horizon=5, threshold=0.02):
+        future = self.df['Close'].shift(-horizon) / self.df['Close'] - 1
+        self.df['Target'] = np.select([future > threshold, future < -threshold], [1, 2], 0)
+        self.df = self.df.iloc[:-horizon]
+        return self.df
+
+def test_shards_chain_cumulative_features(monkeypatch, tmp_path):
+    monkeypatch.setattr(streaming, "FeatureEngineer", _CumulativeEngineer)
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2020-01-01", periods=1200, freq="h")
+    df = pd.DataFrame({"Close": 100 + rng.normal(size=len(index)).cumsum(), "Volume": rng.integers(100, 1000, len(index)).astype(float)}, index=index)
+    features = ['OBV', 'OBV_SMA20', 'Ret_5']
+
+    shards = FeatureShards.write(df, str(tmp_path), horizon=5, chunk_rows=300, warmup=50, required=features)
+    streamed = pd.concat(shards.read(i) for i in range(len(shards.files)))
+
+    fe = _CumulativeEngineer(df)
+    fe.generate_all()
+    full = fe.add_target(horizon=5).loc[streamed.index]
+    assert len(shards.files) == 4
+    for col in features:
+        np.testing.assert_allclose(streamed[col].to_numpy(), full[col].to_numpy(dtype=np.float32), rtol=1e-5)
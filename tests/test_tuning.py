@@ -0,0 +1,38 @@
+"""TuningPipeline keeps the feature subset stored with the production model (no data download)."""
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pandas_ta")
+pytest.importorskip("xgboost")
+pytest.importorskip("sklearn")
+
+from src.config.settings import settings
+from src.pipelines import backtest
+from src.pipelines.tuning import TuningPipeline
+from src.ml.predictor import MarketPredictor
+
+def _frame(n: int = 600) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(n, 4)), columns=[f"F_{i}" for i in range(4)], index=pd.date_range("2020-01-01", periods=n, freq="D"))
+    df['Target'] = np.tile([0, 1, 2], n // 3 + 1)[:n]
+    return df
+
+def test_tuned_model_keeps_the_selected_features(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(backtest.DataProviderFactory, "get_provider", lambda ticker, source="auto": None)
+    df = _frame()
+    stored = MarketPredictor(model_name="TEST_swing", params={"n_estimators": 20})
+    stored.selected_features = ['F_0', 'F_2']
+    stored.selection = {"n_before": 4, "n_after": 2}
+    stored.train(df)
+
+    pipeline = TuningPipeline("TEST", workers=1)
+    monkeypatch.setattr(pipeline.backtest, "build_dataset", lambda period="2y": df)
+    pipeline.run(n_trials=2)
+
+    tuned = MarketPredictor(model_name="TEST_swing")
+    tuned.load_model()
+    assert tuned.features == ['F_0', 'F_2']
+    assert tuned.selected_features == ['F_0', 'F_2'] and tuned.selection == {"n_before": 4, "n_after": 2}
+    assert tuned.tuning["n_trials"] == 2